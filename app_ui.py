@@ -1,22 +1,31 @@
 import os
+import re
 import sys
+import shutil
+import tempfile
 import datetime
-import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache, partial
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QTabWidget, QPushButton, QLabel, QFileDialog, 
                             QComboBox, QMessageBox, QGroupBox, QGridLayout,
-                            QTableWidget, QTableWidgetItem, QHeaderView, QSplitter,
+                            QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QSplitter,
                             QTextEdit, QSpinBox, QDateEdit, QCheckBox, QFrame, QApplication,
                             QProgressDialog, QProgressBar, QStyleFactory)
-from PyQt5.QtCore import Qt, QSize, QDate, pyqtSignal, QObject
-from PyQt5.QtGui import QIcon, QFont, QColor, QPalette, QLinearGradient, QBrush
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtCore import (Qt, QSize, QDate, QTimer, pyqtSignal, pyqtSlot, QObject, QThread, QSignalBlocker, QStringListModel,
+                          QAbstractTableModel, QModelIndex, QRunnable, QThreadPool, QUrl)
+from PyQt5.QtGui import (QIcon, QFont, QColor, QPalette, QLinearGradient, QBrush, QPainter, QImage, QPixmap,
+                         QResizeEvent)
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineSettings
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import pandas as pd
 import numpy as np
-from sales_analyzer import SalesAnalyzer
+from sales_analyzer import SalesAnalyzer, split_date_parts, tag_festivals
 
 # 设置matplotlib的样式
 plt.style.use('seaborn-v0_8')
@@ -32,6 +41,608 @@ COLOR_HOVER = "#2980b9"         # 悬停颜色
 COLOR_LIGHT_BG = "#ecf0f1"      # 浅色背景
 COLOR_DARK_BG = "#34495e"       # 暗色背景
 
+# 图表画布的样式参数：背景色、轴标签和标题的字体颜色
+CANVAS_RC_PARAMS = {
+    'figure.facecolor': COLOR_LIGHT_BG,
+    'axes.facecolor': COLOR_LIGHT_BG,
+    'axes.labelcolor': COLOR_TEXT,
+    'axes.titlecolor': COLOR_TEXT,
+}
+
+# 缓存的筛选结果数量
+FILTER_CACHE_SIZE = 16
+
+# 图表缩放后延迟重绘的时间（毫秒）
+RESIZE_REDRAW_DELAY_MS = 100
+
+# 筛选和分析条件变化后延迟刷新的时间（毫秒），连续修改多个条件时只刷新一次
+REFRESH_DELAY_MS = 150
+
+# 热图单元格数超过该值时不再逐格标注数值，只保留颜色条
+HEATMAP_LABEL_LIMIT = 144
+
+# 表格中金额的显示格式
+AMOUNT_FORMAT = "{:,.2f}"
+
+# 完整数据表格超过该行数时不再使用交替行颜色
+ALTERNATING_ROWS_LIMIT = 2000
+
+# 完整数据表格按内容计算列宽时采样的行数
+COLUMN_WIDTH_SAMPLE_ROWS = 200
+
+# 报告中图表的默认导出分辨率；图表在页面中按宽度缩放显示，100dpi在屏幕上已足够清晰
+REPORT_CHART_DPI = 100
+
+# 报告图表的导出格式，按顺序尝试：WebP体积更小、编码更快，不支持时退回PNG
+REPORT_IMAGE_FORMATS = ('webp', 'png')
+
+# 保存报告时并行复制图片文件的最大线程数
+REPORT_COPY_WORKERS = 8
+
+# 报告中的图表：(图表键, 画布属性名, 控制是否包含该部分的复选框属性名, 图表标题, 无法生成时的提示)
+REPORT_CHART_SECTIONS = (
+    ('trend', 'trend_canvas', 'include_trend_check', '销售趋势图', '无法生成销售趋势图'),
+    ('heatmap', 'heatmap_canvas', 'include_trend_check', '销售热图', '无法生成销售热图'),
+    ('category', 'category_canvas', 'include_category_check', '商品类别销售额对比', '无法生成商品类别销售图'),
+    ('region', 'region_canvas', 'include_region_check', '地区销售额对比', '无法生成地区销售图'),
+    ('festival', 'festival_canvas', 'include_promotion_check', '购物节销售额对比', '无法生成购物节销售图'),
+    ('forecast', 'forecast_canvas', 'include_forecast_check', '销售预测图', '无法生成销售预测图'),
+)
+
+# 报告头部和样式模板（CSS中的花括号写成双括号）
+REPORT_HEADER_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; color: #333; }}
+        h1 {{ color: #0066cc; text-align: center; margin-bottom: 20px; font-size: 24px; }}
+        h2 {{ color: #0066cc; margin-top: 30px; border-bottom: 1px solid #ddd; padding-bottom: 5px; font-size: 20px; }}
+        h3 {{ color: #333; margin-top: 20px; font-size: 16px; }}
+        .report-header {{ text-align: center; margin-bottom: 30px; }}
+        .report-date {{ font-style: italic; color: #666; margin-bottom: 20px; text-align: center; }}
+        .chart-container {{ text-align: center; margin: 20px 0; }}
+        .chart {{ max-width: 100%; height: auto; border: 1px solid #ddd; }}
+        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
+        th, td {{ text-align: left; padding: 8px; border: 1px solid #ddd; }}
+        th {{ background-color: #f2f2f2; }}
+        tr:nth-child(even) {{ background-color: #f9f9f9; }}
+        .suggestion {{ margin: 10px 0; padding: 10px; background-color: #f2f9ff; border-left: 3px solid #0066cc; }}
+
+        /* 响应式设计，确保在小屏幕上也能良好显示 */
+        @media screen and (max-width: 800px) {{
+            .chart {{ width: 100%; }}
+            table {{ font-size: 12px; }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="report-header">
+        <h1>{title}</h1>
+        <div class="report-date">报告时间范围: {start_date} 至 {end_date}</div>
+        <div>生成时间: {now}</div>
+    </div>
+"""
+
+# 全局样式表
+BASE_STYLE = """
+    QMainWindow {
+        background-color: #f9f9f9;
+    }
+
+    QTabWidget::pane {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 2px;
+        background-color: #f9f9f9;
+    }
+
+    QTabBar::tab {
+        background-color: #ecf0f1;
+        color: #2c3e50;
+        min-width: 100px;
+        min-height: 30px;
+        padding: 5px 10px;
+        margin-right: 2px;
+        border: 1px solid #bdc3c7;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }
+
+    QTabBar::tab:selected {
+        background-color: #3498db;
+        color: white;
+        border-bottom-color: #3498db;
+    }
+
+    QTabBar::tab:hover:!selected {
+        background-color: #d0d9e0;
+    }
+
+    QPushButton {
+        background-color: #3498db;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 8px 16px;
+        min-height: 30px;
+        font-weight: bold;
+    }
+
+    QPushButton:hover {
+        background-color: #2980b9;
+    }
+
+    QPushButton:pressed {
+        background-color: #21618c;
+    }
+
+    QPushButton:disabled {
+        background-color: #bdc3c7;
+        color: #7f8c8d;
+    }
+
+    QComboBox {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 4px 10px;
+        min-height: 25px;
+        background-color: white;
+    }
+
+    QComboBox:hover {
+        border: 1px solid #3498db;
+    }
+
+    QComboBox::drop-down {
+        subcontrol-origin: padding;
+        subcontrol-position: top right;
+        width: 20px;
+        border-left: 1px solid #bdc3c7;
+        border-top-right-radius: 4px;
+        border-bottom-right-radius: 4px;
+    }
+
+    QGroupBox {
+        font-weight: bold;
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        margin-top: 10px;
+        padding-top: 15px;
+    }
+
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 5px;
+        color: #2c3e50;
+    }
+
+    QTableView {
+        gridline-color: #d4d4d4;
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        selection-background-color: #3498db;
+        selection-color: white;
+    }
+
+    QHeaderView::section {
+        background-color: #ecf0f1;
+        color: #2c3e50;
+        padding: 5px;
+        border: 1px solid #bdc3c7;
+        font-weight: bold;
+    }
+
+    QTextEdit {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 5px;
+        background-color: white;
+    }
+
+    QDateEdit, QSpinBox {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 4px 10px;
+        background-color: white;
+    }
+
+    QCheckBox {
+        spacing: 5px;
+    }
+
+    QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+    }
+
+    QCheckBox::indicator:checked {
+        background-color: #3498db;
+        border: 1px solid #2980b9;
+        border-radius: 3px;
+    }
+
+    QStatusBar {
+        font-size: 12px;
+        padding: 3px;
+        background-color: #ecf0f1;
+        color: #2c3e50;
+        border-top: 1px solid #bdc3c7;
+    }
+
+    QSplitter::handle {
+        background-color: #bdc3c7;
+    }
+
+    QSplitter::handle:horizontal {
+        width: 2px;
+    }
+
+    QProgressBar {
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        text-align: center;
+        color: white;
+        background-color: #ecf0f1;
+    }
+
+    QProgressBar::chunk {
+        background-color: #3498db;
+        width: 10px;
+        margin: 0.5px;
+    }
+"""
+
+# 按objectName区分的控件样式，统一在此处设置，避免逐个控件调用setStyleSheet
+# 导致每次都重新解析和级联样式表。容器规则放在前面，具体控件规则放在后面，
+# 以便相同优先级时由控件自身的规则生效
+WIDGET_STYLE = f"""
+    QTabWidget#mainTabs::tab-bar, QTabWidget#mainTabs QTabWidget::tab-bar {{
+        alignment: center;
+    }}
+
+    QTabWidget#subTabs::pane {{
+        border: 1px solid #bdc3c7;
+        border-radius: 5px;
+        padding: 5px;
+        background-color: white;
+    }}
+
+    QTabWidget#subTabs QTabBar::tab {{
+        background-color: #ecf0f1;
+        color: {COLOR_TEXT};
+        min-width: 120px;
+        padding: 8px 15px;
+        margin-right: 2px;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+    }}
+
+    QTabWidget#subTabs QTabBar::tab:selected {{
+        background-color: {COLOR_PRIMARY};
+        color: white;
+    }}
+
+    QTabWidget#subTabs QTabBar::tab:hover:!selected {{
+        background-color: #d0d9e0;
+    }}
+
+    QGroupBox#primaryGroup, QGroupBox#secondaryGroup, QGroupBox#accentGroup {{
+        font-size: 14px;
+        font-weight: bold;
+        border-width: 2px;
+        border-style: solid;
+        border-radius: 6px;
+        margin-top: 12px;
+        padding-top: 15px;
+    }}
+
+    QGroupBox#primaryGroup::title, QGroupBox#secondaryGroup::title, QGroupBox#accentGroup::title {{
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 10px;
+        background-color: {COLOR_BACKGROUND};
+    }}
+
+    QGroupBox#primaryGroup {{
+        border-color: {COLOR_PRIMARY};
+    }}
+
+    QGroupBox#primaryGroup::title {{
+        color: {COLOR_PRIMARY};
+    }}
+
+    QGroupBox#secondaryGroup {{
+        border-color: {COLOR_SECONDARY};
+    }}
+
+    QGroupBox#secondaryGroup::title {{
+        color: {COLOR_SECONDARY};
+    }}
+
+    QGroupBox#accentGroup {{
+        border-color: {COLOR_ACCENT};
+    }}
+
+    QGroupBox#accentGroup::title {{
+        color: {COLOR_ACCENT};
+    }}
+
+    QFrame#statsFrame, QFrame#statsFrame QFrame {{
+        background-color: {COLOR_LIGHT_BG};
+        border-radius: 5px;
+        border: 1px solid #ddd;
+    }}
+
+    QFrame#chartFrame, QFrame#chartFrame * {{
+        background-color: white;
+        border-radius: 5px;
+        border: 1px solid #ddd;
+    }}
+
+    QFrame#contentFrame, QFrame#contentFrame QFrame {{
+        background-color: white;
+        border-radius: 5px;
+        border: 1px solid #ddd;
+    }}
+
+    QFrame#contentFrame QCheckBox {{
+        font-size: 13px;
+        padding: 5px;
+    }}
+
+    QFrame#contentFrame QCheckBox::indicator {{
+        width: 18px;
+        height: 18px;
+        border: 1px solid #bdc3c7;
+        border-radius: 3px;
+    }}
+
+    QFrame#contentFrame QCheckBox::indicator:checked {{
+        background-color: {COLOR_PRIMARY};
+        border: 1px solid {COLOR_PRIMARY};
+        image: url(:/qt-project.org/styles/commonstyle/images/check-16.png);
+    }}
+
+    QLabel#appTitle {{
+        font-size: 24px;
+        font-weight: bold;
+        color: {COLOR_TEXT};
+        margin: 10px 0;
+        padding: 5px;
+    }}
+
+    QLabel#fieldLabel {{
+        font-weight: bold;
+    }}
+
+    QLabel#sectionTitle {{
+        font-size: 16px;
+        font-weight: bold;
+        color: {COLOR_PRIMARY};
+        margin-bottom: 5px;
+    }}
+
+    QLabel#chartTitle {{
+        font-size: 14px;
+        font-weight: bold;
+        color: {COLOR_TEXT};
+    }}
+
+    QLabel#previewTitle {{
+        font-size: 14px;
+        font-weight: bold;
+        margin-bottom: 10px;
+    }}
+
+    QLabel#reportPlaceholder {{
+        background-color: white;
+        font-family: Arial, sans-serif;
+        padding: 50px;
+    }}
+
+    QLabel#dataPathLabel {{
+        font-size: 13px;
+        color: {COLOR_TEXT};
+        padding: 5px 10px;
+        background-color: white;
+        border: 1px solid #ddd;
+        border-radius: 4px;
+    }}
+
+    QLabel#filteredCountLabel, QLabel#totalCountLabel {{
+        font-weight: bold;
+        font-size: 13px;
+        padding: 3px;
+    }}
+
+    QLabel#filteredCountLabel {{
+        color: {COLOR_PRIMARY};
+    }}
+
+    QLabel#totalCountLabel {{
+        color: {COLOR_TEXT};
+    }}
+
+    QPushButton#loadButton {{
+        background-color: {COLOR_PRIMARY};
+        font-size: 14px;
+        min-width: 120px;
+    }}
+
+    QPushButton#resetFilterButton {{
+        background-color: {COLOR_DARK_BG};
+        min-width: 100px;
+    }}
+
+    QPushButton#refreshButton {{
+        background-color: {COLOR_SECONDARY};
+        min-width: 120px;
+    }}
+
+    QPushButton#forecastButton, QPushButton#suggestionButton {{
+        background-color: {COLOR_SECONDARY};
+        min-height: 35px;
+        font-size: 13px;
+    }}
+
+    QPushButton#forecastButton {{
+        min-width: 120px;
+    }}
+
+    QPushButton#suggestionButton {{
+        min-width: 140px;
+    }}
+
+    QTableView#dataTable {{
+        font-size: 12px;
+    }}
+
+    QTableView#dataTable::item {{
+        padding: 5px;
+    }}
+
+    QTableView#fullDataTable {{
+        font-size: 12px;
+        gridline-color: #d4d4d4;
+    }}
+
+    QSpinBox#forecastPeriodsSpin {{
+        padding: 4px;
+        font-size: 13px;
+    }}
+
+    QTextEdit#suggestionsText {{
+        font-size: 13px;
+        line-height: 1.5;
+        padding: 10px;
+        border: none;
+        background-color: {COLOR_LIGHT_BG};
+        border-radius: 5px;
+    }}
+
+    QSplitter#reportSplitter::handle {{
+        background-color: {COLOR_LIGHT_BG};
+        width: 2px;
+    }}
+
+    QTextEdit#reportTitleEdit {{
+        font-size: 13px;
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        padding: 8px;
+        background-color: white;
+    }}
+
+    QDateEdit#reportDateEdit {{
+        padding: 5px;
+        border: 1px solid #bdc3c7;
+        border-radius: 4px;
+        background-color: white;
+        min-height: 25px;
+        min-width: 100px;
+    }}
+
+    QProgressDialog#loadProgressDialog {{
+        background-color: {COLOR_LIGHT_BG};
+        border-radius: 8px;
+        border: 1px solid #ddd;
+        min-width: 400px;
+        min-height: 120px;
+    }}
+
+    QProgressDialog#loadProgressDialog QProgressBar {{
+        border: 1px solid #bdc3c7;
+        border-radius: 5px;
+        text-align: center;
+        color: white;
+        background-color: {COLOR_LIGHT_BG};
+        height: 20px;
+    }}
+
+    QProgressDialog#loadProgressDialog QProgressBar::chunk {{
+        background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, 
+                            stop:0 {COLOR_PRIMARY}, stop:1 {COLOR_SECONDARY});
+        width: 10px;
+        margin: 0.5px;
+        border-radius: 3px;
+    }}
+
+    QProgressDialog#loadProgressDialog QLabel {{
+        font-size: 14px;
+        color: {COLOR_TEXT};
+        margin-bottom: 5px;
+    }}
+
+    QProgressDialog#loadProgressDialog QPushButton {{
+        background-color: {COLOR_PRIMARY};
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 6px 12px;
+        min-width: 80px;
+    }}
+"""
+
+# 完整的应用程序样式表，在模块导入时拼接一次
+STYLE_SHEET = BASE_STYLE + WIDGET_STYLE
+
+def format_amounts(values, missing="-"):
+    """
+    将金额数组格式化为带千分位、保留两位小数的文本列表，缺失值显示为missing（默认"-"）
+
+    先用tolist()一次性转换为Python浮点数，再用同一个格式化方法批量处理，
+    避免逐个对numpy标量调用f-string格式化
+    """
+    values = np.asarray(values, dtype=float)
+    texts = list(map(AMOUNT_FORMAT.format, values.tolist()))
+    if missing is not None:
+        for i in np.flatnonzero(np.isnan(values)).tolist():
+            texts[i] = missing
+    return texts
+
+@lru_cache(maxsize=None)
+def theme_icon(name):
+    """按名称从当前图标主题获取图标，每个名称只查找一次（需在创建QApplication之后调用）"""
+    return QIcon.fromTheme(name)
+
+@contextmanager
+def bulk_table_update(table):
+    """
+    批量填充QTableWidget时暂停重绘、排序和信号
+
+    逐个setItem时每个单元格都会触发布局和重绘，在with块内填充完毕后再统一恢复并刷新一次视图
+    """
+    sorting_enabled = table.isSortingEnabled()
+    table.setUpdatesEnabled(False)
+    table.setSortingEnabled(False)
+    signals_blocked = table.blockSignals(True)
+    try:
+        yield table
+    finally:
+        table.blockSignals(signals_blocked)
+        table.setSortingEnabled(sorting_enabled)
+        table.setUpdatesEnabled(True)
+        table.viewport().update()
+
+def set_table_text(table, row, column, text):
+    """
+    设置QTableWidget单元格的文本并返回单元格项
+
+    单元格已有项时直接修改文本，不再新建QTableWidgetItem；配合只增减行数的setRowCount，
+    重复刷新表格时已有的项都可以复用
+    """
+    item = table.item(row, column)
+    if item is None:
+        item = QTableWidgetItem(text)
+        table.setItem(row, column, item)
+    else:
+        item.setText(text)
+    return item
+
 class WorkerSignals(QObject):
     """用于在线程间传递信号的类"""
     finished = pyqtSignal()
@@ -39,48 +650,61 @@ class WorkerSignals(QObject):
     progress = pyqtSignal(int, str)
     result = pyqtSignal(object)
 
-class DataLoadWorker(threading.Thread):
-    """处理数据加载的工作线程"""
+class DataLoadWorker(QObject):
+    """处理数据加载的工作对象，通过moveToThread放到QThread中运行"""
     def __init__(self, analyzer, file_path):
         super().__init__()
         self.analyzer = analyzer
         self.file_path = file_path
         self.signals = WorkerSignals()
-        self.daemon = True  # 设置为守护线程
 
+    @pyqtSlot()
     def run(self):
         try:
             # 发送进度信号
             self.signals.progress.emit(10, "正在读取文件...")
             
-            # 获取文件扩展名
-            file_ext = os.path.splitext(self.file_path)[1].lower()
-            
-            # 判断文件类型和大小
-            file_size = os.path.getsize(self.file_path) / (1024 * 1024)  # 转换为MB
+            # 只调用一次stat获取文件大小和修改时间
+            file_stat = os.stat(self.file_path)
+            file_size = file_stat.st_size / (1024 * 1024)  # 转换为MB
             is_large_file = file_size > 10  # 大于10MB视为大文件
             
             # 更新进度
             self.signals.progress.emit(20, f"正在加载数据到内存...({file_size:.1f} MB)")
             
-            # 加载数据
-            self.analyzer.load_data(self.file_path)
-            
-            # 更新进度
-            self.signals.progress.emit(50, "正在处理日期数据...")
-            
-            # 确保日期列为日期类型
-            if '日期' in self.analyzer.df.columns:
-                self.analyzer.df['日期'] = pd.to_datetime(self.analyzer.df['日期'])
-                
-                # 如果没有年、月、季度列，则从日期列生成
-                if '年' not in self.analyzer.df.columns:
-                    self.analyzer.df['年'] = self.analyzer.df['日期'].dt.year
-                if '月' not in self.analyzer.df.columns:
-                    self.analyzer.df['月'] = self.analyzer.df['日期'].dt.month
-                if '季度' not in self.analyzer.df.columns:
-                    self.analyzer.df['季度'] = (self.analyzer.df['日期'].dt.month - 1) // 3 + 1
+            # 大文件优先读取上次加载后保存的Parquet缓存
+            if is_large_file and self.analyzer.load_cached_data(self.file_path, source_mtime=file_stat.st_mtime):
+                self.signals.progress.emit(70, "已从缓存加载数据...")
+            else:
+                # 加载数据，大文件按块读取并在20%~50%之间报告进度
+                if is_large_file:
+                    def report_progress(fraction):
+                        self.signals.progress.emit(20 + int(fraction * 30), f"正在加载数据到内存...({fraction:.0%})")
+                    self.analyzer.load_data(self.file_path, progress_callback=report_progress)
+                else:
+                    self.analyzer.load_data(self.file_path)
             
+                # 日期列的解析、年、月、季度列的补充以及商品类别等文本列转换为分类类型
+                # 都已在load_data中完成；其余文本列（订单ID、顾客姓名、地址）几乎各不相同，不再转换
+                self.signals.progress.emit(50, "正在处理日期数据...")
+
+                # 保存处理后的数据，下次打开同一文件时直接读取缓存
+                if is_large_file:
+                    self.signals.progress.emit(75, "正在保存数据缓存...")
+                    self.analyzer.save_data_cache(self.file_path)
+
+            # 年、月、季度已在load_data（或从缓存加载时）转换为有序分类类型
+
+            # 预先汇总销售额，供趋势图和热图使用
+            self.signals.progress.emit(80, "正在汇总销售数据...")
+            self.analyzer.build_sales_cube()
+            
+            # 预先计算商品类别和地区的销售额汇总（由分析器缓存），主线程绘图时直接使用
+            self.signals.progress.emit(85, "正在预先计算分析结果...")
+            for column in ('商品类别', '省份', '城市'):
+                if column in self.analyzer.df.columns:
+                    self.analyzer.get_sales_totals(column)
+
             # 完成并发送结果
             self.signals.progress.emit(90, "数据加载完成!")
             self.signals.result.emit(self.analyzer.df)
@@ -89,46 +713,253 @@ class DataLoadWorker(threading.Thread):
         except Exception as e:
             self.signals.error.emit(str(e))
 
+class AnalysisWorker(QRunnable):
+    """在线程池中执行的分析计算任务，只做数据计算，结果通过信号交回主线程更新界面"""
+    def __init__(self, compute, *args):
+        super().__init__()
+        self.compute = compute
+        self.args = args
+        self.signals = WorkerSignals()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            result = self.compute(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
 class MatplotlibCanvas(FigureCanvas):
     """Matplotlib画布类，用于在PyQt中显示图表"""
     def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.fig.add_subplot(111)
-        
-        # 设置图表样式
-        self.fig.patch.set_facecolor(COLOR_LIGHT_BG)
-        self.axes.set_facecolor(COLOR_LIGHT_BG)
+        # 在创建图表时应用统一的样式参数，不再逐个设置各个元素的属性
+        with mpl.rc_context(CANVAS_RC_PARAMS):
+            self.fig = Figure(figsize=(width, height), dpi=dpi)
+            self.axes = self.fig.add_subplot(111)
         
-        # 增强网格线样式
+        # 增强网格线样式（通过grid()设置的样式在axes.clear()后仍然保留，不能放到rc参数中）
         self.axes.grid(True, linestyle='--', alpha=0.7, color="#bdc3c7")
         
-        # 设置轴标签和标题的字体样式
-        self.axes.xaxis.label.set_color(COLOR_TEXT)
-        self.axes.yaxis.label.set_color(COLOR_TEXT)
-        self.axes.title.set_color(COLOR_TEXT)
-        
         super(MatplotlibCanvas, self).__init__(self.fig)
         self.setParent(parent)
         self.setMinimumSize(400, 300)
         
+        # 连续缩放窗口时推迟重新渲染，缩放过程中拉伸显示缓存的图像
+        self._cached_pixmap = None
+        self._pending_resize_size = None
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_REDRAW_DELAY_MS)
+        self._resize_timer.timeout.connect(self._apply_pending_resize)
+        
+    def resizeEvent(self, event):
+        """尺寸变化时等到停止缩放后再按新尺寸渲染一次"""
+        if not self.isVisible():
+            self._resize_timer.stop()
+            super().resizeEvent(event)
+            return
+        if not self._resize_timer.isActive():
+            self._cached_pixmap = self._grab_rendered_pixmap()
+            self._pending_resize_size = event.oldSize()
+        QWidget.resizeEvent(self, event)
+        self._resize_timer.start()
+        
+    def _apply_pending_resize(self):
+        """按当前尺寸调整图表大小并重绘"""
+        self._cached_pixmap = None
+        super().resizeEvent(QResizeEvent(self.size(), self._pending_resize_size))
+        
+    def _grab_rendered_pixmap(self):
+        """将上一次渲染的结果复制为QPixmap，尚未渲染时返回None"""
+        if getattr(self, 'renderer', None) is None:
+            return None
+        buffer = np.asarray(self.buffer_rgba())
+        height, width = buffer.shape[:2]
+        image = QImage(buffer.tobytes(), width, height, QImage.Format_RGBA8888)
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.device_pixel_ratio)
+        return pixmap
+        
+    def paintEvent(self, event):
+        """缩放过程中直接绘制缓存的图像，不触发Agg重新渲染"""
+        if self._resize_timer.isActive() and self._cached_pixmap is not None:
+            painter = QPainter(self)
+            painter.drawPixmap(self.rect(), self._cached_pixmap)
+            painter.end()
+            return
+        super().paintEvent(event)
+        
     def clear(self):
         """清除图表"""
         self.axes.clear()
-        self.draw()
+        # 延迟到事件循环空闲时重绘，与随后的绘图合并为一次渲染
+        self.draw_idle()
         
     def plot(self, *args, **kwargs):
         """绘制图表"""
         self.axes.plot(*args, **kwargs)
-        self.draw()
+        self.draw_idle()
+
+class PandasModel(QAbstractTableModel):
+    """将DataFrame包装为Qt表格模型，只在视图请求时才格式化可见单元格"""
+    def __init__(self, df=None, parent=None):
+        super().__init__(parent)
+        self._df = pd.DataFrame()
+        self._rows = 0
+        self._columns = []
+        # 日期文本缓存，每个不同的日期只格式化一次，切换筛选条件后继续复用
+        self._date_text_cache = {}
+        if df is not None:
+            self.setDataFrame(df)
+            
+    def setDataFrame(self, df):
+        """替换模型中的数据并通知视图刷新"""
+        if df is self._df:
+            return
+            
+        # 列不变时（例如只修改了筛选条件）只通知行数的增减和已有单元格的变化，
+        # 不重置整个模型，视图的表头和列宽得以保留
+        if len(self._columns) > 0 and df.columns.equals(self._df.columns):
+            old_rows, new_rows = self._rows, len(df)
+            if new_rows < old_rows:
+                self.beginRemoveRows(QModelIndex(), new_rows, old_rows - 1)
+                self._rows = new_rows
+                self.endRemoveRows()
+            self._set_arrays(df)
+            if min(old_rows, new_rows) > 0:
+                self.dataChanged.emit(self.index(0, 0),
+                                      self.index(min(old_rows, new_rows) - 1, len(self._columns) - 1))
+            if new_rows > old_rows:
+                self.beginInsertRows(QModelIndex(), old_rows, new_rows - 1)
+                self._rows = new_rows
+                self.endInsertRows()
+            return
+            
+        self.beginResetModel()
+        self._set_arrays(df)
+        self._rows = len(df)
+        self.endResetModel()
+        
+    def _set_arrays(self, df):
+        """保存DataFrame并按列缓存底层数组"""
+        self._df = df
+        # 按列缓存(类型, 底层数组)，避免每次取值时经过pandas索引；
+        # 分类列只保存编码和类别文本，不展开成对象数组
+        self._columns = []
+        for col in df.columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                labels = [str(value) for value in series.cat.categories] + ['nan']
+                self._columns.append(('category', (series.cat.codes.to_numpy(), labels)))
+            elif pd.api.types.is_datetime64_any_dtype(series):
+                self._columns.append(('datetime', series.to_numpy().astype('datetime64[ns]').view('i8')))
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+                # 数值列整列向量化转换为文本，绘制时直接取出，不再逐个单元格调用str()
+                self._columns.append(('text', series.to_numpy().astype(str).astype(object)))
+            elif series.dtype == object and pd.api.types.infer_dtype(series, skipna=False) == 'string':
+                # 全部为字符串的对象列本身就是文本，直接引用底层数组
+                self._columns.append(('text', series.to_numpy()))
+            else:
+                self._columns.append(('value', series.to_numpy()))
+        
+    def dataFrame(self):
+        """返回模型当前显示的DataFrame"""
+        return self._df
+        
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._rows
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._columns)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        # 视图每次绘制都会按多个角色查询每个可见单元格，先判断角色，其余角色直接返回
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+            
+        kind, column = self._columns[index.column()]
+        row = index.row()
+        
+        if kind == 'category':
+            codes, labels = column
+            # 编码-1表示缺失值，对应labels末尾的'nan'
+            return labels[codes[row]]
+        
+        if kind == 'text':
+            return column[row]
+            
+        if kind == 'datetime':
+            value = column[row]
+            text = self._date_text_cache.get(value)
+            return text if text is not None else self._format_date(value)
+            
+        return str(column[row])
+    
+    def _format_date(self, value):
+        """将datetime64[ns]的整数表示格式化为日期文本"""
+        text = self._date_text_cache.get(value)
+        if text is None:
+            if value == np.iinfo(np.int64).min:
+                text = 'NaT'
+            else:
+                text = pd.Timestamp(value).strftime('%Y-%m-%d')
+            self._date_text_cache[value] = text
+        return text
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return str(self._df.columns[section])
+        return str(section + 1)
 
 class EcommerceAnalysisApp(QMainWindow):
     """电商销售分析应用主窗口"""
     def __init__(self):
         super().__init__()
         self.analyzer = SalesAnalyzer()
+        self.load_thread = None
+        self._filter_index = None
+        self._filter_index_source = None
+        self._filter_cache = OrderedDict()
+        self._view_sources = {}
+        # 正在线程池中计算的分析任务及其使用的数据
+        self._pending_analysis = {}
+        # 趋势图和热图中跨刷新复用的图形对象
+        self._trend_line = None
+        self._trend_artists = []
+        self._heatmap_image = None
+        self._heatmap_colorbar = None
+        self._heatmap_labels = []
+        self._summary_items = None
+        self._filter_refresh_timer = self._create_refresh_timer(self.update_full_data_view)
+        self._analysis_refresh_timer = self._create_refresh_timer(self.update_analysis)
         self.setup_style()
         self.init_ui()
         
+    def _create_refresh_timer(self, slot):
+        """创建单次触发的刷新定时器，重复启动时重新计时，停止变化后只调用一次slot"""
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(REFRESH_DELAY_MS)
+        timer.timeout.connect(slot)
+        return timer
+        
+    def schedule_full_data_refresh(self):
+        """筛选条件变化后延迟刷新完整数据视图"""
+        self._filter_refresh_timer.start()
+        
+    def schedule_analysis_refresh(self):
+        """分析条件变化后延迟更新分析结果"""
+        self._analysis_refresh_timer.start()
+        
     def setup_style(self):
         """设置应用程序样式"""
         # 设置应用程序样式为Fusion，这样我们可以自定义调色板
@@ -153,173 +984,8 @@ class EcommerceAnalysisApp(QMainWindow):
         # 应用调色板
         QApplication.setPalette(palette)
         
-        # 设置全局样式表
-        QApplication.instance().setStyleSheet("""
-            QMainWindow {
-                background-color: #f9f9f9;
-            }
-            
-            QTabWidget::pane {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 2px;
-                background-color: #f9f9f9;
-            }
-            
-            QTabBar::tab {
-                background-color: #ecf0f1;
-                color: #2c3e50;
-                min-width: 100px;
-                min-height: 30px;
-                padding: 5px 10px;
-                margin-right: 2px;
-                border: 1px solid #bdc3c7;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }
-            
-            QTabBar::tab:selected {
-                background-color: #3498db;
-                color: white;
-                border-bottom-color: #3498db;
-            }
-            
-            QTabBar::tab:hover:!selected {
-                background-color: #d0d9e0;
-            }
-            
-            QPushButton {
-                background-color: #3498db;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                min-height: 30px;
-                font-weight: bold;
-            }
-            
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            
-            QPushButton:pressed {
-                background-color: #21618c;
-            }
-            
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-            
-            QComboBox {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 4px 10px;
-                min-height: 25px;
-                background-color: white;
-            }
-            
-            QComboBox:hover {
-                border: 1px solid #3498db;
-            }
-            
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 20px;
-                border-left: 1px solid #bdc3c7;
-                border-top-right-radius: 4px;
-                border-bottom-right-radius: 4px;
-            }
-            
-            QGroupBox {
-                font-weight: bold;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                margin-top: 10px;
-                padding-top: 15px;
-            }
-            
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 5px;
-                color: #2c3e50;
-            }
-            
-            QTableWidget {
-                gridline-color: #d4d4d4;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                selection-background-color: #3498db;
-                selection-color: white;
-            }
-            
-            QHeaderView::section {
-                background-color: #ecf0f1;
-                color: #2c3e50;
-                padding: 5px;
-                border: 1px solid #bdc3c7;
-                font-weight: bold;
-            }
-            
-            QTextEdit {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: white;
-            }
-            
-            QDateEdit, QSpinBox {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 4px 10px;
-                background-color: white;
-            }
-            
-            QCheckBox {
-                spacing: 5px;
-            }
-            
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-            }
-            
-            QCheckBox::indicator:checked {
-                background-color: #3498db;
-                border: 1px solid #2980b9;
-                border-radius: 3px;
-            }
-            
-            QStatusBar {
-                background-color: #ecf0f1;
-                color: #2c3e50;
-                border-top: 1px solid #bdc3c7;
-            }
-            
-            QSplitter::handle {
-                background-color: #bdc3c7;
-            }
-            
-            QSplitter::handle:horizontal {
-                width: 2px;
-            }
-            
-            QProgressBar {
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                text-align: center;
-                color: white;
-                background-color: #ecf0f1;
-            }
-            
-            QProgressBar::chunk {
-                background-color: #3498db;
-                width: 10px;
-                margin: 0.5px;
-            }
-        """)
+        # 设置全局样式表（模块导入时已生成）
+        QApplication.instance().setStyleSheet(STYLE_SHEET)
         
     def init_ui(self):
         """初始化用户界面"""
@@ -338,22 +1004,12 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         title_label = QLabel("基于大数据的电商平台商品销售趋势分析与决策软件")
         title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet(f"""
-            font-size: 24px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-            margin: 10px 0;
-            padding: 5px;
-        """)
+        title_label.setObjectName("appTitle")
         main_layout.addWidget(title_label)
         
         # 创建主选项卡
         self.main_tabs = QTabWidget()
-        self.main_tabs.setStyleSheet("""
-            QTabWidget::tab-bar {
-                alignment: center;
-            }
-        """)
+        self.main_tabs.setObjectName("mainTabs")
         
         # 创建四个主要模块的选项卡
         self.data_management_tab = QWidget()
@@ -376,16 +1032,38 @@ class EcommerceAnalysisApp(QMainWindow):
         main_layout.addWidget(self.main_tabs)
         
         # 状态栏
-        self.statusBar().setStyleSheet(f"""
-            QStatusBar {{
-                font-size: 12px;
-                padding: 3px;
-                background-color: {COLOR_LIGHT_BG};
-                color: {COLOR_TEXT};
-            }}
-        """)
         self.statusBar().showMessage('就绪')
     
+    def _ensure_report_preview(self):
+        """创建报告预览控件（只创建一次）并返回"""
+        if self.report_preview is not None:
+            return self.report_preview
+            
+        # 使用QWebEngineView进行HTML预览
+        self.report_preview = QWebEngineView()
+        self.report_preview.setMinimumWidth(600)  # 设置最小宽度
+        self.report_preview.setMinimumHeight(700)  # 设置最小高度
+        # 报告是静态页面，关闭JavaScript以省去脚本引擎的初始化
+        self.report_preview.settings().setAttribute(QWebEngineSettings.JavascriptEnabled, False)
+        
+        # 添加一些默认的HTML内容
+        default_html = """
+        <html>
+        <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
+            <h2>欢迎使用基于大数据的电商平台商品销售趋势分析与决策软件</h2>
+            <p>点击"生成报告"按钮查看完整报告预览</p>
+            <p style="color: #666;">报告将在此处显示</p>
+        </body>
+        </html>
+        """
+        self.report_preview.setHtml(default_html)
+        
+        # 替换占位控件
+        self._report_preview_layout.replaceWidget(self._report_preview_placeholder, self.report_preview)
+        self._report_preview_placeholder.deleteLater()
+        self._report_preview_placeholder = None
+        return self.report_preview
+    
     def init_data_management_tab(self):
         """初始化数据管理选项卡"""
         layout = QVBoxLayout(self.data_management_tab)
@@ -394,51 +1072,20 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 数据加载区域
         data_group = QGroupBox("数据加载")
-        data_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_PRIMARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_PRIMARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        data_group.setObjectName("primaryGroup")
         data_layout = QHBoxLayout()
         data_layout.setContentsMargins(10, 15, 10, 10)
         data_layout.setSpacing(10)
         
         self.load_btn = QPushButton("加载数据")
-        self.load_btn.setIcon(QIcon.fromTheme("document-open"))
+        self.load_btn.setIcon(theme_icon("document-open"))
         self.load_btn.setMinimumHeight(40)
-        self.load_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_PRIMARY};
-                font-size: 14px;
-                min-width: 120px;
-            }}
-        """)
+        self.load_btn.setObjectName("loadButton")
         self.load_btn.clicked.connect(self.load_data)
         data_layout.addWidget(self.load_btn)
         
         self.data_path_label = QLabel("未加载数据")
-        self.data_path_label.setStyleSheet(f"""
-            QLabel {{
-                font-size: 13px;
-                color: {COLOR_TEXT};
-                padding: 5px 10px;
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-            }}
-        """)
+        self.data_path_label.setObjectName("dataPathLabel")
         data_layout.addWidget(self.data_path_label)
         data_layout.addStretch()
         
@@ -447,23 +1094,7 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 数据基本信息表格
         info_group = QGroupBox("数据基本信息")
-        info_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_SECONDARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_SECONDARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        info_group.setObjectName("secondaryGroup")
         info_layout = QVBoxLayout()
         info_layout.setContentsMargins(10, 15, 10, 10)
         
@@ -472,14 +1103,7 @@ class EcommerceAnalysisApp(QMainWindow):
         self.data_info_table.setHorizontalHeaderLabels(["属性", "值"])
         self.data_info_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.data_info_table.setAlternatingRowColors(True)
-        self.data_info_table.setStyleSheet("""
-            QTableWidget {
-                font-size: 12px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-        """)
+        self.data_info_table.setObjectName("dataTable")
         info_layout.addWidget(self.data_info_table)
         
         info_group.setLayout(info_layout)
@@ -487,60 +1111,44 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 筛选控制区域
         filter_group = QGroupBox("数据筛选")
-        filter_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_ACCENT};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_ACCENT};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        filter_group.setObjectName("accentGroup")
         filter_layout = QHBoxLayout()
         filter_layout.setContentsMargins(10, 15, 10, 10)
         filter_layout.setSpacing(10)
         
         # 年份筛选
         year_label = QLabel("年份:")
-        year_label.setStyleSheet("font-weight: bold;")
+        year_label.setObjectName("fieldLabel")
         self.year_combo = QComboBox()
         self.year_combo.addItem("全部")
         self.year_combo.setMinimumWidth(100)
-        self.year_combo.currentTextChanged.connect(self.update_full_data_view)
+        self.year_combo.currentTextChanged.connect(self.schedule_full_data_refresh)
         
         # 季度筛选
         quarter_label = QLabel("季度:")
-        quarter_label.setStyleSheet("font-weight: bold;")
+        quarter_label.setObjectName("fieldLabel")
         self.quarter_combo = QComboBox()
         self.quarter_combo.addItem("全部")
         self.quarter_combo.addItems(["1", "2", "3", "4"])
         self.quarter_combo.setMinimumWidth(80)
-        self.quarter_combo.currentTextChanged.connect(self.update_full_data_view)
+        self.quarter_combo.currentTextChanged.connect(self.schedule_full_data_refresh)
         
         # 月份筛选
         month_label = QLabel("月份:")
-        month_label.setStyleSheet("font-weight: bold;")
+        month_label.setObjectName("fieldLabel")
         self.month_combo = QComboBox()
         self.month_combo.addItem("全部")
         self.month_combo.addItems([str(i) for i in range(1, 13)])
         self.month_combo.setMinimumWidth(80)
-        self.month_combo.currentTextChanged.connect(self.update_full_data_view)
+        self.month_combo.currentTextChanged.connect(self.schedule_full_data_refresh)
         
         # 商品类别筛选
         category_label = QLabel("商品类别:")
-        category_label.setStyleSheet("font-weight: bold;")
+        category_label.setObjectName("fieldLabel")
         self.data_category_combo = QComboBox()
         self.data_category_combo.addItem("全部")
         self.data_category_combo.setMinimumWidth(120)
-        self.data_category_combo.currentTextChanged.connect(self.update_full_data_view)
+        self.data_category_combo.currentTextChanged.connect(self.schedule_full_data_refresh)
         
         # 添加筛选控件到布局
         filter_layout.addWidget(year_label)
@@ -555,13 +1163,8 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 重置筛选按钮
         self.reset_filter_btn = QPushButton("重置筛选")
-        self.reset_filter_btn.setIcon(QIcon.fromTheme("edit-clear"))
-        self.reset_filter_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_DARK_BG};
-                min-width: 100px;
-            }}
-        """)
+        self.reset_filter_btn.setIcon(theme_icon("edit-clear"))
+        self.reset_filter_btn.setObjectName("resetFilterButton")
         self.reset_filter_btn.clicked.connect(self.reset_data_filters)
         filter_layout.addWidget(self.reset_filter_btn)
         
@@ -574,35 +1177,15 @@ class EcommerceAnalysisApp(QMainWindow):
         
         stats_frame = QFrame()
         stats_frame.setFrameShape(QFrame.StyledPanel)
-        stats_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {COLOR_LIGHT_BG};
-                border-radius: 5px;
-                border: 1px solid #ddd;
-            }}
-        """)
+        stats_frame.setObjectName("statsFrame")
         stats_inner_layout = QHBoxLayout(stats_frame)
         
         self.filtered_count_label = QLabel("已筛选记录数: 0")
-        self.filtered_count_label.setStyleSheet(f"""
-            QLabel {{
-                font-weight: bold;
-                font-size: 13px;
-                color: {COLOR_PRIMARY};
-                padding: 3px;
-            }}
-        """)
+        self.filtered_count_label.setObjectName("filteredCountLabel")
         stats_inner_layout.addWidget(self.filtered_count_label)
         
         self.total_count_label = QLabel("总记录数: 0")
-        self.total_count_label.setStyleSheet(f"""
-            QLabel {{
-                font-weight: bold;
-                font-size: 13px;
-                color: {COLOR_TEXT};
-                padding: 3px;
-            }}
-        """)
+        self.total_count_label.setObjectName("totalCountLabel")
         stats_inner_layout.addWidget(self.total_count_label)
         
         stats_inner_layout.addStretch()
@@ -611,22 +1194,17 @@ class EcommerceAnalysisApp(QMainWindow):
         layout.addLayout(stats_layout)
         
         # 完整数据表格
-        self.full_data_table = QTableWidget()
-        self.full_data_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.full_data_model = PandasModel(parent=self)
+        self.full_data_table = QTableView()
+        self.full_data_table.setModel(self.full_data_model)
+        # 列宽只在列发生变化（模型重置）时按采样的行计算一次，
+        # 不使用ResizeToContents，避免每次筛选和滚动都重新测量单元格
+        header = self.full_data_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setResizeContentsPrecision(COLUMN_WIDTH_SAMPLE_ROWS)
+        self.full_data_model.modelReset.connect(self.full_data_table.resizeColumnsToContents)
         self.full_data_table.setAlternatingRowColors(True)  # 交替行颜色
-        self.full_data_table.setStyleSheet("""
-            QTableWidget {
-                font-size: 12px;
-                gridline-color: #d4d4d4;
-            }
-            QTableWidget::item {
-                padding: 4px;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-        """)
+        self.full_data_table.setObjectName("fullDataTable")
         layout.addWidget(self.full_data_table)
     
     def init_data_analysis_tab(self):
@@ -637,61 +1215,40 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 分析控制区域
         control_group = QGroupBox("分析控制")
-        control_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_PRIMARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_PRIMARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        control_group.setObjectName("primaryGroup")
         control_layout = QHBoxLayout()
         control_layout.setContentsMargins(10, 15, 10, 10)
         control_layout.setSpacing(15)
         
         # 时间单位选择
         time_label = QLabel("时间单位:")
-        time_label.setStyleSheet("font-weight: bold;")
+        time_label.setObjectName("fieldLabel")
         self.time_combo = QComboBox()
         self.time_combo.addItems(["日", "月", "季度", "年"])
         self.time_combo.setCurrentIndex(1)  # 默认选择"月"
         self.time_combo.setMinimumWidth(100)
-        self.time_combo.currentTextChanged.connect(self.update_analysis)
+        self.time_combo.currentTextChanged.connect(self.schedule_analysis_refresh)
         
         # 商品类别选择
         category_label = QLabel("商品类别:")
-        category_label.setStyleSheet("font-weight: bold;")
+        category_label.setObjectName("fieldLabel")
         self.category_combo = QComboBox()
         self.category_combo.addItems(["全部"])
         self.category_combo.setMinimumWidth(150)
-        self.category_combo.currentTextChanged.connect(self.update_analysis)
+        self.category_combo.currentTextChanged.connect(self.schedule_analysis_refresh)
         
         # 地区级别选择
         region_label = QLabel("地区级别:")
-        region_label.setStyleSheet("font-weight: bold;")
+        region_label.setObjectName("fieldLabel")
         self.region_combo = QComboBox()
         self.region_combo.addItems(["省份", "城市"])
         self.region_combo.setMinimumWidth(100)
-        self.region_combo.currentTextChanged.connect(self.update_analysis)
+        self.region_combo.currentTextChanged.connect(self.schedule_analysis_refresh)
         
         # 刷新分析按钮
         refresh_btn = QPushButton("刷新分析")
-        refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
-        refresh_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_SECONDARY};
-                min-width: 120px;
-            }}
-        """)
+        refresh_btn.setIcon(theme_icon("view-refresh"))
+        refresh_btn.setObjectName("refreshButton")
         refresh_btn.clicked.connect(self.update_analysis)
         
         control_layout.addWidget(time_label)
@@ -708,33 +1265,7 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 分析结果选项卡
         self.analysis_tabs = QTabWidget()
-        self.analysis_tabs.setStyleSheet(f"""
-            QTabWidget::pane {{
-                border: 1px solid #bdc3c7;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: white;
-            }}
-            
-            QTabBar::tab {{
-                background-color: #ecf0f1;
-                color: {COLOR_TEXT};
-                min-width: 120px;
-                padding: 8px 15px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background-color: {COLOR_PRIMARY};
-                color: white;
-            }}
-            
-            QTabBar::tab:hover:!selected {{
-                background-color: #d0d9e0;
-            }}
-        """)
+        self.analysis_tabs.setObjectName("subTabs")
         
         # 销售趋势分析选项卡
         self.trend_tab = QWidget()
@@ -745,18 +1276,13 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         trend_title = QLabel("销售趋势分析")
         trend_title.setAlignment(Qt.AlignCenter)
-        trend_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        trend_title.setObjectName("sectionTitle")
         trend_layout.addWidget(trend_title)
         
         # 销售趋势图
         trend_frame = QFrame()
         trend_frame.setFrameShape(QFrame.StyledPanel)
-        trend_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        trend_frame.setObjectName("chartFrame")
         trend_inner_layout = QVBoxLayout(trend_frame)
         
         self.trend_canvas = MatplotlibCanvas(self.trend_tab)
@@ -767,16 +1293,12 @@ class EcommerceAnalysisApp(QMainWindow):
         # 销售热图
         heatmap_frame = QFrame()
         heatmap_frame.setFrameShape(QFrame.StyledPanel)
-        heatmap_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        heatmap_frame.setObjectName("chartFrame")
         heatmap_inner_layout = QVBoxLayout(heatmap_frame)
         
         heatmap_title = QLabel("月度-类别销售热力图")
         heatmap_title.setAlignment(Qt.AlignCenter)
-        heatmap_title.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-        """)
+        heatmap_title.setObjectName("chartTitle")
         heatmap_inner_layout.addWidget(heatmap_title)
         
         self.heatmap_canvas = MatplotlibCanvas(self.trend_tab)
@@ -795,18 +1317,13 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         category_title = QLabel("商品类别分析")
         category_title.setAlignment(Qt.AlignCenter)
-        category_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        category_title.setObjectName("sectionTitle")
         category_layout.addWidget(category_title)
         
         # 类别销售额对比图
         category_frame = QFrame()
         category_frame.setFrameShape(QFrame.StyledPanel)
-        category_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        category_frame.setObjectName("chartFrame")
         category_inner_layout = QVBoxLayout(category_frame)
         
         self.category_canvas = MatplotlibCanvas(self.category_tab)
@@ -817,31 +1334,21 @@ class EcommerceAnalysisApp(QMainWindow):
         # 热销商品表格
         products_frame = QFrame()
         products_frame.setFrameShape(QFrame.StyledPanel)
-        products_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        products_frame.setObjectName("chartFrame")
         products_inner_layout = QVBoxLayout(products_frame)
         
         products_title = QLabel("热销商品TOP10")
         products_title.setAlignment(Qt.AlignCenter)
-        products_title.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-        """)
+        products_title.setObjectName("chartTitle")
         products_inner_layout.addWidget(products_title)
         
-        self.top_products_table = QTableWidget()
-        self.top_products_table.setColumnCount(2)
-        self.top_products_table.setHorizontalHeaderLabels(["商品名称", "销售额"])
+        # 表格内容由模型提供，刷新时整体替换数据，不再逐个单元格设置
+        self.top_products_model = PandasModel(pd.DataFrame(columns=["商品名称", "销售额"]), parent=self)
+        self.top_products_table = QTableView()
+        self.top_products_table.setModel(self.top_products_model)
         self.top_products_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.top_products_table.setAlternatingRowColors(True)
-        self.top_products_table.setStyleSheet("""
-            QTableWidget {
-                font-size: 12px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-        """)
+        self.top_products_table.setObjectName("dataTable")
         products_inner_layout.addWidget(self.top_products_table)
         
         category_layout.addWidget(products_frame)
@@ -857,18 +1364,13 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         region_title = QLabel("地区销售分析")
         region_title.setAlignment(Qt.AlignCenter)
-        region_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        region_title.setObjectName("sectionTitle")
         region_layout.addWidget(region_title)
         
         # 地区销售对比图
         region_frame = QFrame()
         region_frame.setFrameShape(QFrame.StyledPanel)
-        region_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        region_frame.setObjectName("chartFrame")
         region_inner_layout = QVBoxLayout(region_frame)
         
         self.region_canvas = MatplotlibCanvas(self.region_tab)
@@ -887,33 +1389,21 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         customer_title = QLabel("客户群体分析")
         customer_title.setAlignment(Qt.AlignCenter)
-        customer_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        customer_title.setObjectName("sectionTitle")
         customer_layout.addWidget(customer_title)
         
         # 客户群体分析表格
         customer_frame = QFrame()
         customer_frame.setFrameShape(QFrame.StyledPanel)
-        customer_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        customer_frame.setObjectName("chartFrame")
         customer_inner_layout = QVBoxLayout(customer_frame)
         
-        self.customer_table = QTableWidget()
-        self.customer_table.setColumnCount(3)
-        self.customer_table.setHorizontalHeaderLabels(["客户群体", "客户数量", "平均消费额"])
+        self.customer_model = PandasModel(pd.DataFrame(columns=["客户群体", "客户数量", "平均消费额"]), parent=self)
+        self.customer_table = QTableView()
+        self.customer_table.setModel(self.customer_model)
         self.customer_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.customer_table.setAlternatingRowColors(True)
-        self.customer_table.setStyleSheet("""
-            QTableWidget {
-                font-size: 12px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-        """)
+        self.customer_table.setObjectName("dataTable")
         customer_inner_layout.addWidget(self.customer_table)
         
         customer_layout.addWidget(customer_frame)
@@ -929,18 +1419,13 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         promotion_title = QLabel("促销效果分析")
         promotion_title.setAlignment(Qt.AlignCenter)
-        promotion_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        promotion_title.setObjectName("sectionTitle")
         promotion_layout.addWidget(promotion_title)
         
         # 购物节影响分析图
         festival_frame = QFrame()
         festival_frame.setFrameShape(QFrame.StyledPanel)
-        festival_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        festival_frame.setObjectName("chartFrame")
         festival_inner_layout = QVBoxLayout(festival_frame)
         
         self.festival_canvas = MatplotlibCanvas(self.promotion_tab)
@@ -960,33 +1445,7 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 创建子选项卡
         self.prediction_tabs = QTabWidget()
-        self.prediction_tabs.setStyleSheet(f"""
-            QTabWidget::pane {{
-                border: 1px solid #bdc3c7;
-                border-radius: 5px;
-                padding: 5px;
-                background-color: white;
-            }}
-            
-            QTabBar::tab {{
-                background-color: #ecf0f1;
-                color: {COLOR_TEXT};
-                min-width: 120px;
-                padding: 8px 15px;
-                margin-right: 2px;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background-color: {COLOR_PRIMARY};
-                color: white;
-            }}
-            
-            QTabBar::tab:hover:!selected {{
-                background-color: #d0d9e0;
-            }}
-        """)
+        self.prediction_tabs.setObjectName("subTabs")
         
         # 销售预测选项卡
         self.forecast_tab = QWidget()
@@ -997,40 +1456,19 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         forecast_title = QLabel("销售预测分析")
         forecast_title.setAlignment(Qt.AlignCenter)
-        forecast_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        forecast_title.setObjectName("sectionTitle")
         forecast_layout.addWidget(forecast_title)
         
         # 预测控制区域
         forecast_control_group = QGroupBox("预测控制")
-        forecast_control_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_PRIMARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_PRIMARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        forecast_control_group.setObjectName("primaryGroup")
         forecast_control_layout = QHBoxLayout()
         forecast_control_layout.setContentsMargins(10, 15, 10, 10)
         forecast_control_layout.setSpacing(15)
         
         # 预测时间单位选择
         forecast_time_label = QLabel("时间单位:")
-        forecast_time_label.setStyleSheet("font-weight: bold;")
+        forecast_time_label.setObjectName("fieldLabel")
         self.forecast_time_combo = QComboBox()
         self.forecast_time_combo.addItems(["日", "月", "季度"])
         self.forecast_time_combo.setCurrentIndex(1)  # 默认选择"月"
@@ -1038,7 +1476,7 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 预测方法选择
         forecast_method_label = QLabel("预测方法:")
-        forecast_method_label.setStyleSheet("font-weight: bold;")
+        forecast_method_label.setObjectName("fieldLabel")
         self.forecast_method_combo = QComboBox()
         self.forecast_method_combo.addItems(["指数平滑", "线性回归"])
         self.forecast_method_combo.setMinimumWidth(100)
@@ -1052,29 +1490,17 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 预测周期设置
         forecast_periods_label = QLabel("预测周期数:")
-        forecast_periods_label.setStyleSheet("font-weight: bold;")
+        forecast_periods_label.setObjectName("fieldLabel")
         self.forecast_periods_spin = QSpinBox()
         self.forecast_periods_spin.setRange(1, 24)
         self.forecast_periods_spin.setValue(6)
         self.forecast_periods_spin.setMinimumWidth(70)
-        self.forecast_periods_spin.setStyleSheet("""
-            QSpinBox {
-                padding: 4px;
-                font-size: 13px;
-            }
-        """)
+        self.forecast_periods_spin.setObjectName("forecastPeriodsSpin")
         
         # 预测按钮
         self.forecast_btn = QPushButton("生成预测")
-        self.forecast_btn.setIcon(QIcon.fromTheme("system-run"))
-        self.forecast_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_SECONDARY};
-                min-width: 120px;
-                min-height: 35px;
-                font-size: 13px;
-            }}
-        """)
+        self.forecast_btn.setIcon(theme_icon("system-run"))
+        self.forecast_btn.setObjectName("forecastButton")
         self.forecast_btn.clicked.connect(self.update_sales_forecast)
         
         # 添加控件到布局
@@ -1093,16 +1519,12 @@ class EcommerceAnalysisApp(QMainWindow):
         # 预测图表
         forecast_chart_frame = QFrame()
         forecast_chart_frame.setFrameShape(QFrame.StyledPanel)
-        forecast_chart_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        forecast_chart_frame.setObjectName("chartFrame")
         forecast_chart_layout = QVBoxLayout(forecast_chart_frame)
         
         forecast_chart_title = QLabel("销售预测趋势图")
         forecast_chart_title.setAlignment(Qt.AlignCenter)
-        forecast_chart_title.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-        """)
+        forecast_chart_title.setObjectName("chartTitle")
         forecast_chart_layout.addWidget(forecast_chart_title)
         
         self.forecast_canvas = MatplotlibCanvas(self.forecast_tab)
@@ -1113,16 +1535,12 @@ class EcommerceAnalysisApp(QMainWindow):
         # 预测数据表格
         forecast_table_frame = QFrame()
         forecast_table_frame.setFrameShape(QFrame.StyledPanel)
-        forecast_table_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        forecast_table_frame.setObjectName("chartFrame")
         forecast_table_layout = QVBoxLayout(forecast_table_frame)
         
         forecast_table_title = QLabel("销售预测数据明细")
         forecast_table_title.setAlignment(Qt.AlignCenter)
-        forecast_table_title.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-        """)
+        forecast_table_title.setObjectName("chartTitle")
         forecast_table_layout.addWidget(forecast_table_title)
         
         self.forecast_table = QTableWidget()
@@ -1130,18 +1548,10 @@ class EcommerceAnalysisApp(QMainWindow):
         self.forecast_table.setHorizontalHeaderLabels(["日期", "实际销售额", "预测销售额", "数据类型"])
         self.forecast_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.forecast_table.setAlternatingRowColors(True)
-        self.forecast_table.setStyleSheet("""
-            QTableWidget {
-                font-size: 12px;
-            }
-            QTableWidget::item {
-                padding: 5px;
-            }
-            QTableWidget::item[data-type="预测"] {
-                background-color: rgba(231, 76, 60, 0.1);
-            }
-        """)
+        self.forecast_table.setObjectName("dataTable")
         forecast_table_layout.addWidget(self.forecast_table)
+        # 预测表格各行的文本及是否为预测行，生成报告时直接读取
+        self._forecast_rows = None
         
         forecast_layout.addWidget(forecast_table_frame)
         
@@ -1156,55 +1566,27 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         decision_title = QLabel("智能决策支持")
         decision_title.setAlignment(Qt.AlignCenter)
-        decision_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        decision_title.setObjectName("sectionTitle")
         decision_layout.addWidget(decision_title)
         
         # 决策控制区域
         decision_control_group = QGroupBox("决策支持控制")
-        decision_control_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_PRIMARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_PRIMARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        decision_control_group.setObjectName("primaryGroup")
         decision_control_layout = QHBoxLayout()
         decision_control_layout.setContentsMargins(10, 15, 10, 10)
         decision_control_layout.setSpacing(15)
         
         # 商品类别选择
         decision_category_label = QLabel("商品类别:")
-        decision_category_label.setStyleSheet("font-weight: bold;")
+        decision_category_label.setObjectName("fieldLabel")
         self.decision_category_combo = QComboBox()
         self.decision_category_combo.addItems(["全部"])
         self.decision_category_combo.setMinimumWidth(150)
         
         # 生成建议按钮
         self.generate_suggestions_btn = QPushButton("生成决策建议")
-        self.generate_suggestions_btn.setIcon(QIcon.fromTheme("dialog-information"))
-        self.generate_suggestions_btn.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {COLOR_SECONDARY};
-                min-width: 140px;
-                min-height: 35px;
-                font-size: 13px;
-            }}
-        """)
+        self.generate_suggestions_btn.setIcon(theme_icon("dialog-information"))
+        self.generate_suggestions_btn.setObjectName("suggestionButton")
         self.generate_suggestions_btn.clicked.connect(self.update_decision_suggestions)
         
         # 添加控件到布局
@@ -1219,30 +1601,17 @@ class EcommerceAnalysisApp(QMainWindow):
         # 决策建议文本区域
         decision_text_frame = QFrame()
         decision_text_frame.setFrameShape(QFrame.StyledPanel)
-        decision_text_frame.setStyleSheet("background-color: white; border-radius: 5px; border: 1px solid #ddd;")
+        decision_text_frame.setObjectName("chartFrame")
         decision_text_layout = QVBoxLayout(decision_text_frame)
         
         decision_text_title = QLabel("决策建议")
         decision_text_title.setAlignment(Qt.AlignCenter)
-        decision_text_title.setStyleSheet(f"""
-            font-size: 14px;
-            font-weight: bold;
-            color: {COLOR_TEXT};
-        """)
+        decision_text_title.setObjectName("chartTitle")
         decision_text_layout.addWidget(decision_text_title)
         
         self.suggestions_text = QTextEdit()
         self.suggestions_text.setReadOnly(True)
-        self.suggestions_text.setStyleSheet(f"""
-            QTextEdit {{
-                font-size: 13px;
-                line-height: 1.5;
-                padding: 10px;
-                border: none;
-                background-color: {COLOR_LIGHT_BG};
-                border-radius: 5px;
-            }}
-        """)
+        self.suggestions_text.setObjectName("suggestionsText")
         decision_text_layout.addWidget(self.suggestions_text)
         
         decision_layout.addWidget(decision_text_frame)
@@ -1260,22 +1629,12 @@ class EcommerceAnalysisApp(QMainWindow):
         # 添加标题标签
         report_title = QLabel("报告生成中心")
         report_title.setAlignment(Qt.AlignCenter)
-        report_title.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: bold;
-            color: {COLOR_PRIMARY};
-            margin-bottom: 5px;
-        """)
+        report_title.setObjectName("sectionTitle")
         layout.addWidget(report_title)
         
         # 创建左右分栏布局
         splitter = QSplitter(Qt.Horizontal)
-        splitter.setStyleSheet(f"""
-            QSplitter::handle {{
-                background-color: {COLOR_LIGHT_BG};
-                width: 2px;
-            }}
-        """)
+        splitter.setObjectName("reportSplitter")
         
         # 左侧设置区域
         left_widget = QWidget()
@@ -1285,79 +1644,37 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 报告设置区域
         report_settings_group = QGroupBox("报告设置")
-        report_settings_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-size: 14px;
-                font-weight: bold;
-                border: 2px solid {COLOR_PRIMARY};
-                border-radius: 6px;
-                margin-top: 12px;
-                padding-top: 15px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                padding: 0 10px;
-                color: {COLOR_PRIMARY};
-                background-color: {COLOR_BACKGROUND};
-            }}
-        """)
+        report_settings_group.setObjectName("primaryGroup")
         settings_layout = QGridLayout()
         settings_layout.setContentsMargins(10, 15, 10, 10)
         settings_layout.setSpacing(10)
         
         # 报告标题
         title_label = QLabel("报告标题:")
-        title_label.setStyleSheet("font-weight: bold;")
+        title_label.setObjectName("fieldLabel")
         self.report_title_edit = QTextEdit()
         self.report_title_edit.setMaximumHeight(60)
         self.report_title_edit.setText("电商平台销售分析报告")
-        self.report_title_edit.setStyleSheet(f"""
-            QTextEdit {{
-                font-size: 13px;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                padding: 8px;
-                background-color: white;
-            }}
-        """)
+        self.report_title_edit.setObjectName("reportTitleEdit")
         settings_layout.addWidget(title_label, 0, 0)
         settings_layout.addWidget(self.report_title_edit, 0, 1)
         
         # 报告时间范围
         date_label = QLabel("报告时间范围:")
-        date_label.setStyleSheet("font-weight: bold;")
+        date_label.setObjectName("fieldLabel")
         date_layout = QHBoxLayout()
         
         start_date_label = QLabel("开始日期:")
         self.start_date_edit = QDateEdit()
         self.start_date_edit.setCalendarPopup(True)
         self.start_date_edit.setDate(QDate.currentDate().addMonths(-6))
-        self.start_date_edit.setStyleSheet("""
-            QDateEdit {
-                padding: 5px;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                background-color: white;
-                min-height: 25px;
-                min-width: 100px;
-            }
-        """)
+        self.start_date_edit.setObjectName("reportDateEdit")
         
         end_date_label = QLabel("结束日期:")
         self.end_date_edit = QDateEdit()
         self.end_date_edit.setCalendarPopup(True)
         self.end_date_edit.setDate(QDate.currentDate())
-        self.end_date_edit.setStyleSheet("""
-            QDateEdit {
-                padding: 5px;
-                border: 1px solid #bdc3c7;
-                border-radius: 4px;
-                background-color: white;
-                min-height: 25px;
-                min-width: 100px;
-            }
-        """)
+        self.end_date_edit.setObjectName("reportDateEdit")
         
         date_layout.addWidget(start_date_label)
         date_layout.addWidget(self.start_date_edit)
@@ -1370,33 +1687,12 @@ class EcommerceAnalysisApp(QMainWindow):
         
         # 报告内容选择
         content_label = QLabel("报告内容:")
-        content_label.setStyleSheet("font-weight: bold;")
+        content_label.setObjectName("fieldLabel")
         
         # 创建一个漂亮的内容选择框架
         content_frame = QFrame()
         content_frame.setFrameShape(QFrame.StyledPanel)
-        content_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: white;
-                border-radius: 5px;
-                border: 1px solid #ddd;
-            }}
-            QCheckBox {{
-                font-size: 13px;
-                padding: 5px;
-            }}
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-                border: 1px solid #bdc3c7;
-                border-radius: 3px;
-            }}
-            QCheckBox::indicator:checked {{
-                background-color: {COLOR_PRIMARY};
-                border: 1px solid {COLOR_PRIMARY};
-                image: url(:/qt-project.org/styles/commonstyle/images/check-16.png);
-            }}
-        """)
+        content_frame.setObjectName("contentFrame")
         content_layout = QGridLayout(content_frame)
         content_layout.setContentsMargins(15, 10, 15, 10)
         content_layout.setSpacing(10)
@@ -1459,27 +1755,31 @@ class EcommerceAnalysisApp(QMainWindow):
         # 报告预览标题
         preview_label = QLabel("报告预览")
         preview_label.setAlignment(Qt.AlignCenter)
-        preview_label.setStyleSheet("font-size: 14px; font-weight: bold; margin-bottom: 10px;")
+        preview_label.setObjectName("previewTitle")
         right_layout.addWidget(preview_label)
         
-        # 使用QWebEngineView进行HTML预览
-        self.report_preview = QWebEngineView()
-        self.report_preview.setMinimumWidth(600)  # 设置最小宽度
-        self.report_preview.setMinimumHeight(700)  # 设置最小高度
-        
-        # 添加一些默认的HTML内容
-        default_html = """
-        <html>
-        <body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">
-            <h2>欢迎使用基于大数据的电商平台商品销售趋势分析与决策软件</h2>
-            <p>点击"生成报告"按钮查看完整报告预览</p>
-            <p style="color: #666;">报告将在此处显示</p>
-        </body>
-        </html>
-        """
-        self.report_preview.setHtml(default_html)
-        
-        right_layout.addWidget(self.report_preview)
+        # QWebEngineView会启动独立的渲染进程，先用QLabel显示提示文字，首次生成或保存报告时再创建
+        self.report_preview = None
+        # 报告图表的临时目录，每次生成报告时重建
+        self._report_image_dir = None
+        # 报告图表的导出分辨率，需要打印质量时可调高
+        self._report_dpi = REPORT_CHART_DPI
+        # 最近一次生成的报告HTML，保存报告时直接写入文件
+        self._last_report_html = None
+        # 报告图表路径到file:// URL的映射
+        self._report_image_urls = {}
+        self._report_preview_layout = right_layout
+        self._report_preview_placeholder = QLabel(
+            "<h2>欢迎使用基于大数据的电商平台商品销售趋势分析与决策软件</h2>"
+            "<p>点击\"生成报告\"按钮查看完整报告预览</p>"
+            "<p style=\"color: #666;\">报告将在此处显示</p>"
+        )
+        self._report_preview_placeholder.setObjectName("reportPlaceholder")
+        self._report_preview_placeholder.setAlignment(Qt.AlignHCenter | Qt.AlignTop)
+        self._report_preview_placeholder.setWordWrap(True)
+        self._report_preview_placeholder.setMinimumWidth(600)
+        self._report_preview_placeholder.setMinimumHeight(700)
+        right_layout.addWidget(self._report_preview_placeholder)
         
         # 添加左右部件到分割器
         splitter.addWidget(left_widget)
@@ -1499,20 +1799,27 @@ class EcommerceAnalysisApp(QMainWindow):
         summary = self.analyzer.get_data_summary()
         
         if summary:
-            # 更新数据信息表格
-            self.data_info_table.setRowCount(len(summary))
-            row = 0
-            for key, value in summary.items():
-                self.data_info_table.setItem(row, 0, QTableWidgetItem(key))
-                
-                # 如果值是列表，将其转换为字符串
-                if isinstance(value, list):
-                    value_str = ", ".join(map(str, value))
-                else:
-                    value_str = str(value)
-                    
-                self.data_info_table.setItem(row, 1, QTableWidgetItem(value_str))
-                row += 1
+            # 摘要内容与上次显示的相同时（例如重新加载同一文件）不再重建数据信息表格
+            summary_items = tuple((key, repr(value)) for key, value in summary.items())
+            if summary_items != self._summary_items:
+                self._summary_items = summary_items
+                
+                # 更新数据信息表格
+                with bulk_table_update(self.data_info_table):
+                    # 只调整行数，保留的行复用已有的单元格项
+                    self.data_info_table.setRowCount(len(summary))
+                    row = 0
+                    for key, value in summary.items():
+                        set_table_text(self.data_info_table, row, 0, key)
+                        
+                        # 如果值是列表，将其转换为字符串
+                        if isinstance(value, list):
+                            value_str = ", ".join(map(str, value))
+                        else:
+                            value_str = str(value)
+                            
+                        set_table_text(self.data_info_table, row, 1, value_str)
+                        row += 1
             
             # 更新筛选控件的选项
             self.update_filter_options()
@@ -1525,47 +1832,53 @@ class EcommerceAnalysisApp(QMainWindow):
         if self.analyzer.df is None:
             return
             
-        # 获取数据中的年份选项
-        if '年' in self.analyzer.df.columns:
-            years = sorted(self.analyzer.df['年'].unique())
-        elif '日期' in self.analyzer.df.columns:
-            years = sorted(self.analyzer.df['日期'].dt.year.unique())
-        else:
-            years = []
+        # 年、月列在加载时已转换为有序分类类型，选项直接取自类别，不必扫描整列
+        df = self.analyzer.df
+        years = df['年'].cat.categories if '年' in df.columns else []
+        months = df['月'].cat.categories if '月' in df.columns else range(1, 13)
             
-        # 更新年份下拉框
-        current_year = self.year_combo.currentText()
-        self.year_combo.clear()
-        self.year_combo.addItem("全部")
-        self.year_combo.addItems([str(int(year)) for year in years])
-        
-        # 尝试恢复之前的选择
-        index = self.year_combo.findText(current_year)
-        if index >= 0:
-            self.year_combo.setCurrentIndex(index)
+        # 更新年份、月份下拉框（屏蔽信号，数据视图由调用方统一刷新），尝试恢复之前的选择
+        self._set_combo_items(self.year_combo, ["全部"] + [str(int(year)) for year in years],
+                              self.year_combo.currentText())
+        self._set_combo_items(self.month_combo, ["全部"] + [str(int(month)) for month in months],
+                              self.month_combo.currentText())
             
         # 获取数据中的商品类别选项
-        if '商品类别' in self.analyzer.df.columns:
-            categories = sorted(self.analyzer.df['商品类别'].unique())
-        else:
-            categories = []
+        categories = self.analyzer.get_category_list()
             
         # 更新商品类别下拉框
-        current_category = self.data_category_combo.currentText()
-        self.data_category_combo.clear()
-        self.data_category_combo.addItem("全部")
-        self.data_category_combo.addItems(categories)
+        self._set_combo_items(self.data_category_combo, ["全部"] + categories,
+                              self.data_category_combo.currentText())
+            
+    @staticmethod
+    def _set_combo_items(combo, items, current_text=None):
+        """
+        一次性替换下拉框的全部选项
         
-        # 尝试恢复之前的选择
-        index = self.data_category_combo.findText(current_category)
-        if index >= 0:
-            self.data_category_combo.setCurrentIndex(index)
+        用新的字符串列表模型替换原模型，只触发一次模型重置，而不是清空后逐项插入；
+        替换期间屏蔽信号，之后选中current_text对应的项，找不到时选中第一项；
+        选项与现有的完全相同时（例如重新加载同一文件）保留原模型，只恢复选择
+        """
+        with QSignalBlocker(combo):
+            model = combo.model()
+            if not (isinstance(model, QStringListModel) and model.stringList() == items):
+                combo.setModel(QStringListModel(items, combo))
+            combo.setCurrentIndex(items.index(current_text) if current_text in items else 0)
             
     def update_full_data_view(self):
         """更新完整数据视图"""
+        # 直接调用时取消尚未触发的延迟刷新，避免重复更新
+        self._filter_refresh_timer.stop()
+        
         if self.analyzer.df is None:
             return
             
+        # 数据和筛选条件都与上次相同时无需更新
+        filter_state = tuple(combo.currentText() for combo in
+                             (self.year_combo, self.quarter_combo, self.month_combo, self.data_category_combo))
+        if self._view_is_current('full_data', *filter_state):
+            return
+            
         # 应用筛选条件
         filtered_df = self.get_filtered_data()
         
@@ -1573,82 +1886,144 @@ class EcommerceAnalysisApp(QMainWindow):
         self.filtered_count_label.setText(f"已筛选记录数: {len(filtered_df)}")
         self.total_count_label.setText(f"总记录数: {len(self.analyzer.df)}")
         
-        # 更新完整数据表格
-        self.full_data_table.setRowCount(len(filtered_df))
-        self.full_data_table.setColumnCount(len(filtered_df.columns))
-        self.full_data_table.setHorizontalHeaderLabels(filtered_df.columns)
-        
-        # 设置数据
-        for i in range(len(filtered_df)):
-            for j in range(len(filtered_df.columns)):
-                value = filtered_df.iloc[i, j]
-                
-                # 格式化日期列
-                if filtered_df.columns[j] == '日期':
-                    if pd.notnull(value):
-                        value = pd.to_datetime(value).strftime('%Y-%m-%d')
-                
-                self.full_data_table.setItem(i, j, QTableWidgetItem(str(value)))
+        # 更新完整数据表格，由模型按需提供可见单元格的内容；行数较多时关闭交替行颜色
+        self.full_data_table.setAlternatingRowColors(len(filtered_df) < ALTERNATING_ROWS_LIMIT)
+        self.full_data_model.setDataFrame(filtered_df)
+        self._mark_view_current('full_data', *filter_state)
         
     def get_filtered_data(self):
         """根据筛选条件获取过滤后的数据"""
         if self.analyzer.df is None:
             return pd.DataFrame()
             
-        filtered_df = self.analyzer.df.copy()
-        
-        # 应用年份筛选
-        year = self.year_combo.currentText()
-        if year != "全部" and year.strip():  # 确保年份不是空字符串
-            try:
-                year_value = int(year)
-                if '年' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['年'] == year_value]
-                elif '日期' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['日期'].dt.year == year_value]
-            except (ValueError, TypeError):
-                # 忽略无效的年份值
-                pass
-                
-        # 应用季度筛选
-        quarter = self.quarter_combo.currentText()
-        if quarter != "全部" and quarter.strip():  # 确保季度不是空字符串
-            try:
-                quarter_value = int(quarter)
-                if '季度' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['季度'] == quarter_value]
-                elif '日期' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['日期'].dt.quarter == quarter_value]
-            except (ValueError, TypeError):
-                # 忽略无效的季度值
-                pass
-                
-        # 应用月份筛选
-        month = self.month_combo.currentText()
-        if month != "全部" and month.strip():  # 确保月份不是空字符串
-            try:
-                month_value = int(month)
-                if '月' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['月'] == month_value]
-                elif '日期' in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df['日期'].dt.month == month_value]
-            except (ValueError, TypeError):
-                # 忽略无效的月份值
-                pass
-                
-        # 应用商品类别筛选
+        # 忽略"全部"、空字符串和无效的值
+        year = self._parse_filter_value(self.year_combo.currentText())
+        quarter = self._parse_filter_value(self.quarter_combo.currentText())
+        month = self._parse_filter_value(self.month_combo.currentText())
         category = self.data_category_combo.currentText()
-        if category != "全部" and '商品类别' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['商品类别'] == category]
+        if category == "全部":
+            category = None
+            
+        if year is None and quarter is None and month is None and category is None:
+            return self.analyzer.df
+            
+        # 数据更换后筛选索引和缓存一起失效，需在查询缓存之前检查
+        filter_index = self._get_filter_index()
+        
+        # 相同的筛选条件直接复用之前的结果
+        key = (year, quarter, month, category)
+        if key in self._filter_cache:
+            self._filter_cache.move_to_end(key)
+            return self._filter_cache[key]
+            
+        # 优先通过预先计算的筛选索引取数，索引不可用时使用布尔掩码
+        if filter_index is not None:
+            filtered_df = self._filter_with_index(filter_index, key)
+        else:
+            filtered_df = self._filter_with_mask(key)
             
+        self._filter_cache[key] = filtered_df
+        if len(self._filter_cache) > FILTER_CACHE_SIZE:
+            self._filter_cache.popitem(last=False)
         return filtered_df
+    
+    def _filter_with_mask(self, key):
+        """将所有筛选条件合并为一个布尔掩码，只做一次索引"""
+        df = self.analyzer.df
+        year, quarter, month, category = key
+        conditions = []
+        
+        # 年份、季度、月份列在加载数据时已由日期列生成；有月份列时季度和月份合并为
+        # 允许的月份集合，只需对月份列做一次成员判断
+        if year is not None and '年' in df.columns:
+            conditions.append(self._isin_values(df['年'], [year]))
+        if '月' in df.columns and (quarter is not None or month is not None):
+            allowed = set(range(1, 13))
+            if quarter is not None:
+                allowed &= set(range(quarter * 3 - 2, quarter * 3 + 1))
+            if month is not None:
+                allowed &= {month}
+            conditions.append(self._isin_values(df['月'], sorted(allowed)))
+        else:
+            if quarter is not None and '季度' in df.columns:
+                conditions.append(self._isin_values(df['季度'], [quarter]))
+        if category is not None and '商品类别' in df.columns:
+            conditions.append(self._isin_values(df['商品类别'], [category]))
+            
+        # 第一个条件的结果直接作为掩码，之后的条件原地合并，不分配额外的全1数组
+        mask = None
+        for condition in conditions:
+            if mask is None:
+                mask = condition
+            else:
+                mask &= condition
+            
+        if mask is None or mask.all():
+            return df
+        return df.take(np.flatnonzero(mask))
+    
+    @staticmethod
+    def _isin_values(series, values):
+        """返回列中取值属于values的布尔数组，分类列直接比较整数编码"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.categories.get_indexer(values)
+            return np.isin(series.cat.codes.to_numpy(), codes[codes >= 0])
+        return np.isin(series.to_numpy(), np.asarray(values))
+    
+    def _get_filter_index(self):
+        """获取(年, 季度, 月, 商品类别)到行位置的索引，数据更换后重新构建"""
+        df = self.analyzer.df
+        if self._filter_index_source is not df:
+            self._filter_index_source = df
+            self._filter_cache.clear()
+            key_columns = ['年', '季度', '月', '商品类别']
+            if set(key_columns).issubset(df.columns):
+                self._filter_index = df.groupby(key_columns, observed=True, dropna=False).indices
+            else:
+                self._filter_index = None
+        return self._filter_index
+    
+    def _view_is_current(self, name, *params):
+        """图表或数据视图上次更新时使用的数据和参数与当前相同时返回True，此时无需重新更新"""
+        source = self._view_sources.get(name)
+        return source is not None and source[0] is self.analyzer.df and source[1] == params
+    
+    def _mark_view_current(self, name, *params):
+        """记录图表或数据视图本次更新使用的数据和参数"""
+        self._view_sources[name] = (self.analyzer.df, params)
+    
+    @staticmethod
+    def _parse_filter_value(text):
+        """将筛选下拉框的文本转换为整数，"全部"或无效值返回None"""
+        if text == "全部" or not text.strip():
+            return None
+        try:
+            return int(text)
+        except ValueError:
+            return None
+    
+    def _filter_with_index(self, filter_index, key):
+        """使用筛选索引获取过滤后的数据"""
+        year, quarter, month, category = key
+            
+        # 只需遍历分组键，收集满足条件的行位置并保持原有顺序
+        positions = [
+            rows for (y, q, m, c), rows in filter_index.items()
+            if (year is None or y == year)
+            and (quarter is None or q == quarter)
+            and (month is None or m == month)
+            and (category is None or c == category)
+        ]
+        if not positions:
+            return self.analyzer.df.iloc[:0]
+        return self.analyzer.df.take(np.sort(np.concatenate(positions)))
         
     def reset_data_filters(self):
         """重置所有筛选条件"""
-        self.year_combo.setCurrentText("全部")
-        self.quarter_combo.setCurrentText("全部")
-        self.month_combo.setCurrentText("全部")
-        self.data_category_combo.setCurrentText("全部")
+        # 重置期间屏蔽信号，避免每个下拉框都触发一次数据视图刷新
+        for combo in (self.year_combo, self.quarter_combo, self.month_combo, self.data_category_combo):
+            with QSignalBlocker(combo):
+                combo.setCurrentText("全部")
         self.update_full_data_view()
         
     def load_data(self):
@@ -1672,6 +2047,11 @@ class EcommerceAnalysisApp(QMainWindow):
         )
         
         if file_path:
+            # 上一次加载尚未结束时不启动新的加载
+            if self.load_thread is not None and self.load_thread.isRunning():
+                QMessageBox.information(self, "提示", "数据正在加载中，请稍候")
+                return
+                
             try:
                 # 创建进度对话框
                 progress = QProgressDialog("正在加载数据...", "取消", 0, 100, self)
@@ -1681,48 +2061,15 @@ class EcommerceAnalysisApp(QMainWindow):
                 progress.setValue(0)
                 
                 # 设置进度条的样式
-                progress.setStyleSheet(f"""
-                    QProgressDialog {{
-                        background-color: {COLOR_LIGHT_BG};
-                        border-radius: 8px;
-                        border: 1px solid #ddd;
-                        min-width: 400px;
-                        min-height: 120px;
-                    }}
-                    QProgressBar {{
-                        border: 1px solid #bdc3c7;
-                        border-radius: 5px;
-                        text-align: center;
-                        color: white;
-                        background-color: {COLOR_LIGHT_BG};
-                        height: 20px;
-                    }}
-                    QProgressBar::chunk {{
-                        background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:0, 
-                                            stop:0 {COLOR_PRIMARY}, stop:1 {COLOR_SECONDARY});
-                        width: 10px;
-                        margin: 0.5px;
-                        border-radius: 3px;
-                    }}
-                    QLabel {{
-                        font-size: 14px;
-                        color: {COLOR_TEXT};
-                        margin-bottom: 5px;
-                    }}
-                    QPushButton {{
-                        background-color: {COLOR_PRIMARY};
-                        color: white;
-                        border: none;
-                        border-radius: 4px;
-                        padding: 6px 12px;
-                        min-width: 80px;
-                    }}
-                """)
+                progress.setObjectName("loadProgressDialog")
                 
                 progress.show()
                 
-                # 创建并启动工作线程
+                # 创建工作对象并移动到工作线程
+                self.load_thread = QThread(self)
                 self.worker = DataLoadWorker(self.analyzer, file_path)
+                self.worker.moveToThread(self.load_thread)
+                self.load_thread.started.connect(self.worker.run)
                 
                 # 连接信号
                 self.worker.signals.progress.connect(
@@ -1734,8 +2081,12 @@ class EcommerceAnalysisApp(QMainWindow):
                 self.worker.signals.result.connect(
                     lambda df: self._process_loaded_data(df, file_path))
                 
+                # 加载结束（成功或失败）后退出线程的事件循环
+                self.worker.signals.finished.connect(self.load_thread.quit)
+                self.worker.signals.error.connect(self.load_thread.quit)
+                
                 # 启动线程
-                self.worker.start()
+                self.load_thread.start()
                 
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"加载数据失败: {str(e)}")
@@ -1781,27 +2132,28 @@ class EcommerceAnalysisApp(QMainWindow):
             
             # 更新商品类别下拉框
             if self.analyzer.df is not None:
-                categories = ["全部"] + sorted(self.analyzer.df['商品类别'].unique().tolist())
+                categories = ["全部"] + self.analyzer.get_category_list()
                 
-                # 更新数据分析选项卡中的类别下拉框
-                self.category_combo.clear()
-                self.category_combo.addItems(categories)
+                # 更新数据分析选项卡中的类别下拉框（屏蔽信号，分析结果在最后统一更新）
+                self._set_combo_items(self.category_combo, categories)
                 
                 # 更新决策支持选项卡中的类别下拉框
-                self.decision_category_combo.clear()
-                self.decision_category_combo.addItems(categories)
+                self._set_combo_items(self.decision_category_combo, categories)
             
             # 更新数据概览
             self.update_data_overview()
             
-            # 更新分析结果
-            self.update_analysis()
+            # 分析结果的绘制推迟到事件循环中执行，先让进度对话框关闭、界面响应
+            QTimer.singleShot(0, self.update_analysis)
         
         except Exception as e:
             QMessageBox.warning(self, "警告", f"更新界面时出错: {str(e)}")
     
     def update_analysis(self):
         """更新所有分析结果"""
+        # 直接调用时取消尚未触发的延迟刷新，避免重复更新
+        self._analysis_refresh_timer.stop()
+        
         if self.analyzer.df is None:
             QMessageBox.warning(self, "警告", "请先加载数据")
             return
@@ -1845,127 +2197,191 @@ class EcommerceAnalysisApp(QMainWindow):
     
     def update_trend_analysis(self, time_unit, category):
         """更新销售趋势分析"""
-        # 清除现有图表
-        self.trend_canvas.clear()
-        self.heatmap_canvas.clear()
-        
         try:
             # 绘制销售趋势图
             sales_data = self.analyzer.get_sales_by_time(time_unit, category)
             if sales_data is not None and len(sales_data) > 0:
-                # 直接使用Matplotlib API绘图
-                # 设置更现代的颜色和风格
-                self.trend_canvas.axes.plot(sales_data['时间'], sales_data['总价'], marker='o', linewidth=2.5,
-                                          color=COLOR_PRIMARY, markerfacecolor='white',
-                                          markeredgecolor=COLOR_PRIMARY, markersize=8)
-                
-                # 添加区域阴影
-                self.trend_canvas.axes.fill_between(sales_data['时间'], 0, sales_data['总价'], 
-                                                  alpha=0.1, color=COLOR_PRIMARY)
-                
-                # 设置标题和标签
-                self.trend_canvas.axes.set_title(f'按{time_unit}销售趋势', fontsize=14, fontweight='bold')
-                self.trend_canvas.axes.set_xlabel('时间', fontsize=12)
-                self.trend_canvas.axes.set_ylabel('销售额（元）', fontsize=12)
-                self.trend_canvas.axes.grid(True, linestyle='--', alpha=0.7, color='#ddd')
-                
-                # 美化背景
-                self.trend_canvas.axes.set_facecolor(COLOR_LIGHT_BG)
-                
-                # 美化坐标轴
-                self.trend_canvas.axes.spines['top'].set_visible(False)
-                self.trend_canvas.axes.spines['right'].set_visible(False)
-                self.trend_canvas.axes.spines['left'].set_color('#ddd')
-                self.trend_canvas.axes.spines['bottom'].set_color('#ddd')
-                
-                # 优化x轴标签显示
-                if len(sales_data) > 12:
-                    # 只显示部分标签
-                    step = max(1, len(sales_data) // 12)  # 最多显示12个标签
-                    labels = self.trend_canvas.axes.get_xticklabels()
-                    for i, label in enumerate(labels):
-                        if i % step != 0:
-                            label.set_visible(False)
-                
-                # 旋转标签使其不重叠
-                plt.setp(self.trend_canvas.axes.get_xticklabels(), rotation=45, ha='right')
-                
-                # 添加数值标签
-                for i, (x, y) in enumerate(zip(sales_data['时间'], sales_data['总价'])):
-                    if i % step == 0 or i == len(sales_data) - 1:  # 只对部分点添加标签
-                        self.trend_canvas.axes.annotate(f'{y:,.0f}', 
-                                                     xy=(x, y), 
-                                                     xytext=(0, 10),
-                                                     textcoords='offset points',
-                                                     ha='center',
-                                                     va='bottom',
-                                                     fontsize=9,
-                                                     color=COLOR_TEXT)
-                
-                self.trend_canvas.fig.tight_layout()
-                self.trend_canvas.draw()
+                self._draw_sales_trend(sales_data, time_unit)
+            else:
+                self._clear_trend_chart()
             
             # 绘制热图
             try:
-                # 完全重新创建图表对象，确保没有残留
-                self.heatmap_canvas.fig.clear()
-                self.heatmap_canvas.axes = self.heatmap_canvas.fig.add_subplot(111)
-                
-                if self.analyzer.df is not None:
-                    data = self.analyzer.df.copy()
+                pivot = None
+                cube = self.analyzer.sales_cube
+                if cube is not None:
+                    # 直接在预先汇总的结果上生成月份-类别交叉表
                     if category:
-                        data = data[data['商品类别'] == category]
-                        
-                    # 确保数据包含月份信息
-                    if '月' not in data.columns and '日期' in data.columns:
-                        data['月'] = data['日期'].dt.month
-                        
+                        cube = cube[cube.index.get_level_values('商品类别') == category]
+                    pivot = cube.groupby(level=['商品类别', '月'], observed=True).sum().unstack('月').fillna(0)
+                elif self.analyzer.df is not None:
                     # 创建月份-类别交叉表
-                    pivot = pd.pivot_table(
-                        data, 
-                        values='总价', 
-                        index='商品类别', 
-                        columns='月',
-                        aggfunc='sum'
-                    ).fillna(0)
+                    pivot = self.analyzer.get_category_month_sales(category)
                     
-                    if not pivot.empty:
-                        # 使用更好看的颜色映射
-                        cmap = plt.cm.get_cmap('viridis')
-                        im = self.heatmap_canvas.axes.imshow(pivot.values, cmap=cmap, aspect='auto')
-                        
-                        # 添加标题
-                        self.heatmap_canvas.axes.set_title('月份-商品类别销售热图', fontsize=14, fontweight='bold')
-                        
-                        # 设置坐标轴
-                        self.heatmap_canvas.axes.set_yticks(range(len(pivot.index)))
-                        self.heatmap_canvas.axes.set_yticklabels(pivot.index)
-                        self.heatmap_canvas.axes.set_xticks(range(len(pivot.columns)))
-                        self.heatmap_canvas.axes.set_xticklabels(pivot.columns)
-                        
-                        # 添加数值标签
-                        for i in range(len(pivot.index)):
-                            for j in range(len(pivot.columns)):
-                                value = pivot.values[i, j]
-                                text_color = 'white' if value > pivot.values.max() / 2 else 'black'
-                                self.heatmap_canvas.axes.text(j, i, f'{value:,.0f}', 
-                                                       ha='center', va='center', 
-                                                       color=text_color, fontsize=8)
-                        
-                        # 添加新的colorbar
-                        cbar = self.heatmap_canvas.fig.colorbar(im)
-                        cbar.set_label('销售额（元）', fontsize=12)
-                        
-                        self.heatmap_canvas.fig.tight_layout()
-                        self.heatmap_canvas.draw()
+                if pivot is not None and not pivot.empty:
+                    self._draw_sales_heatmap(pivot)
+                else:
+                    self._clear_heatmap_chart()
             except Exception as e:
                 print(f"热图生成错误: {str(e)}")
                 # 热图生成失败不影响整体功能
-                pass
+                self._clear_heatmap_chart()
                 
         except Exception as e:
+            self._clear_trend_chart()
             raise Exception(f"绘制销售趋势图出错: {str(e)}")
     
+    def _clear_trend_chart(self):
+        """清除销售趋势图，下次绘制时重新创建折线"""
+        self.trend_canvas.clear()
+        self._trend_line = None
+        self._trend_artists = []
+    
+    def _draw_sales_trend(self, sales_data, time_unit):
+        """
+        绘制销售趋势图
+        
+        折线和坐标轴样式只在首次绘制时创建，之后只更新折线数据，
+        阴影区域和数值标签随数据变化，每次移除后重新添加
+        """
+        axes = self.trend_canvas.axes
+        x = np.arange(len(sales_data))
+        y = sales_data['总价'].to_numpy(dtype=float)
+        
+        if self._trend_line is None:
+            # 设置更现代的颜色和风格
+            self._trend_line, = axes.plot(x, y, marker='o', linewidth=2.5,
+                                          color=COLOR_PRIMARY, markerfacecolor='white',
+                                          markeredgecolor=COLOR_PRIMARY, markersize=8)
+            self._trend_artists = []
+            
+            # 设置标签
+            axes.set_xlabel('时间', fontsize=12)
+            axes.set_ylabel('销售额（元）', fontsize=12)
+            axes.grid(True, linestyle='--', alpha=0.7, color='#ddd')
+            
+            # 美化背景
+            axes.set_facecolor(COLOR_LIGHT_BG)
+            
+            # 美化坐标轴
+            axes.spines['top'].set_visible(False)
+            axes.spines['right'].set_visible(False)
+            axes.spines['left'].set_color('#ddd')
+            axes.spines['bottom'].set_color('#ddd')
+        else:
+            self._trend_line.set_data(x, y)
+            
+        # 移除上一次的阴影区域和数值标签
+        for artist in self._trend_artists:
+            artist.remove()
+            
+        # 添加区域阴影
+        self._trend_artists = [axes.fill_between(x, 0, y, alpha=0.1, color=COLOR_PRIMARY)]
+        
+        # 设置标题
+        axes.set_title(f'按{time_unit}销售趋势', fontsize=14, fontweight='bold')
+        
+        # x轴按位置绘制，刻度显示时间文本
+        axes.set_xticks(x)
+        axes.set_xticklabels(sales_data['时间'])
+        
+        # 优化x轴标签显示
+        step = 1
+        if len(sales_data) > 12:
+            # 只显示部分标签
+            step = max(1, len(sales_data) // 12)  # 最多显示12个标签
+            labels = axes.get_xticklabels()
+            for i, label in enumerate(labels):
+                if i % step != 0:
+                    label.set_visible(False)
+        
+        # 旋转标签使其不重叠
+        plt.setp(axes.get_xticklabels(), rotation=45, ha='right')
+        
+        # 添加数值标签
+        for i, value in enumerate(y):
+            if i % step == 0 or i == len(y) - 1:  # 只对部分点添加标签
+                self._trend_artists.append(axes.annotate(f'{value:,.0f}', 
+                                                         xy=(i, value), 
+                                                         xytext=(0, 10),
+                                                         textcoords='offset points',
+                                                         ha='center',
+                                                         va='bottom',
+                                                         fontsize=9,
+                                                         color=COLOR_TEXT))
+        
+        # 按新数据重新计算坐标范围（阴影区域从0开始，范围需包含0）
+        axes.relim()
+        axes.update_datalim([(0, 0)])
+        axes.autoscale_view()
+        
+        self.trend_canvas.fig.tight_layout()
+        self.trend_canvas.draw_idle()
+    
+    def _clear_heatmap_chart(self):
+        """清除热图和颜色条，下次绘制时重新创建"""
+        self.heatmap_canvas.fig.clear()
+        self.heatmap_canvas.axes = self.heatmap_canvas.fig.add_subplot(111)
+        self._heatmap_image = None
+        self._heatmap_colorbar = None
+        self._heatmap_labels = []
+        self.heatmap_canvas.draw_idle()
+    
+    def _draw_sales_heatmap(self, pivot):
+        """
+        绘制月份-商品类别销售热图
+        
+        图像和颜色条只在首次绘制时创建，之后只替换图像数据并更新颜色范围
+        """
+        axes = self.heatmap_canvas.axes
+        values = pivot.to_numpy()
+        rows, columns = values.shape
+        
+        if self._heatmap_image is None:
+            # 使用更好看的颜色映射
+            cmap = plt.cm.get_cmap('viridis')
+            # 每个单元格直接映射为色块，不做抗锯齿重采样，单元格较多时也只需一次颜色查表
+            self._heatmap_image = axes.imshow(values, cmap=cmap, aspect='auto',
+                                              interpolation='nearest', resample=False)
+            self._heatmap_labels = []
+            
+            # 添加标题
+            axes.set_title('月份-商品类别销售热图', fontsize=14, fontweight='bold')
+            
+            # 添加颜色条
+            self._heatmap_colorbar = self.heatmap_canvas.fig.colorbar(self._heatmap_image)
+            self._heatmap_colorbar.set_label('销售额（元）', fontsize=12)
+        else:
+            # 类别数量可能变化，同时更新图像范围和颜色范围
+            self._heatmap_image.set_data(values)
+            self._heatmap_image.set_extent((-0.5, columns - 0.5, rows - 0.5, -0.5))
+            self._heatmap_image.autoscale()
+            self._heatmap_colorbar.update_normal(self._heatmap_image)
+            axes.set_xlim(-0.5, columns - 0.5)
+            axes.set_ylim(rows - 0.5, -0.5)
+        
+        # 设置坐标轴
+        axes.set_yticks(range(rows))
+        axes.set_yticklabels(pivot.index)
+        axes.set_xticks(range(columns))
+        axes.set_xticklabels(pivot.columns)
+        
+        # 移除上一次的数值标签
+        for label in self._heatmap_labels:
+            label.remove()
+        self._heatmap_labels = []
+        
+        # 添加数值标签，文字颜色的阈值只计算一次；单元格过多时标签无法辨认，不再添加
+        if values.size <= HEATMAP_LABEL_LIMIT:
+            text_colors = np.where(values > values.max() / 2, 'white', 'black')
+            for (i, j), value in np.ndenumerate(values):
+                self._heatmap_labels.append(axes.text(j, i, f'{value:,.0f}', 
+                                                      ha='center', va='center', 
+                                                      color=text_colors[i, j], fontsize=8))
+        
+        self.heatmap_canvas.fig.tight_layout()
+        self.heatmap_canvas.draw_idle()
+    
     def update_category_analysis(self, category):
         """更新商品类别分析"""
         # 清除现有图表
@@ -1974,13 +2390,8 @@ class EcommerceAnalysisApp(QMainWindow):
         try:
             # 直接在这里实现类别销售额对比图，而不是使用analyzer的方法
             if self.analyzer.df is not None:
-                data = self.analyzer.df.copy()
-                if category:
-                    data = data[data['商品类别'] == category]
-                
-                # 按商品类别分组计算销售额
-                category_sales = data.groupby('商品类别')['总价'].sum().reset_index()
-                category_sales = category_sales.sort_values('总价', ascending=False)
+                # 按商品类别分组计算销售额（由分析器缓存）
+                category_sales = self.analyzer.get_sales_totals('商品类别', category)
                 
                 if len(category_sales) > 0:
                     # 绘制横向条形图
@@ -2002,20 +2413,25 @@ class EcommerceAnalysisApp(QMainWindow):
                         self.category_canvas.axes.set_yticklabels(category_sales['商品类别'].iloc[:15])
                     
                     self.category_canvas.fig.tight_layout()
-                    self.category_canvas.draw()
+                    self.category_canvas.draw_idle()
             
             # 更新热销商品表格
             top_products = self.analyzer.get_top_products(n=10, measure='销售额', category=category)
             if top_products is not None and len(top_products) > 0:
-                self.top_products_table.setRowCount(len(top_products))
-                for i, (_, row) in enumerate(top_products.iterrows()):
-                    self.top_products_table.setItem(i, 0, QTableWidgetItem(row['商品名称']))
-                    self.top_products_table.setItem(i, 1, QTableWidgetItem(f"{row['销售额']:,.2f}"))
+                # 整列格式化后一次性交给模型
+                self.top_products_model.setDataFrame(pd.DataFrame({
+                    "商品名称": top_products['商品名称'].astype(str).to_numpy(),
+                    "销售额": format_amounts(top_products['销售额']),
+                }))
         except Exception as e:
             raise Exception(f"更新商品类别分析出错: {str(e)}")
     
     def update_region_analysis(self, region_level):
         """更新地区销售分析"""
+        # 地区图表与时间单位、商品类别无关，数据和地区级别未变时保留已绘制的图表
+        if self._view_is_current('region', region_level):
+            return
+            
         # 清除现有图表
         self.region_canvas.clear()
         
@@ -2029,9 +2445,8 @@ class EcommerceAnalysisApp(QMainWindow):
                 if region_level not in self.analyzer.df.columns:
                     raise ValueError(f"数据中缺少{region_level}列")
                 
-                # 按地区分组计算销售额
-                region_sales = self.analyzer.df.groupby(region_level)['总价'].sum().reset_index()
-                region_sales = region_sales.sort_values('总价', ascending=False)
+                # 按地区分组计算销售额（由分析器缓存）
+                region_sales = self.analyzer.get_sales_totals(region_level)
                 
                 if len(region_sales) > 0:
                     # 限制地区数量，只显示销售额前10名
@@ -2081,98 +2496,127 @@ class EcommerceAnalysisApp(QMainWindow):
                     
                     # 调整布局，确保所有元素可见
                     self.region_canvas.fig.tight_layout()
-                    self.region_canvas.draw()
+                    self.region_canvas.draw_idle()
+                    self._mark_view_current('region', region_level)
         except Exception as e:
             raise Exception(f"更新地区销售分析出错: {str(e)}")
     
+    def _start_analysis_job(self, name, compute, apply, on_error):
+        """
+        在线程池中计算分析结果，完成后在主线程调用apply更新界面
+        
+        计算使用提交时的数据；同一分析已有针对当前数据的任务在计算时不再重复提交，
+        结果返回前数据已更换时丢弃该结果
+        """
+        df = self.analyzer.df
+        if self._pending_analysis.get(name) is df:
+            return
+        self._pending_analysis[name] = df
+        worker = AnalysisWorker(compute, df)
+        worker.signals.result.connect(partial(self._finish_analysis_job, name, df, apply))
+        worker.signals.error.connect(partial(self._finish_analysis_job, name, df, on_error))
+        QThreadPool.globalInstance().start(worker)
+        
+    def _finish_analysis_job(self, name, df, callback, result):
+        """分析任务完成后的处理，只有结果对应当前数据时才更新界面"""
+        if self._pending_analysis.get(name) is df:
+            del self._pending_analysis[name]
+        if df is self.analyzer.df:
+            callback(result)
+    
     def update_customer_analysis(self):
-        """更新客户分析"""
-        try:
-            # 获取客户细分数据
-            customer_data, cluster_features = self.analyzer.get_customer_segments()
-            if customer_data is not None and cluster_features is not None:
-                # 计算每个客户群体的统计信息
-                segment_stats = customer_data.groupby('客户群体标签').agg({
-                    '顾客ID': 'count',
-                    '总消费额': 'mean'
-                }).reset_index()
-                
-                # 更新客户群体分析表格
-                self.customer_table.setRowCount(len(segment_stats))
-                for i, (_, row) in enumerate(segment_stats.iterrows()):
-                    self.customer_table.setItem(i, 0, QTableWidgetItem(row['客户群体标签']))
-                    self.customer_table.setItem(i, 1, QTableWidgetItem(str(row['顾客ID'])))
-                    self.customer_table.setItem(i, 2, QTableWidgetItem(f"{row['总消费额']:,.2f}"))
-        except Exception as e:
-            raise Exception(f"更新客户分析出错: {str(e)}")
+        """更新客户分析，聚类计算在线程池中执行"""
+        # 客户细分只取决于数据本身，数据未变时保留已有的结果
+        if self._view_is_current('customer'):
+            return
+        self._start_analysis_job(
+            'customer', self._compute_customer_stats, self._apply_customer_stats,
+            lambda error: QMessageBox.warning(self, "警告", f"更新客户分析时出错: {error}"))
+    
+    def _compute_customer_stats(self, df):
+        """计算各客户群体的统计信息并格式化为表格内容（在工作线程中执行）"""
+        # 获取客户细分数据
+        customer_data, cluster_features = self.analyzer.get_customer_segments(df=df)
+        if customer_data is None or cluster_features is None:
+            return None
+            
+        # 计算每个客户群体的统计信息
+        segment_stats = customer_data.groupby('客户群体标签').agg({
+            '顾客ID': 'count',
+            '总消费额': 'mean'
+        }).reset_index()
+        
+        return pd.DataFrame({
+            "客户群体": segment_stats['客户群体标签'].astype(str).to_numpy(),
+            "客户数量": segment_stats['顾客ID'].astype(str).to_numpy(),
+            "平均消费额": format_amounts(segment_stats['总消费额']),
+        })
+    
+    def _apply_customer_stats(self, customer_stats):
+        """更新客户群体分析表格"""
+        if customer_stats is None:
+            return
+        self.customer_model.setDataFrame(customer_stats)
+        self._mark_view_current('customer')
     
     def update_promotion_analysis(self):
-        """更新促销效果分析"""
+        """更新促销效果分析，购物节统计在线程池中执行"""
+        # 购物节图表只取决于数据本身，数据未变时保留已绘制的图表
+        if self._view_is_current('festival'):
+            return
+        # 错误不影响整体功能
+        self._start_analysis_job(
+            'festival', self._compute_festival_sales, self._draw_festival_sales,
+            lambda error: print(f"处理购物节数据时出错: {error}"))
+    
+    @staticmethod
+    def _compute_festival_sales(data):
+        """统计各购物节的订单数、销售额和平均折扣（在工作线程中执行）"""
+        # 检查数据中是否已有购物节列
+        if '购物节' not in data.columns:
+            # 创建购物节标记，作为单独的Series用于分组，不复制数据也不向数据中添加列
+            # 年、月、日优先由日期列计算，没有日期列时使用已有的列
+            if '日期' in data.columns:
+                years, months, days = split_date_parts(data['日期'].to_numpy())
+            else:
+                years, months, days = (np.asarray(data[col], dtype=float) for col in ('年', '月', '日'))
+            festivals = pd.Series(tag_festivals(years, months, days), index=data.index, name='购物节')
+        else:
+            festivals = '购物节'
+        
+        # 特殊购物节的销售统计
+        return data.groupby(festivals, observed=True).agg({
+            '订单ID': 'count',
+            '总价': 'sum',
+            '折扣率': 'mean'
+        }).reset_index()
+    
+    def _draw_festival_sales(self, festival_sales):
+        """绘制购物节销售额对比图"""
         # 清除现有图表
         self.festival_canvas.clear()
         
-        try:
-            # 直接在这里实现购物节影响分析图，而不是使用analyzer的方法
-            if self.analyzer.df is not None:
-                # 检查数据中是否已有购物节列
-                if '购物节' not in self.analyzer.df.columns:
-                    # 创建购物节标记
-                    data = self.analyzer.df.copy()
-                    data['购物节'] = '普通日期'
-                    
-                    # 添加年、月、日列（如果不存在）
-                    if '日期' in data.columns:
-                        data['年'] = data['日期'].dt.year
-                        data['月'] = data['日期'].dt.month
-                        data['日'] = data['日期'].dt.day
-                    
-                    # 春节 (假设2022年春节在2月1日，2023年春节在1月22日)
-                    spring_festival_2022 = (data['年'] == 2022) & (data['月'] == 2) & (data['日'] <= 7)
-                    spring_festival_2023 = (data['年'] == 2023) & (data['月'] == 1) & (data['日'] >= 20) & (data['日'] <= 27)
-                    
-                    # 618购物节
-                    festival_618 = (data['月'] == 6) & (data['日'] >= 10) & (data['日'] <= 20)
-                    
-                    # 双11购物节
-                    festival_1111 = (data['月'] == 11) & (data['日'] >= 9) & (data['日'] <= 12)
-                    
-                    # 创建标记特殊日期的列
-                    data.loc[spring_festival_2022 | spring_festival_2023, '购物节'] = '春节'
-                    data.loc[festival_618, '购物节'] = '618购物节'
-                    data.loc[festival_1111, '购物节'] = '双11购物节'
-                else:
-                    data = self.analyzer.df.copy()
-                
-                try:
-                    # 特殊购物节的销售统计
-                    festival_sales = data.groupby(['购物节']).agg({
-                        '订单ID': 'count',
-                        '总价': 'sum',
-                        '折扣率': 'mean'
-                    }).reset_index()
-                    
-                    if not festival_sales.empty:
-                        # 绘制条形图
-                        bars = self.festival_canvas.axes.bar(festival_sales['购物节'], festival_sales['总价'])
-                        self.festival_canvas.axes.set_title('各购物节销售额对比')
-                        self.festival_canvas.axes.set_xlabel('购物节')
-                        self.festival_canvas.axes.set_ylabel('销售额（元）')
-                        self.festival_canvas.axes.grid(True, linestyle='--', alpha=0.7, axis='y')
-                        
-                        # 添加折扣率标签
-                        if '折扣率' in festival_sales.columns:
-                            for i, (_, row) in enumerate(festival_sales.iterrows()):
-                                self.festival_canvas.axes.text(i, row['总价'] * 0.5, 
-                                            f'平均折扣: {row["折扣率"]:.2f}', 
-                                            ha='center', va='center', color='white', fontweight='bold')
-                        
-                        self.festival_canvas.fig.tight_layout()
-                        self.festival_canvas.draw()
-                except Exception as e:
-                    print(f"处理购物节数据时出错: {str(e)}")
-                    # 错误不影响整体功能
-        except Exception as e:
-            raise Exception(f"更新促销效果分析出错: {str(e)}")
+        if not festival_sales.empty:
+            # 绘制条形图
+            bars = self.festival_canvas.axes.bar(festival_sales['购物节'], festival_sales['总价'])
+            self.festival_canvas.axes.set_title('各购物节销售额对比')
+            self.festival_canvas.axes.set_xlabel('购物节')
+            self.festival_canvas.axes.set_ylabel('销售额（元）')
+            self.festival_canvas.axes.grid(True, linestyle='--', alpha=0.7, axis='y')
+            
+            # 添加折扣率标签
+            if '折扣率' in festival_sales.columns:
+                # 整列取出后按位置遍历，避免iterrows逐行构造Series
+                totals = festival_sales['总价'].to_numpy(dtype=float).tolist()
+                discounts = festival_sales['折扣率'].to_numpy(dtype=float).tolist()
+                for i, (total, discount) in enumerate(zip(totals, discounts)):
+                    self.festival_canvas.axes.text(i, total * 0.5, 
+                                f'平均折扣: {discount:.2f}', 
+                                ha='center', va='center', color='white', fontweight='bold')
+            
+            self.festival_canvas.fig.tight_layout()
+            self.festival_canvas.draw_idle()
+            self._mark_view_current('festival')
     
     def update_sales_forecast(self):
         """更新销售预测结果"""
@@ -2180,6 +2624,7 @@ class EcommerceAnalysisApp(QMainWindow):
             # 清除现有图表和表格
             self.forecast_canvas.clear()
             self.forecast_table.setRowCount(0)
+            self._forecast_rows = None
             
             if self.analyzer.df is None:
                 raise ValueError("请先加载数据")
@@ -2316,7 +2761,12 @@ class EcommerceAnalysisApp(QMainWindow):
         if not history_data.empty and not forecast.empty:
             # 找到历史和预测的分界点
             last_history_date = history_data['日期'].iloc[-1]
-            self.forecast_canvas.axes.axvline(
+            
+            # 数据已绘制完毕，固定坐标范围，分隔线和文字不再触发自动缩放
+            ax = self.forecast_canvas.axes
+            y_max = ax.get_ylim()[1]
+            ax.autoscale(enable=False)
+            ax.axvline(
                 x=last_history_date, 
                 color='#777',
                 linestyle='--',
@@ -2324,8 +2774,7 @@ class EcommerceAnalysisApp(QMainWindow):
             )
             
             # 在分隔线上方添加"预测开始"文字
-            y_max = self.forecast_canvas.axes.get_ylim()[1]
-            self.forecast_canvas.axes.text(
+            ax.text(
                 last_history_date, 
                 y_max * 0.95, 
                 '预测开始',
@@ -2337,39 +2786,45 @@ class EcommerceAnalysisApp(QMainWindow):
             )
         
         self.forecast_canvas.fig.tight_layout()
-        self.forecast_canvas.draw()
-        
-    def update_forecast_table(self, forecast_data):
-        self.forecast_canvas.fig.tight_layout()
-        self.forecast_canvas.draw()
+        self.forecast_canvas.draw_idle()
         
     def update_forecast_table(self, forecast_data):
         """更新预测数据表格"""
-        # 清空表格
-        self.forecast_table.setRowCount(0)
-        
-        # 设置行数
-        self.forecast_table.setRowCount(len(forecast_data))
-        
-        # 添加数据到表格
-        for i, (_, row) in enumerate(forecast_data.iterrows()):
-            # 日期
-            self.forecast_table.setItem(i, 0, QTableWidgetItem(str(row['日期'])))
-            
-            # 实际销售额
-            if '实际销售额' in row and not pd.isna(row['实际销售额']):
-                self.forecast_table.setItem(i, 1, QTableWidgetItem(f"{row['实际销售额']:,.2f}"))
-            else:
-                self.forecast_table.setItem(i, 1, QTableWidgetItem(""))
-                
-            # 预测销售额
-            self.forecast_table.setItem(i, 2, QTableWidgetItem(f"{row['预测销售额']:,.2f}"))
-            
-            # 数据类型
-            item = QTableWidgetItem(row['数据类型'])
-            if row['数据类型'] == '预测':
-                item.setBackground(QColor(255, 240, 240))  # 淡红色背景
-            self.forecast_table.setItem(i, 3, item)
+        # 先整列取出并格式化，避免iterrows逐行构造Series
+        dates = [str(value) for value in forecast_data['日期'].astype(object)]
+        if '实际销售额' in forecast_data.columns:
+            # 预测期没有实际销售额，保持空白
+            actual = format_amounts(forecast_data['实际销售额'], missing="")
+        else:
+            actual = [""] * len(forecast_data)
+        predicted = format_amounts(forecast_data['预测销售额'])
+        data_types = forecast_data['数据类型'].astype(str).to_numpy()
+        is_forecast = (data_types == '预测').tolist()
+        self._forecast_rows = pd.DataFrame({
+            "日期": dates,
+            "实际销售额": actual,
+            "预测销售额": predicted,
+            "数据类型": data_types,
+            "是否预测": is_forecast,
+        })
+        
+        # 添加数据到表格；背景色在循环外创建一次，按列逐列填充
+        table = self.forecast_table
+        forecast_background = QColor(255, 240, 240)  # 淡红色背景
+        default_background = QBrush()
+        with bulk_table_update(table):
+            # 设置行数，保留的行复用已有的单元格项
+            table.setRowCount(len(forecast_data))
+            
+            # 日期、实际销售额、预测销售额
+            for column, texts in enumerate((dates, actual, predicted)):
+                for i, text in enumerate(texts):
+                    set_table_text(table, i, column, text)
+            
+            # 数据类型（复用的项可能带有之前的背景色，非预测行需要清除）
+            for i, (text, forecast_row) in enumerate(zip(data_types, is_forecast)):
+                item = set_table_text(table, i, 3, text)
+                item.setBackground(forecast_background if forecast_row else default_background)
             
     def update_decision_suggestions(self):
         """更新决策建议"""
@@ -2389,20 +2844,21 @@ class EcommerceAnalysisApp(QMainWindow):
             suggestions = self.analyzer.generate_decision_suggestions(category)
             
             if suggestions:
-                # 构建HTML格式的建议文本
-                html = '<html><body style="font-family: Arial, sans-serif;">'
-                html += f'<h2 style="color: #333;">电商平台决策建议{" - " + category if category else ""}</h2>'
-                
-                for suggestion in suggestions:
-                    html += f'<div style="margin-bottom: 20px;">'
-                    html += f'<h3 style="color: #0066cc;">{suggestion["类型"]}</h3>'
-                    html += f'<p style="line-height: 1.5; color: #444;">{suggestion["建议"].replace("；", "<br>")}</p>'
-                    html += '</div>'
-                
-                html += '</body></html>'
+                # 构建HTML格式的建议文本，各部分放入列表后一次拼接
+                parts = [
+                    '<html><body style="font-family: Arial, sans-serif;">',
+                    f'<h2 style="color: #333;">电商平台决策建议{" - " + category if category else ""}</h2>',
+                ]
+                parts.extend(
+                    f'<div style="margin-bottom: 20px;">'
+                    f'<h3 style="color: #0066cc;">{suggestion["类型"]}</h3>'
+                    f'<p style="line-height: 1.5; color: #444;">{suggestion["建议"].replace("；", "<br>")}</p>'
+                    '</div>'
+                    for suggestion in suggestions)
+                parts.append('</body></html>')
                 
                 # 设置文本
-                self.suggestions_text.setHtml(html)
+                self.suggestions_text.setHtml(''.join(parts))
                 
                 self.statusBar().showMessage('决策建议已生成')
                 
@@ -2410,7 +2866,9 @@ class EcommerceAnalysisApp(QMainWindow):
             QMessageBox.warning(self, "警告", f"生成决策建议时出错: {str(e)}")
             self.suggestions_text.setPlainText(f"生成决策建议时出错: {str(e)}")
     
-    def _path_to_url(self, path):
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _path_to_url(path):
         """将本地文件路径转换为URL格式，确保在所有平台上正确显示"""
         # 确保路径是绝对路径
         abs_path = os.path.abspath(path)
@@ -2424,6 +2882,14 @@ class EcommerceAnalysisApp(QMainWindow):
         
         return f'file://{url_path}'
     
+    @staticmethod
+    def _replace_image_sources(html, mapping):
+        """按映射一次性替换HTML中所有图片的src路径"""
+        if not mapping:
+            return html
+        pattern = re.compile('|'.join(re.escape(f'src="{old}"') for old in mapping))
+        return pattern.sub(lambda m: f'src="{mapping[m.group(0)[5:-1]]}"', html)
+    
     def generate_report(self):
         """生成分析报告"""
         try:
@@ -2445,22 +2911,14 @@ class EcommerceAnalysisApp(QMainWindow):
                 end_date=end_date
             )
             
-            # 修改图片路径为file://格式
-            for key, path in self.report_image_paths.items():
-                # 使用辅助函数转换路径
-                path_pattern = f'src="{path}"'
-                file_url = f'src="{self._path_to_url(path)}"'
-                html = html.replace(path_pattern, file_url)
+            # 修改图片路径为file://格式，转换结果保存下来供保存报告时使用
+            self._report_image_urls = {path: self._path_to_url(path) for path in self.report_image_paths.values()}
+            html = self._replace_image_sources(html, self._report_image_urls)
             
-            # 显示报告预览
-            self.report_preview.setHtml(html)
+            self._last_report_html = html
             
-            # 调试输出
-            print("报告图片路径检查:")
-            for key, path in self.report_image_paths.items():
-                print(f"{key}原始路径: {path}")
-                print(f"{key}URL路径: {self._path_to_url(path)}")
-                print(f"文件是否存在: {os.path.exists(path)}")
+            # 显示报告预览，以图表目录为基准URL，允许页面加载本地图片
+            self._ensure_report_preview().setHtml(html, QUrl.fromLocalFile(self._report_image_dir + os.sep))
             
             # 恢复正常光标
             QApplication.restoreOverrideCursor()
@@ -2477,267 +2935,169 @@ class EcommerceAnalysisApp(QMainWindow):
     
     def create_report_html(self, title, start_date, end_date):
         """创建HTML格式的报告"""
-        # 确保所有临时图片文件都保存在同一目录中
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        image_dir = current_dir
-        os.makedirs(image_dir, exist_ok=True)
+        # 所有图表文件保存在同一个临时目录中，删除上一次报告留下的目录
+        if self._report_image_dir:
+            shutil.rmtree(self._report_image_dir, ignore_errors=True)
+        image_dir = tempfile.mkdtemp(prefix='report_images_')
+        self._report_image_dir = image_dir
         
         # 预先创建图表文件列表，用于跟踪生成的所有图表
         image_paths = {}
         
-        # 导入base64用于图片编码
-        import base64
-        import io
-        
-        # 定义函数将图表直接转换为base64编码的图片数据
-        def fig_to_base64(canvas):
+        # 定义函数检查图表是否有内容
+        def has_chart_content(canvas):
             if not hasattr(canvas, 'fig') or not hasattr(canvas, 'axes'):
                 return None
             
-            # 检查图表是否有内容
-            has_content = False
-            if hasattr(canvas.axes, 'get_lines') and canvas.axes.get_lines():
-                has_content = True
-            elif hasattr(canvas.axes, 'get_images') and canvas.axes.get_images():
-                has_content = True
-            elif hasattr(canvas.axes, 'patches') and canvas.axes.patches:
-                has_content = True
-            
-            if not has_content:
+            # 检查图表是否有内容（折线、图像、柱形或散点等集合）
+            ax = canvas.axes
+            if not (ax.lines or ax.images or ax.patches or ax.collections):
                 print("图表内容为空，跳过")
-                return None
-            
-            try:
-                # 将图表保存到内存buffer
-                buf = io.BytesIO()
-                canvas.fig.savefig(buf, format='png', dpi=150, bbox_inches='tight')
-                buf.seek(0)
-                
-                # 转换为base64编码
-                img_data = base64.b64encode(buf.getvalue()).decode('utf-8')
-                return img_data
-            except Exception as e:
-                print(f"图表转换为base64出错: {str(e)}")
-                return None
+                return False
+            return True
+        
+        # 定义函数将图表保存为图片文件，报告中按路径引用，不再内嵌base64数据
+        def save_chart_image(key, canvas, dpi):
+            for image_format in REPORT_IMAGE_FORMATS:
+                path = os.path.join(image_dir, f'{key}.{image_format}')
+                try:
+                    canvas.fig.savefig(path, format=image_format, dpi=dpi)
+                    return path
+                except Exception as e:
+                    print(f"图表保存为{image_format}出错: {str(e)}")
+            return None
+        
+        # 导出报告中需要的图表：图表属于界面上的画布，matplotlib的Figure不是线程安全的，
+        # 画布随时可能在主线程中重绘，因此在主线程中逐个导出
+        chart_sections = {}
+        chart_images = {}
+        for key, canvas_name, check_name, chart_title, error_text in REPORT_CHART_SECTIONS:
+            canvas = getattr(self, canvas_name, None)
+            if canvas is None or not getattr(self, check_name).isChecked():
+                continue
+            chart_sections[key] = (chart_title, error_text)
+            if has_chart_content(canvas):
+                # 导出前调整一次布局，代替savefig的bbox_inches='tight'额外测量所有元素
+                canvas.fig.tight_layout()
+                chart_images[key] = save_chart_image(key, canvas, self._report_dpi)
+        
+        # 定义函数将已导出的图表加入报告
+        def append_chart(key):
+            if key not in chart_sections:
+                return
+            chart_title, error_text = chart_sections[key]
+            image = chart_images.get(key)
+            if image:
+                image_paths[key] = image
+                parts.append(f'''
+                    <div class="chart-container">
+                        <h3>{chart_title}</h3>
+                        <img src="{image}" class="chart" alt="{chart_title}">
+                    </div>
+                    ''')
+            else:
+                parts.append(f'<p>{error_text}</p>')
         
         # 报告头部和样式
-        html = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{title}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; color: #333; }}
-                h1 {{ color: #0066cc; text-align: center; margin-bottom: 20px; font-size: 24px; }}
-                h2 {{ color: #0066cc; margin-top: 30px; border-bottom: 1px solid #ddd; padding-bottom: 5px; font-size: 20px; }}
-                h3 {{ color: #333; margin-top: 20px; font-size: 16px; }}
-                .report-header {{ text-align: center; margin-bottom: 30px; }}
-                .report-date {{ font-style: italic; color: #666; margin-bottom: 20px; text-align: center; }}
-                .chart-container {{ text-align: center; margin: 20px 0; }}
-                .chart {{ max-width: 100%; height: auto; border: 1px solid #ddd; }}
-                table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-                th, td {{ text-align: left; padding: 8px; border: 1px solid #ddd; }}
-                th {{ background-color: #f2f2f2; }}
-                tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                .suggestion {{ margin: 10px 0; padding: 10px; background-color: #f2f9ff; border-left: 3px solid #0066cc; }}
-                
-                /* 响应式设计，确保在小屏幕上也能良好显示 */
-                @media screen and (max-width: 800px) {{
-                    .chart {{ width: 100%; }}
-                    table {{ font-size: 12px; }}
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="report-header">
-                <h1>{title}</h1>
-                <div class="report-date">报告时间范围: {start_date} 至 {end_date}</div>
-                <div>生成时间: {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</div>
-            </div>
-        '''
+        parts = [REPORT_HEADER_TEMPLATE.format(
+            title=title, start_date=start_date, end_date=end_date,
+            now=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))]
         
         # 数据概览部分
         summary = self.analyzer.get_data_summary()
         if summary and self.include_trend_check.isChecked():
-            html += '''
+            # 先统一转换各项的值（列表拼接为字符串），再一次性生成表格
+            rows = {key: ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+                    for key, value in summary.items()}
+            parts.append('''
             <h2>1. 数据概览</h2>
             <table>
                 <tr><th>属性</th><th>值</th></tr>
-            '''
-            
-            for key, value in summary.items():
-                # 如果值是列表，将其转换为字符串
-                if isinstance(value, list):
-                    value_str = ", ".join(map(str, value))
-                else:
-                    value_str = str(value)
-                
-                html += f'<tr><td>{key}</td><td>{value_str}</td></tr>'
-            
-            html += '</table>'
+            ''')
+            parts.append(''.join(f'<tr><td>{key}</td><td>{value}</td></tr>' for key, value in rows.items()))
+            parts.append('</table>')
         
         # 销售趋势分析部分
         if self.include_trend_check.isChecked():
-            html += '<h2>2. 销售趋势分析</h2>'
-            
-            # 直接将趋势图转换为base64并嵌入
-            if hasattr(self, 'trend_canvas'):
-                trend_base64 = fig_to_base64(self.trend_canvas)
-                if trend_base64:
-                    image_paths['trend'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>销售趋势图</h3>
-                        <img src="data:image/png;base64,{trend_base64}" class="chart" alt="销售趋势图">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成销售趋势图</p>'
-            
-            # 直接将热图转换为base64并嵌入
-            if hasattr(self, 'heatmap_canvas'):
-                heatmap_base64 = fig_to_base64(self.heatmap_canvas)
-                if heatmap_base64:
-                    image_paths['heatmap'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>销售热图</h3>
-                        <img src="data:image/png;base64,{heatmap_base64}" class="chart" alt="销售热图">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成销售热图</p>'
+            parts.append('<h2>2. 销售趋势分析</h2>')
+            
+            # 嵌入趋势图
+            append_chart('trend')
+            
+            # 嵌入热图
+            append_chart('heatmap')
         
         # 商品类别分析部分
         if self.include_category_check.isChecked():
-            html += '<h2>3. 商品类别分析</h2>'
-            
-            # 直接将类别销售图转换为base64并嵌入
-            if hasattr(self, 'category_canvas'):
-                category_base64 = fig_to_base64(self.category_canvas)
-                if category_base64:
-                    image_paths['category'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>商品类别销售额对比</h3>
-                        <img src="data:image/png;base64,{category_base64}" class="chart" alt="商品类别销售额对比">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成商品类别销售图</p>'
+            parts.append('<h2>3. 商品类别分析</h2>')
+            
+            # 嵌入类别销售图
+            append_chart('category')
             
             # 添加热销商品表格
-            if hasattr(self, 'top_products_table') and self.top_products_table.rowCount() > 0:
-                html += '''
+            if hasattr(self, 'top_products_model') and self.top_products_model.rowCount() > 0:
+                parts.append('''
                 <h3>热销商品TOP10</h3>
                 <table>
                     <tr><th>商品名称</th><th>销售额</th></tr>
-                '''
+                ''')
                 
-                for row in range(self.top_products_table.rowCount()):
-                    product_name = self.top_products_table.item(row, 0).text()
-                    product_sales = self.top_products_table.item(row, 1).text()
-                    html += f'<tr><td>{product_name}</td><td>{product_sales}</td></tr>'
+                # 直接遍历模型中的DataFrame，不再逐个单元格经过Qt模型索引
+                parts.extend(f'<tr><td>{name}</td><td>{sales}</td></tr>'
+                             for name, sales in self.top_products_model.dataFrame().itertuples(index=False))
                 
-                html += '</table>'
+                parts.append('</table>')
         
         # 地区销售分析部分
         if self.include_region_check.isChecked():
-            html += '<h2>4. 地区销售分析</h2>'
-            
-            # 直接将地区销售图转换为base64并嵌入
-            if hasattr(self, 'region_canvas'):
-                region_base64 = fig_to_base64(self.region_canvas)
-                if region_base64:
-                    image_paths['region'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>地区销售额对比</h3>
-                        <img src="data:image/png;base64,{region_base64}" class="chart" alt="地区销售额对比">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成地区销售图</p>'
+            parts.append('<h2>4. 地区销售分析</h2>')
+            
+            # 嵌入地区销售图
+            append_chart('region')
         
         # 客户分析部分
         if self.include_customer_check.isChecked():
-            html += '<h2>5. 客户分析</h2>'
+            parts.append('<h2>5. 客户分析</h2>')
             
             # 添加客户群体分析表格
-            if hasattr(self, 'customer_table') and self.customer_table.rowCount() > 0:
-                html += '''
+            if hasattr(self, 'customer_model') and self.customer_model.rowCount() > 0:
+                parts.append('''
                 <h3>客户群体分析</h3>
                 <table>
                     <tr><th>客户群体</th><th>客户数量</th><th>平均消费额</th></tr>
-                '''
+                ''')
                 
-                for row in range(self.customer_table.rowCount()):
-                    segment = self.customer_table.item(row, 0).text()
-                    count = self.customer_table.item(row, 1).text()
-                    avg_amount = self.customer_table.item(row, 2).text()
-                    html += f'<tr><td>{segment}</td><td>{count}</td><td>{avg_amount}</td></tr>'
+                parts.extend(f'<tr><td>{segment}</td><td>{count}</td><td>{avg_amount}</td></tr>'
+                             for segment, count, avg_amount in self.customer_model.dataFrame().itertuples(index=False))
                 
-                html += '</table>'
+                parts.append('</table>')
         
         # 促销效果分析部分
         if self.include_promotion_check.isChecked():
-            html += '<h2>6. 促销效果分析</h2>'
-            
-            # 直接将促销效果图转换为base64并嵌入
-            if hasattr(self, 'festival_canvas'):
-                festival_base64 = fig_to_base64(self.festival_canvas)
-                if festival_base64:
-                    image_paths['festival'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>购物节销售额对比</h3>
-                        <img src="data:image/png;base64,{festival_base64}" class="chart" alt="购物节销售额对比">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成购物节销售图</p>'
+            parts.append('<h2>6. 促销效果分析</h2>')
+            
+            # 嵌入促销效果图
+            append_chart('festival')
         
         # 销售预测部分
         if self.include_forecast_check.isChecked():
-            html += '<h2>7. 销售预测</h2>'
-            
-            # 直接将销售预测图转换为base64并嵌入
-            if hasattr(self, 'forecast_canvas'):
-                forecast_base64 = fig_to_base64(self.forecast_canvas)
-                if forecast_base64:
-                    image_paths['forecast'] = 'base64_embedded'
-                    html += f'''
-                    <div class="chart-container">
-                        <h3>销售预测图</h3>
-                        <img src="data:image/png;base64,{forecast_base64}" class="chart" alt="销售预测图">
-                    </div>
-                    '''
-                else:
-                    html += '<p>无法生成销售预测图</p>'
+            parts.append('<h2>7. 销售预测</h2>')
+            
+            # 嵌入销售预测图
+            append_chart('forecast')
             
             # 添加预测数据表格
-            if hasattr(self, 'forecast_table') and self.forecast_table.rowCount() > 0:
-                html += '''
-                <h3>销售预测数据</h3>
-                <table>
-                    <tr><th>日期</th><th>实际销售额</th><th>预测销售额</th><th>数据类型</th></tr>
-                '''
+            if self._forecast_rows is not None and len(self._forecast_rows) > 0:
+                parts.append('<h3>销售预测数据</h3>')
                 
-                for row in range(self.forecast_table.rowCount()):
-                    if self.forecast_table.item(row, 0) and self.forecast_table.item(row, 3):
-                        if self.forecast_table.item(row, 3).text() == "预测":  # 只显示预测部分
-                            date = self.forecast_table.item(row, 0).text()
-                            actual = self.forecast_table.item(row, 1).text() if self.forecast_table.item(row, 1) else "-"
-                            forecast = self.forecast_table.item(row, 2).text() if self.forecast_table.item(row, 2) else "-"
-                            data_type = self.forecast_table.item(row, 3).text()
-                            html += f'<tr><td>{date}</td><td>{actual}</td><td>{forecast}</td><td>{data_type}</td></tr>'
-                
-                html += '</table>'
+                # 读取填充表格时保存的行数据，按是否预测的标记一次筛选出预测部分，整表生成HTML
+                forecast_rows = self._forecast_rows[self._forecast_rows['是否预测']]
+                forecast_rows = forecast_rows[["日期", "实际销售额", "预测销售额", "数据类型"]].replace('', '-')
+                parts.append(forecast_rows.to_html(index=False, border=0))
         
         # 决策建议部分
         if self.include_decision_check.isChecked():
-            html += '<h2>8. 决策建议</h2>'
+            parts.append('<h2>8. 决策建议</h2>')
             
             # 获取决策建议
             try:
@@ -2746,34 +3106,34 @@ class EcommerceAnalysisApp(QMainWindow):
                 
                 if suggestions:
                     for suggestion in suggestions:
-                        html += f'''
+                        parts.append(f'''
                         <div class="suggestion">
                             <h3>{suggestion["类型"]}</h3>
                             <p>{suggestion["建议"].replace("；", "<br>")}</p>
                         </div>
-                        '''
+                        ''')
             except Exception as e:
-                html += f'<p>无法生成决策建议: {str(e)}</p>'
+                parts.append(f'<p>无法生成决策建议: {str(e)}</p>')
         
         # 报告结尾
-        html += '''
+        parts.append('''
             <div style="margin-top: 50px; text-align: center; color: #666; font-size: 12px;">
                 <p>由基于大数据的电商平台商品销售趋势分析与决策软件自动生成</p>
             </div>
         </body>
         </html>
-        '''
+        ''')
         
         # 保存图像路径以供后续使用
         self.report_image_paths = image_paths
         
-        return html
+        return ''.join(parts)
     
     def save_report(self):
         """保存报告到HTML文件"""
         try:
             # 检查是否已生成报告
-            if not hasattr(self, 'report_image_paths'):
+            if self._last_report_html is None:
                 QMessageBox.warning(self, "警告", "请先生成报告再保存")
                 return
                 
@@ -2810,8 +3170,8 @@ class EcommerceAnalysisApp(QMainWindow):
                 progress.setValue(50)
                 progress.setLabelText("正在处理HTML内容...")
                 
-                # 获取当前预览中的HTML内容
-                self.report_preview.page().toHtml(lambda content: self._process_and_save_html(file_path, content, None, progress))
+                # 直接使用生成报告时得到的HTML内容，无需从预览页面取回
+                self._process_and_save_html(file_path, self._last_report_html, progress)
                 
         except Exception as e:
             import traceback
@@ -2819,7 +3179,7 @@ class EcommerceAnalysisApp(QMainWindow):
             print(f"保存报告出错: {error_details}")
             QMessageBox.warning(self, "警告", f"保存报告时出错: {str(e)}")
         
-    def _process_and_save_html(self, file_path, content, image_map, progress):
+    def _process_and_save_html(self, file_path, content, progress):
         """处理HTML内容并保存到文件"""
         try:
             progress.setValue(70)
@@ -2833,35 +3193,34 @@ class EcommerceAnalysisApp(QMainWindow):
             if not os.path.exists(report_folder):
                 os.makedirs(report_folder)
             
-            # 替换HTML中的图片路径
-            for key, path in self.report_image_paths.items():
-                # 查找图片标签
-                url_path = self._path_to_url(path)  # 原始的file://路径
-                
-                # 计算相对路径
-                rel_path = os.path.join(report_name + "_files", os.path.basename(path))
-                
-                # 替换路径
-                content = content.replace(f'src="{url_path}"', f'src="{rel_path}"')
-                
-                # 复制图片文件到报告文件夹
+            # 替换HTML中的图片路径：原始的file://路径改为报告文件夹中的相对路径
+            content = self._replace_image_sources(
+                content,
+                {url: os.path.join(report_name + "_files", os.path.basename(path))
+                 for path, url in self._report_image_urls.items()})
+            
+            # 复制图片文件到报告文件夹，各文件的复制相互独立，并行进行以重叠磁盘/网络I/O等待
+            def copy_image(path):
                 target_path = os.path.join(report_folder, os.path.basename(path))
-                import shutil
-                if os.path.exists(path):
-                    try:
-                        shutil.copy2(path, target_path)
-                        print(f"已复制图片: {path} -> {target_path}")
-                    except Exception as e:
-                        print(f"复制图片出错: {path} -> {target_path}: {str(e)}")
-                else:
+                if not os.path.exists(path):
                     print(f"警告: 源图片不存在: {path}")
+                    return
+                try:
+                    shutil.copy2(path, target_path)
+                except Exception as e:
+                    print(f"复制图片出错: {path} -> {target_path}: {str(e)}")
+            
+            image_files = list(self.report_image_paths.values())
+            if image_files:
+                with ThreadPoolExecutor(max_workers=min(len(image_files), REPORT_COPY_WORKERS)) as executor:
+                    list(executor.map(copy_image, image_files))
             
             progress.setValue(90)
             progress.setLabelText("正在写入文件...")
             
-            # 保存处理后的HTML内容
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 保存处理后的HTML内容，以二进制方式写入，跳过文本模式的换行转换
+            with open(file_path, 'wb') as f:
+                f.write(content.encode('utf-8'))
                 
             progress.setValue(100)
             QMessageBox.information(self, "成功", f"报告已成功保存至:\n{file_path}")
@@ -1,22 +1,62 @@
+import argparse
+import hashlib
+import sys
 import pandas as pd
 import numpy as np
 import datetime
-import random
 from faker import Faker
 from pathlib import Path
 
-# 设置随机种子以确保可重复性
-np.random.seed(42)
-random.seed(42)
-fake = Faker(['zh_CN'])
-Faker.seed(42)
+# 尝试导入pyarrow，可用时用C实现写出CSV
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 尝试导入xlsxwriter，可用时逐行流式写出Excel，不在内存中保留整个工作簿
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+
+# 命令行参数：Excel文件写出较慢，默认只生成CSV，需要时用--xlsx额外生成
+parser = argparse.ArgumentParser(description='生成电商销售模拟数据')
+parser.add_argument('--xlsx', action='store_true', help='同时生成Excel文件')
+parser.add_argument('--force', action='store_true', help='忽略已生成的数据，强制重新生成')
+args = parser.parse_args()
 
 # 设置参数
+random_seed = 42  # 随机种子
 num_records = 16985  # 总记录数
 start_date = datetime.datetime(2022, 1, 1)
 end_date = datetime.datetime(2023, 12, 31)
 date_range = (end_date - start_date).days
 
+# 输出文件
+output_dir = Path('data')
+csv_path = output_dir / 'ecommerce_sales_data.csv'
+xlsx_path = output_dir / 'ecommerce_sales_data.xlsx'
+parquet_path = output_dir / 'ecommerce_sales_data.parquet'
+key_path = output_dir / '.gen_key'
+
+# 相同的参数和脚本内容总是生成相同的数据：记录生成键，输出文件都已存在且键一致时跳过生成
+generation_key = hashlib.sha1(
+    f"{num_records}:{random_seed}:".encode() + Path(__file__).read_bytes()).hexdigest()[:8]
+expected_outputs = [csv_path] + ([xlsx_path] if args.xlsx else []) + ([parquet_path] if PYARROW_AVAILABLE else [])
+if (not args.force and key_path.exists() and key_path.read_text().strip() == generation_key
+        and all(path.exists() for path in expected_outputs)):
+    print("data目录下的数据已是最新，跳过生成（使用--force强制重新生成）")
+    sys.exit(0)
+
+# 设置随机种子以确保可重复性
+rng = np.random.default_rng(random_seed)
+fake = Faker(['zh_CN'])
+Faker.seed(random_seed)
+
 # 商品类别
 categories = ['电子产品', '服装', '家居', '食品', '美妆', '图书', '运动', '母婴', '玩具', '珠宝']
 
@@ -73,143 +113,212 @@ cities = {
 # 生成支付方式
 payment_methods = ['支付宝', '微信支付', '银联', '信用卡', '货到付款']
 
-# 准备数据列表
-data = []
+# 预先生成的顾客姓名和地址数量，生成记录时从中抽样，不再逐条调用Faker
+fake_pool_size = 2000
+name_pool = [fake.name() for _ in range(fake_pool_size)]
+address_pool = [fake.address() for _ in range(fake_pool_size)]
 
-for i in range(num_records):
-    # 生成日期，确保日期分布不均匀，模拟季节性和节假日效应
-    random_day = random.randint(0, date_range)
-    date = start_date + datetime.timedelta(days=random_day)
-    
-    # 在重要购物节添加更多订单
-    is_special_day = False
-    # 春节 (假设2022年春节在2月1日，2023年春节在1月22日)
-    if (date.month == 2 and date.day <= 7 and date.year == 2022) or \
-       (date.month == 1 and date.day >= 20 and date.day <= 27 and date.year == 2023):
-        if random.random() < 0.8:  # 80%的概率在春节期间
-            is_special_day = True
-    # 618购物节
-    elif (date.month == 6 and date.day >= 10 and date.day <= 20):
-        if random.random() < 0.7:  # 70%的概率在618期间
-            is_special_day = True
-    # 双11购物节
-    elif (date.month == 11 and date.day >= 9 and date.day <= 12):
-        if random.random() < 0.9:  # 90%的概率在双11期间
-            is_special_day = True
-    
-    # 如果是特殊日期但未被选中，则随机选择其他日期
-    if not is_special_day and random_day % 20 == 0:  # 每20天的样本重新选日期
-        random_day = random.randint(0, date_range)
-        date = start_date + datetime.timedelta(days=random_day)
-    
-    # 生成订单信息
-    order_id = f"ORD-{date.year}{date.month:02d}{date.day:02d}-{i:05d}"
-    
-    # 选择类别
-    category = random.choice(categories)
-    
-    # 根据类别选择子类别和产品
-    if category == '电子产品':
-        subcategory = random.choice(electronics_subcategories)
-        product_name = random.choice(electronics_products[subcategory])
-        # 电子产品价格范围较大
-        price = round(random.uniform(500, 10000), 2)
-    elif category == '服装':
-        subcategory = random.choice(clothing_subcategories)
-        product_name = random.choice(clothing_products[subcategory])
-        # 服装价格中等
-        price = round(random.uniform(50, 2000), 2)
-    elif category == '家居':
-        subcategory = random.choice(home_subcategories)
-        product_name = random.choice(home_products[subcategory])
-        # 家居产品价格区间广
-        price = round(random.uniform(30, 5000), 2)
-    else:
-        subcategory = "常规"
-        product_name = f"{category}商品{random.randint(1, 100)}"
-        # 其他类别产品价格
-        price = round(random.uniform(20, 2000), 2)
-    
-    # 数量，大多数订单为小数量
-    quantity = np.random.geometric(p=0.5)
-    
-    # 随机生成折扣
-    discount_rate = 1.0  # 默认无折扣
-    # 特殊日期有更大折扣
-    if is_special_day:
-        discount_rate = round(random.uniform(0.5, 0.9), 2)  # 特殊日期折扣50%-90%
-    elif random.random() < 0.3:  # 30%的普通订单有折扣
-        discount_rate = round(random.uniform(0.7, 0.95), 2)  # 普通折扣70%-95%
-    
-    # 计算总价
-    total_price = round(price * quantity * discount_rate, 2)
-    
-    # 生成顾客信息
-    customer_id = f"CUST-{random.randint(10000, 99999)}"
-    customer_name = fake.name()
+def pick(options, size):
+    """从选项中均匀随机抽取size个，返回对象数组"""
+    options = np.asarray(options, dtype=object)
+    return options[rng.integers(0, len(options), size)]
+
+
+def draw_dates(size):
+    """随机抽取日期，返回相对起始日期的天数"""
+    return rng.integers(0, date_range + 1, size)
+
+
+# 以下按列整体生成所有记录，避免逐条记录调用随机函数
+
+# 生成日期，确保日期分布不均匀，模拟季节性和节假日效应
+random_day = draw_dates(num_records)
+dates = pd.Timestamp(start_date) + pd.to_timedelta(random_day, unit='D')
+years, months, days = dates.year.to_numpy(), dates.month.to_numpy(), dates.day.to_numpy()
+
+# 在重要购物节添加更多订单
+# 春节 (假设2022年春节在2月1日，2023年春节在1月22日)
+spring_festival = ((months == 2) & (days <= 7) & (years == 2022)) | \
+                  ((months == 1) & (days >= 20) & (days <= 27) & (years == 2023))
+# 618购物节
+shopping_618 = (months == 6) & (days >= 10) & (days <= 20)
+# 双11购物节
+shopping_1111 = (months == 11) & (days >= 9) & (days <= 12)
+# 春节80%、618 70%、双11 90%的概率记为特殊日期
+special_probability = np.select([spring_festival, shopping_618, shopping_1111], [0.8, 0.7, 0.9], default=0.0)
+is_special_day = rng.random(num_records) < special_probability
+
+# 如果是特殊日期但未被选中，则随机选择其他日期
+redraw = ~is_special_day & (random_day % 20 == 0)  # 每20天的样本重新选日期
+random_day[redraw] = draw_dates(redraw.sum())
+dates = pd.Timestamp(start_date) + pd.to_timedelta(random_day, unit='D')
+
+# 生成订单信息
+order_dates = dates.strftime('%Y%m%d').to_numpy().astype(str)
+order_numbers = np.char.zfill(np.arange(num_records).astype(str), 5)
+order_ids = np.char.add(np.char.add('ORD-', order_dates), np.char.add('-', order_numbers))
+
+# 选择类别
+category_codes = rng.integers(0, len(categories), num_records)
+
+# 根据类别选择子类别和产品，其他类别为常规商品（子类别为"常规"，产品为"类别商品1"至"类别商品100"）
+detailed_categories = {
+    '电子产品': (electronics_subcategories, electronics_products),
+    '服装': (clothing_subcategories, clothing_products),
+    '家居': (home_subcategories, home_products),
+}
+# 将各类别的子类别和各子类别的产品依次展开为一维数组，并记录每段的起始位置：
+# 类别i的子类别为subcategory_names[subcategory_offsets[i]:subcategory_offsets[i + 1]]，
+# 子类别j的产品为product_names[product_offsets[j]:product_offsets[j + 1]]
+subcategory_names, product_names = [], []
+subcategory_offsets, product_offsets = [0], [0]
+for category in categories:
+    default_products = {"常规": [f"{category}商品{number}" for number in range(1, 101)]}
+    subcategories, products = detailed_categories.get(category, (["常规"], default_products))
+    for subcategory in subcategories:
+        subcategory_names.append(subcategory)
+        product_names.extend(products[subcategory])
+        product_offsets.append(len(product_names))
+    subcategory_offsets.append(len(subcategory_names))
+subcategory_names = np.asarray(subcategory_names, dtype=object)
+product_names = np.asarray(product_names, dtype=object)
+subcategory_offsets = np.asarray(subcategory_offsets)
+product_offsets = np.asarray(product_offsets)
+
+# 先在所属类别的子类别段内随机取一个，再在该子类别的产品段内随机取一个
+subcategory_index = subcategory_offsets[category_codes] + rng.integers(0, np.diff(subcategory_offsets)[category_codes])
+product_index = product_offsets[subcategory_index] + rng.integers(0, np.diff(product_offsets)[subcategory_index])
+subcategory_values = subcategory_names[subcategory_index]
+product_values = product_names[product_index]
+
+# 价格区间：电子产品价格范围较大，服装价格中等，家居产品价格区间广，其他类别20-2000
+price_ranges = {'电子产品': (500, 10000), '服装': (50, 2000), '家居': (30, 5000)}
+price_low = np.array([price_ranges.get(category, (20, 2000))[0] for category in categories])
+price_high = np.array([price_ranges.get(category, (20, 2000))[1] for category in categories])
+price_low, price_high = price_low[category_codes], price_high[category_codes]
+price = np.round(rng.uniform(price_low, price_high), 2)
+
+# 数量，大多数订单为小数量
+quantity = rng.geometric(p=0.5, size=num_records)
+
+# 随机生成折扣：特殊日期折扣50%-90%，30%的普通订单有70%-95%的折扣，其余无折扣
+# 只抽取一组均匀随机数，再按每行所属的折扣区间缩放
+has_discount = is_special_day | (rng.random(num_records) < 0.3)
+discount_low = np.where(is_special_day, 0.5, 0.7)
+discount_high = np.where(is_special_day, 0.9, 0.95)
+discount_draw = discount_low + (discount_high - discount_low) * rng.random(num_records)
+discount_rate = np.where(has_discount, np.round(discount_draw, 2), 1.0)
+
+# 计算总价
+total_price = np.round(price * quantity * discount_rate, 2)
+
+# 生成顾客信息
+customer_ids = np.char.add('CUST-', rng.integers(10000, 100000, num_records).astype(str))
+customer_names = pick(name_pool, num_records)
+
+# 生成位置信息
+province_values = pick(provinces, num_records)
+city_values = np.empty(num_records, dtype=object)
+for province in provinces:
+    rows = np.flatnonzero(province_values == province)
+    city_values[rows] = pick(cities[province], len(rows))
+addresses = pick(address_pool, num_records)
+
+# 生成店铺信息
+store_values = pick(stores, num_records)
+
+# 生成评分
+# 高价产品和特殊日期购买的产品评分稍微高一些
+high_rating = (price > 1000) | is_special_day
+rating_draw = np.where(high_rating, 4.2, 3.8) + np.where(high_rating, 0.7, 0.9) * rng.standard_normal(num_records)
+rating = np.clip(np.round(rating_draw), 1, 5).astype(int)
+
+# 生成支付信息
+payment_values = pick(payment_methods, num_records)
+
+# 配送时间（天）
+delivery_time = rng.integers(1, 11, num_records)
+
+# 创建DataFrame，各列直接使用按列生成的数组，整数列使用int32，
+# 取值很少的文本列使用分类类型（每行只保存整数编码）
+df = pd.DataFrame({
+    '订单ID': order_ids,
+    '日期': dates,
+    '年': dates.year.to_numpy(np.int32),
+    '月': dates.month.to_numpy(np.int32),
+    '日': dates.day.to_numpy(np.int32),
+    '季度': dates.quarter.to_numpy(np.int32),
+    '商品类别': pd.Categorical.from_codes(category_codes, categories=categories),
+    '子类别': pd.Categorical(subcategory_values),
+    '商品名称': product_values,
+    '单价': price,
+    '数量': quantity.astype(np.int32),
+    '折扣率': discount_rate,
+    '总价': total_price,
+    '顾客ID': customer_ids,
+    '顾客姓名': customer_names,
+    '省份': pd.Categorical(province_values, categories=provinces),
+    '城市': pd.Categorical(city_values),
+    '地址': addresses,
+    '店铺': pd.Categorical(store_values),
+    '评分': rating.astype(np.int32),
+    '支付方式': pd.Categorical(payment_values, categories=payment_methods),
+    '配送时间(天)': delivery_time.astype(np.int32)
+})
+
+# 保存为CSV、Parquet和Excel
+output_dir.mkdir(exist_ok=True)
+
+# Excel中每批写出的行数
+excel_batch_rows = 4096
+
+
+def write_excel_rows(table, path):
+    """将Arrow表按批次逐行写入Excel（constant_memory模式下写完的行立即落盘）"""
+    workbook = xlsxwriter.Workbook(str(path), {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd'})
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, table.column_names)
+    row = 1
+    for batch in table.to_batches(max_chunksize=excel_batch_rows):
+        for values in zip(*(column.to_pylist() for column in batch.columns)):
+            worksheet.write_row(row, 0, values)
+            row += 1
+    workbook.close()
+
+
+if PYARROW_AVAILABLE:
+    # CSV、Parquet和Excel共用同一个Arrow表，DataFrame只转换一次
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # 日期列在内存中保持datetime64，写出时转为日期类型，CSV中只输出年-月-日
+    date_column = table.schema.get_field_index('日期')
+    table = table.set_column(date_column, '日期', table.column(date_column).cast(pa.date32()))
     
-    # 生成位置信息
-    province = random.choice(provinces)
-    city = random.choice(cities[province])
-    address = fake.address()
+    # 先写入UTF-8 BOM（与utf-8-sig编码一致，便于Excel识别中文），再由pyarrow写出表格内容
+    with open(csv_path, 'wb') as f:
+        f.write(b'\xef\xbb\xbf')
+        pa_csv.write_csv(table, f)
     
-    # 生成店铺信息
-    store = random.choice(stores)
+    # Parquet保留列类型，体积小，便于后续分析直接读取
+    pa_parquet.write_table(table, parquet_path, compression='zstd', compression_level=3)
+else:
+    df.to_csv(csv_path, index=False, encoding='utf-8-sig')
     
-    # 生成评分
-    # 高价产品和特殊日期购买的产品评分稍微高一些
-    if price > 1000 or is_special_day:
-        rating = max(1, min(5, round(random.normalvariate(4.2, 0.7))))
+if args.xlsx:
+    if PYARROW_AVAILABLE and XLSXWRITER_AVAILABLE:
+        write_excel_rows(table, xlsx_path)
+    elif XLSXWRITER_AVAILABLE:
+        df.to_excel(xlsx_path, index=False, engine='xlsxwriter',
+                    engine_kwargs={'options': {'constant_memory': True}})
     else:
-        rating = max(1, min(5, round(random.normalvariate(3.8, 0.9))))
-    
-    # 生成支付信息
-    payment_method = random.choice(payment_methods)
-    
-    # 配送时间（天）
-    delivery_time = random.randint(1, 10)
-    
-    # 添加到数据列表
-    data.append({
-        '订单ID': order_id,
-        '日期': date.strftime('%Y-%m-%d'),
-        '年': date.year,
-        '月': date.month,
-        '日': date.day,
-        '季度': (date.month - 1) // 3 + 1,
-        '商品类别': category,
-        '子类别': subcategory,
-        '商品名称': product_name,
-        '单价': price,
-        '数量': quantity,
-        '折扣率': discount_rate,
-        '总价': total_price,
-        '顾客ID': customer_id,
-        '顾客姓名': customer_name,
-        '省份': province,
-        '城市': city,
-        '地址': address,
-        '店铺': store,
-        '评分': rating,
-        '支付方式': payment_method,
-        '配送时间(天)': delivery_time
-    })
-
-# 创建DataFrame
-df = pd.DataFrame(data)
-
-# 保存为CSV和Excel
-output_dir = Path('data')
-output_dir.mkdir(exist_ok=True)
+        df.to_excel(xlsx_path, index=False)
 
-df.to_csv(output_dir / 'ecommerce_sales_data.csv', index=False, encoding='utf-8-sig')
-df.to_excel(output_dir / 'ecommerce_sales_data.xlsx', index=False)
+key_path.write_text(generation_key)
 
 print(f"成功生成{len(df)}条电商销售数据记录，已保存到data目录下")
 
 # 打印数据统计信息
 print("\n数据统计信息:")
-print(f"时间范围: {df['日期'].min()} 至 {df['日期'].max()}")
+print(f"时间范围: {df['日期'].min():%Y-%m-%d} 至 {df['日期'].max():%Y-%m-%d}")
 print(f"商品类别数量: {df['商品类别'].nunique()}")
 print(f"平均订单价格: {df['总价'].mean():.2f}")
 print(f"最高订单价格: {df['总价'].max():.2f}")
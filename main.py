@@ -1,13 +1,12 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from app_ui import EcommerceAnalysisApp
-from matplotlib import rcParams
-
-# 设置中文字体
-rcParams['font.sans-serif'] = ['Microsoft YaHei'] # 设置中文字体为微软雅黑
-rcParams['axes.unicode_minus'] = False # 解决负号显示问题
+from PyQt5.QtCore import Qt, QCoreApplication
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QApplication, QSplashScreen
 
 if __name__ == "__main__":
+    # app_ui在创建QApplication之后才导入，其中的QtWebEngineWidgets要求事先设置共享OpenGL上下文
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    
     app = QApplication(sys.argv)
     app.setStyle('Fusion')  # 使用Fusion风格使界面更现代化
     
@@ -16,8 +15,24 @@ if __name__ == "__main__":
     font = QFont("Microsoft YaHei", 9)  # 使用微软雅黑字体
     app.setFont(font)
     
+    # 先显示启动提示，再加载matplotlib、pandas等较重的模块
+    splash_pixmap = QPixmap(360, 100)
+    splash_pixmap.fill(QColor("#ecf0f1"))
+    splash = QSplashScreen(splash_pixmap)
+    splash.showMessage("正在加载...", Qt.AlignCenter, QColor("#2c3e50"))
+    splash.show()
+    app.processEvents()
+    
+    from app_ui import EcommerceAnalysisApp
+    from matplotlib import rcParams
+    
+    # 设置中文字体
+    rcParams['font.sans-serif'] = ['Microsoft YaHei'] # 设置中文字体为微软雅黑
+    rcParams['axes.unicode_minus'] = False # 解决负号显示问题
+    
     # 创建并显示主窗口
     window = EcommerceAnalysisApp()
     window.show()
+    splash.finish(window)
     
-    sys.exit(app.exec_()) 
\ No newline at end of file
+    sys.exit(app.exec_())
\ No newline at end of file
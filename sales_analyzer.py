@@ -2,9 +2,11 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+import threading
 from pathlib import Path
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.linear_model import LinearRegression
 from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.holtwinters import ExponentialSmoothing
@@ -18,6 +20,511 @@ except ImportError:
     print("警告: Prophet库未安装，将无法使用Prophet进行预测。")
     print("请使用 pip install prophet 安装Prophet库。")
 
+# 尝试导入statsforecast，可用时用其Numba编译的ETS模型做指数平滑预测
+try:
+    from statsforecast.models import AutoETS
+    STATSFORECAST_AVAILABLE = True
+except ImportError:
+    STATSFORECAST_AVAILABLE = False
+
+# 尝试导入PyArrow，可用时使用多线程的pyarrow引擎读取CSV
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 尝试导入ciso8601，可用时用C实现解析ISO格式日期
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
+# 尝试导入Numba，可用时用编译后的并行循环标记大数据量的购物节和按分类编码汇总
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# datetime64数组中NaT对应的int64值
+NAT_INT64 = np.iinfo(np.int64).min
+
+# 分块读取CSV时每块的字节数
+CSV_CHUNK_BYTES = 16 * 1024 * 1024
+
+# 常见的日期格式，按优先级尝试
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S']
+
+# 月份到季度的查找表，下标为月份(1~12)
+QUARTER_LUT = np.array([0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4], dtype=np.int8)
+
+# 加载时转换为分类类型的列（取值重复较多的文本列），筛选和分组时按整数编码比较；
+# 顾客ID每个顾客对应多条订单，客户细分时按编码聚合，不必对字符串逐个计算哈希
+CATEGORY_COLUMNS = ('商品类别', '子类别', '商品名称', '店铺', '省份', '城市', '支付方式', '顾客ID')
+
+# 加载时转换为单精度的比率列：折扣率是0~1之间的比率，单精度足够，读取的数据量减半；
+# 单价、总价是金额，汇总后需要精确到分，保持双精度
+FLOAT32_COLUMNS = ('折扣率',)
+
+# 加载时转换为int32的整数列
+INT32_COLUMNS = ('数量',)
+
+# 客户数达到该值时客户细分改用小批量K-means，客户较少时完整K-means足够快且结果更稳定
+KMEANS_MINIBATCH_MIN_CUSTOMERS = 100_000
+
+# 客户细分时小批量K-means每批使用的样本数
+KMEANS_BATCH_SIZE = 1024
+
+# Prophet计算预测区间时的采样次数（默认1000次），界面只用于绘制置信带，100次已足够
+PROPHET_UNCERTAINTY_SAMPLES = 100
+
+# Prophet趋势变化点的先验尺度，显式设置以免随库版本的默认值变化
+PROPHET_CHANGEPOINT_PRIOR_SCALE = 0.05
+
+# 折扣区间的内部分界点和标签：折扣率在(0, 0.7]、(0.7, 0.8]、(0.8, 0.9]、(0.9, 1.0]内依次对应各标签
+DISCOUNT_BINS = np.array([0.7, 0.8, 0.9])
+DISCOUNT_LABELS = ['大幅折扣(>30%)', '中度折扣(20-30%)', '小幅折扣(10-20%)', '无折扣/微折扣(<10%)']
+
+# 产品组合建议的文本模板，键为建议类型，导入时解析一次，生成建议时用format_map填充
+PRODUCT_SUGGESTION_TEMPLATES = {
+    'top_category': "重点发展'{category}'类别，其销售占比达{share:.1%}，可考虑扩充产品线或提高利润率",
+    'bottom_categories': "评估'{names}'等类别的产品策略，考虑产品创新、调整定价或淘汰部分产品",
+    'concentration': "当前产品结构过于依赖'{category}'类别，建议适当多元化产品组合，分散风险",
+    'diversified': "当前产品结构相对均衡，建议保持多元化策略，并根据市场反馈适时调整",
+    'top_products': "热销产品'{names}'表现突出，建议加强供应链管理，确保库存充足",
+}
+
+# 购物节标签，下标为购物节编码
+FESTIVAL_LABELS = np.array(['普通日期', '春节', '618购物节', '双11购物节'], dtype=object)
+
+# 行数达到该值时使用Numba标记购物节和汇总，数据量较小时编译和线程调度的开销不划算
+NUMBA_MIN_ROWS = 500_000
+
+# Numba并行汇总时把数据分成的块数，每块累加到各自的部分和，最后合并
+NUMBA_SUM_CHUNKS = 64
+
+# ciso8601能直接解析的ISO格式
+ISO_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S')
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+def _arrow_convert_options():
+    """
+    PyArrow读取CSV时的列类型提示
+
+    日期列直接由Arrow解析为时间戳，商品类别、地区等文本列读取为字典编码，转换为pandas时
+    直接得到分类类型，不必先生成字符串对象再转换；文件中不存在的列不受影响。
+    数值列不指定类型：折扣率需按双精度划分折扣区间后再转换为float32；数量的空单元格在Arrow中
+    为null，转换为pandas时整列会变成float64。两者都由加载后的downcast_numeric_columns转换。
+    日期不是ISO格式时Arrow会抛出ArrowInvalid，由调用方回退到pandas读取。
+    """
+    column_types = {'日期': pa.timestamp('ns')}
+    column_types.update({col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORY_COLUMNS})
+    return pa_csv.ConvertOptions(column_types=column_types)
+
+def _pandas_dtypes(categories=True):
+    """
+    pandas读取CSV时的列类型提示，文件中不存在的列会被忽略
+
+    categories为True时文本列直接读取为分类类型。折扣率、数量仍按默认类型读取，
+    在划分折扣区间之后由downcast_numeric_columns转换。
+    """
+    if not categories:
+        return {}
+    return {col: 'category' for col in CATEGORY_COLUMNS}
+
+def _detect_date_format(series):
+    """
+    根据第一个非空样本检测日期格式，无法识别时返回None
+    """
+    sample = series.dropna()
+    if sample.empty:
+        return None
+    sample = str(sample.iloc[0]).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(sample, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+def _fast_parse_iso(series):
+    """
+    使用ciso8601解析ISO格式的日期列
+
+    日期列的重复值很多，只对去重后的值逐个解析，再按编码映射回整列；
+    遇到无法解析的值时抛出ValueError，由调用方回退到pandas解析。
+    """
+    codes, uniques = pd.factorize(series)
+    micros = np.fromiter(
+        ((ciso8601.parse_datetime_as_naive(str(value)) - _EPOCH) // _ONE_MICROSECOND for value in uniques),
+        dtype='i8', count=len(uniques)
+    ).view('datetime64[us]').astype('datetime64[ns]')
+    values = micros.take(codes)
+    values[codes < 0] = np.datetime64('NaT')
+    return pd.Series(values, index=series.index, name=series.name)
+
+def parse_date_column(series):
+    """
+    将日期列转换为datetime类型
+
+    先检测一次日期格式再整列解析，避免pandas逐个元素推断格式；
+    ISO格式优先使用ciso8601解析，已经是datetime类型的列直接返回。
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    fmt = _detect_date_format(series)
+    if fmt is None:
+        return pd.to_datetime(series)
+    if CISO8601_AVAILABLE and fmt in ISO_DATE_FORMATS:
+        try:
+            return _fast_parse_iso(series)
+        except ValueError:
+            pass
+    return pd.to_datetime(series, format=fmt, cache=True, errors='coerce')
+
+def split_date_parts(dates):
+    """
+    将datetime64数组一次性拆分为年、月、日三个整数数组
+
+    直接在datetime64数组上按年、月、日截断计算，不经过.dt访问器；
+    日期无效(NaT)时对应的值没有意义，需要时由调用方另行处理。
+    """
+    values = np.asarray(dates, dtype='datetime64[ns]')
+    m64 = values.astype('datetime64[M]')
+    years = m64.astype('datetime64[Y]').astype(np.int64) + 1970
+    months = m64.astype(np.int64) % 12 + 1
+    days = (values.astype('datetime64[D]') - m64.astype('datetime64[D]')).astype(np.int64) + 1
+    return years, months, days
+
+def _festival_codes_numpy(years, months, days):
+    """
+    按年、月、日数组计算每行的购物节编码（对应FESTIVAL_LABELS的下标）
+    """
+    # 春节 (假设2022年春节在2月1日，2023年春节在1月22日)
+    spring_festival = (((years == 2022) & (months == 2) & (days <= 7))
+                       | ((years == 2023) & (months == 1) & (days >= 20) & (days <= 27)))
+    
+    # 618购物节
+    festival_618 = (months == 6) & (days >= 10) & (days <= 20)
+    
+    # 双11购物节
+    festival_1111 = (months == 11) & (days >= 9) & (days <= 12)
+    
+    # 各购物节的日期互不重叠，一次性选出每行的编码
+    return np.select([spring_festival, festival_618, festival_1111], [1, 2, 3], default=0).astype(np.int8)
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _festival_codes_numba(years, months, days, out):
+        """与_festival_codes_numpy的规则相同，逐行写入编码，不产生中间的布尔数组"""
+        for i in prange(years.size):
+            year, month, day = years[i], months[i], days[i]
+            if ((year == 2022 and month == 2 and day <= 7)
+                    or (year == 2023 and month == 1 and 20 <= day <= 27)):
+                out[i] = 1
+            elif month == 6 and 10 <= day <= 20:
+                out[i] = 2
+            elif month == 11 and 9 <= day <= 12:
+                out[i] = 3
+            else:
+                out[i] = 0
+
+def tag_festivals(years, months, days):
+    """
+    根据年、月、日数组标记每行所属的购物节，返回购物节的分类数组
+
+    数据量较大且Numba可用时使用编译后的并行循环，否则使用numpy向量化计算；
+    结果直接由编码构造分类数组，不生成逐行的字符串对象，分组时需指定observed=True。
+    """
+    years, months, days = np.asarray(years), np.asarray(months), np.asarray(days)
+    if NUMBA_AVAILABLE and years.size >= NUMBA_MIN_ROWS:
+        codes = np.empty(years.size, dtype=np.int8)
+        _festival_codes_numba(years, months, days, codes)
+    else:
+        codes = _festival_codes_numpy(years, months, days)
+    return pd.Categorical.from_codes(codes, categories=FESTIVAL_LABELS)
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _group_sums_numba(codes, values, n_groups, n_chunks):
+        """按分组编码分块并行累加，返回各组的和与行数；编码为-1或值为NaN的行不计入和"""
+        n = codes.size
+        step = (n + n_chunks - 1) // n_chunks
+        sums = np.zeros((n_chunks, n_groups))
+        counts = np.zeros((n_chunks, n_groups), dtype=np.int64)
+        for chunk in prange(n_chunks):
+            for i in range(chunk * step, min(chunk * step + step, n)):
+                code = codes[i]
+                if code >= 0:
+                    counts[chunk, code] += 1
+                    if values[i] == values[i]:
+                        sums[chunk, code] += values[i]
+        return sums.sum(axis=0), counts.sum(axis=0)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _customer_aggregates_numba(starts, products, has_order, totals, dates, n_products):
+        """
+        在按顾客排好序的数组上一次扫描每个顾客的连续区间，同时得到订单数、消费额、
+        不同商品数和首次/最近购买日期；商品去重用记录“最后出现在哪个顾客”的标记数组代替集合
+        """
+        n_groups = starts.size - 1
+        orders = np.zeros(n_groups, dtype=np.int64)
+        sums = np.zeros(n_groups)
+        distinct = np.zeros(n_groups, dtype=np.int64)
+        first = np.full(n_groups, NAT_INT64, dtype=np.int64)
+        last = np.full(n_groups, NAT_INT64, dtype=np.int64)
+        seen = np.full(n_products, -1, dtype=np.int64)
+        for g in range(n_groups):
+            for i in range(starts[g], starts[g + 1]):
+                if has_order[i]:
+                    orders[g] += 1
+                if totals[i] == totals[i]:
+                    sums[g] += totals[i]
+                product = products[i]
+                if product >= 0 and seen[product] != g:
+                    seen[product] = g
+                    distinct[g] += 1
+                date = dates[i]
+                if date != NAT_INT64:
+                    if first[g] == NAT_INT64 or date < first[g]:
+                        first[g] = date
+                    if date > last[g]:
+                        last[g] = date
+        return orders, sums, distinct, first, last
+
+def _customer_aggregates_numpy(starts, products, has_order, totals, dates, n_products):
+    """_customer_aggregates_numba的NumPy实现：按顾客区间用reduceat汇总，商品去重用(顾客, 商品)编码对"""
+    bounds = starts[:-1]
+    orders = np.add.reduceat(has_order.astype(np.int64), bounds)
+    sums = np.add.reduceat(np.nan_to_num(totals), bounds)
+    group_of_row = np.repeat(np.arange(bounds.size, dtype=np.int64), np.diff(starts))
+    valid = products >= 0
+    pairs = np.unique(group_of_row[valid] * n_products + products[valid])
+    distinct = np.bincount(pairs // max(n_products, 1), minlength=bounds.size)
+    # NaT对应int64最小值，求最大值时自然被忽略，求最小值时先替换为最大值
+    max_int = np.iinfo(np.int64).max
+    first = np.minimum.reduceat(np.where(dates == NAT_INT64, max_int, dates), bounds)
+    first[first == max_int] = NAT_INT64
+    last = np.maximum.reduceat(dates, bounds)
+    return orders, sums, distinct, first, last
+
+def customer_aggregates(df):
+    """
+    按顾客ID汇总订单数量、总消费额、不同商品数和首次/最近购买日期
+
+    结果与groupby('顾客ID').agg({'订单ID': 'count', '总价': 'sum', '商品名称': 'nunique',
+    '日期': ['min', 'max']})一致。按顾客编码排序一次后，每个顾客的行连续存放，
+    一次扫描即可得到全部指标，不再为每个顾客构造集合计算nunique；数据量较大且Numba
+    可用时使用编译后的循环，否则用NumPy的reduceat完成。日期列不是datetime类型时退回groupby。
+    """
+    if not pd.api.types.is_datetime64_dtype(df['日期']):
+        customer_data = df.groupby('顾客ID', observed=True).agg({
+            '订单ID': 'count',
+            '总价': 'sum',
+            '商品名称': 'nunique',
+            '日期': ['min', 'max']
+        }).reset_index()
+        customer_data.columns = ['顾客ID', '订单数量', '总消费额', '不同商品数', '首次购买日期', '最近购买日期']
+        return customer_data
+        
+    customer_codes, customer_ids = pd.factorize(df['顾客ID'], sort=True)
+    product_column = df['商品名称']
+    if isinstance(product_column.dtype, pd.CategoricalDtype):
+        product_codes = product_column.cat.codes.to_numpy().astype(np.int64)
+        n_products = len(product_column.cat.categories)
+    else:
+        product_codes, product_uniques = pd.factorize(product_column)
+        n_products = len(product_uniques)
+        
+    # 按顾客编码稳定排序，编码为-1（顾客ID缺失）的行不属于任何顾客
+    valid = np.flatnonzero(customer_codes >= 0)
+    order = valid[np.argsort(customer_codes[valid], kind='stable')]
+    rows_per_customer = np.bincount(customer_codes[valid], minlength=len(customer_ids))
+    starts = np.concatenate(([0], np.cumsum(rows_per_customer)))
+    
+    date_values = df['日期'].to_numpy()
+    arrays = (
+        starts,
+        product_codes[order],
+        df['订单ID'].notna().to_numpy()[order],
+        df['总价'].to_numpy(dtype=np.float64)[order],
+        date_values.view(np.int64)[order],
+        n_products,
+    )
+    if len(customer_ids) == 0:
+        orders = sums = distinct = first = last = np.empty(0, dtype=np.int64)
+    elif NUMBA_AVAILABLE and order.size >= NUMBA_MIN_ROWS:
+        orders, sums, distinct, first, last = _customer_aggregates_numba(*arrays)
+    else:
+        orders, sums, distinct, first, last = _customer_aggregates_numpy(*arrays)
+        
+    return pd.DataFrame({
+        '顾客ID': customer_ids,
+        '订单数量': orders,
+        '总消费额': sums.astype(np.float64),
+        '不同商品数': distinct,
+        '首次购买日期': first.view(date_values.dtype),
+        '最近购买日期': last.view(date_values.dtype),
+    })
+
+def group_sums(codes, values, n_groups):
+    """
+    按分类编码汇总数值，返回(各组的和, 各组的行数)
+
+    与groupby(...).sum()一致：编码为-1（缺失）的行不属于任何分组，NaN不计入和。
+    数据量较大且Numba可用时使用并行循环，否则用np.bincount一次完成累加。
+    """
+    codes = np.asarray(codes)
+    values = np.asarray(values, dtype=np.float64)
+    if NUMBA_AVAILABLE and codes.size >= NUMBA_MIN_ROWS:
+        return _group_sums_numba(codes, values, n_groups, NUMBA_SUM_CHUNKS)
+    valid = codes >= 0
+    codes, values = codes[valid], values[valid]
+    sums = np.bincount(codes, weights=np.nan_to_num(values), minlength=n_groups)
+    return sums, np.bincount(codes, minlength=n_groups)
+
+def top_n_indices(values, n):
+    """
+    返回数组中最大的n个值的下标，按值降序排列
+
+    先用np.argpartition在线性时间内选出前n个，只对这n个值排序，
+    不必对全部分组完整排序。
+    """
+    values = np.asarray(values)
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n < values.size:
+        idx = np.argpartition(-values, n - 1)[:n]
+    else:
+        idx = np.arange(values.size)
+    return idx[np.argsort(-values[idx], kind='stable')]
+
+def format_suggestions(items):
+    """
+    将结构化的建议列表拼接为显示用的文本，各条建议之间用“；”分隔
+
+    Args:
+        items: 建议列表，每项为包含 'message' 键的字典
+    """
+    return "；".join(item["message"] for item in items)
+
+def period_labels(grouped, time_unit):
+    """
+    生成按月、季度或年汇总结果的时间标签，例如 '2023-05'、'2023-Q2'、'2023'
+
+    整列使用向量化的字符串运算拼接，不再对每行调用apply。
+    """
+    years = grouped['年'].astype(int).astype(str)
+    if time_unit == '月':
+        return years + '-' + grouped['月'].astype(int).astype(str).str.zfill(2)
+    if time_unit == '季度':
+        return years + '-Q' + grouped['季度'].astype(int).astype(str)
+    return years
+
+def time_categories(values, categories=None):
+    """
+    将年、月或季度的取值转换为有序分类数组
+
+    categories为None时使用数据中出现的年份；不属于categories的取值和缺失值对应缺失。
+    类别是排好序的整数，用np.searchsorted直接得到编码，不必逐个计算哈希。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    if categories is None:
+        categories = np.unique(values[valid])
+    categories = np.asarray(categories, dtype=np.int64)
+    codes = np.full(len(values), -1, dtype=np.int16)
+    if len(categories):
+        present = values[valid]
+        positions = np.searchsorted(categories, present).clip(max=len(categories) - 1)
+        codes[valid] = np.where(categories[positions] == present, positions, -1)
+    return pd.Categorical.from_codes(codes, categories=categories, ordered=True)
+
+def add_time_columns(df):
+    """
+    根据日期列补充缺少的年、月、日、季度列，返回新的DataFrame
+
+    在datetime64数组上一次性计算年、月、日，季度由月份查表得到；日使用int8存储。
+    日期无效(NaT)时对应的值为缺失，与.dt访问器的结果一致。
+    年、月、季度（包括文件中原有的列）转换为有序分类类型，分组时直接使用整数编码，
+    类别即为筛选下拉框的选项；年的类别为数据中出现的年份，月、季度的类别为1~12和1~4。
+    """
+    missing = [col for col in ('年', '月', '日', '季度') if col not in df.columns]
+    columns = {}
+    if missing and '日期' in df.columns:
+        d64 = df['日期'].values.astype('datetime64[D]')
+        m64 = d64.astype('datetime64[M]')
+        months = (m64.astype(np.int64) % 12 + 1).astype(np.int8)
+        years = (m64.astype('datetime64[Y]').astype(np.int64) + 1970).astype(np.int16)
+        days = ((d64 - m64).astype(np.int64) + 1).astype(np.int8)
+        quarters = QUARTER_LUT[months]
+        fields = {'年': years, '月': months, '日': days, '季度': quarters}
+        
+        invalid = np.isnat(m64)
+        if invalid.any():
+            fields = {k: np.where(invalid, np.nan, v) for k, v in fields.items()}
+        columns = {col: fields[col] for col in missing}
+        
+    for col, categories in (('年', None), ('季度', range(1, 5)), ('月', range(1, 13))):
+        values = columns[col] if col in columns else df[col] if col in df.columns else None
+        if values is not None and not isinstance(values.dtype, pd.CategoricalDtype):
+            columns[col] = time_categories(values, categories)
+            
+    return df.assign(**columns) if columns else df
+
+def discount_bands(discount_rates):
+    """
+    将折扣率划分到折扣区间，返回分类数组
+
+    用np.digitize直接得到区间编码，与pd.cut(bins=[0, 0.7, 0.8, 0.9, 1.0])的结果一致，
+    不在(0, 1]内的折扣率和缺失值对应缺失。
+    """
+    rates = np.asarray(discount_rates, dtype=np.float64)
+    codes = np.digitize(rates, DISCOUNT_BINS, right=True).astype(np.int8)
+    codes[~((rates > 0) & (rates <= 1))] = -1
+    return pd.Categorical.from_codes(codes, categories=DISCOUNT_LABELS, ordered=True)
+
+def downcast_numeric_columns(df):
+    """
+    将折扣率列转换为float32，数量列转换为int32，返回新的DataFrame
+
+    汇总时按列扫描的字节数减半；整数列只在取值不超出int32范围时转换。
+    """
+    columns = {}
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns and pd.api.types.is_float_dtype(df[col]) and df[col].dtype != np.float32:
+            columns[col] = df[col].astype(np.float32)
+    int32_info = np.iinfo(np.int32)
+    for col in INT32_COLUMNS:
+        if (col in df.columns and pd.api.types.is_integer_dtype(df[col]) and df[col].dtype != np.int32
+                and (df[col].empty or int32_info.min <= df[col].min() <= df[col].max() <= int32_info.max)):
+            columns[col] = df[col].astype(np.int32)
+    return df.assign(**columns) if columns else df
+
+def add_promotion_columns(df):
+    """
+    补充缺少的购物节、有折扣和折扣区间列，返回新的DataFrame
+
+    购物节由年、月、日列标记（分类类型），有折扣为折扣率小于1的布尔列，折扣区间为
+    折扣率所在的区间；在加载数据时计算一次，促销和季节性分析直接按这些列分组。
+    """
+    columns = {}
+    if '购物节' not in df.columns and {'年', '月', '日'}.issubset(df.columns):
+        # 年、月是分类类型，转换为数值数组后再比较
+        columns['购物节'] = tag_festivals(*(np.asarray(df[col], dtype=float) for col in ('年', '月', '日')))
+    if '有折扣' not in df.columns and '折扣率' in df.columns:
+        columns['有折扣'] = (df['折扣率'] < 1.0).to_numpy()
+    if '折扣区间' not in df.columns and '折扣率' in df.columns:
+        columns['折扣区间'] = discount_bands(df['折扣率'])
+    return df.assign(**columns) if columns else df
+
 class SalesAnalyzer:
     """
     电商销售数据分析类，提供各种数据分析和可视化功能
@@ -27,31 +534,197 @@ class SalesAnalyzer:
         初始化分析器，可选择性加载数据
         """
         self.df = None
+        self.sales_cube = None
+        # 按查询参数缓存的汇总结果（销售额汇总、类别销售额、热销产品），以及缓存对应的数据
+        self._query_cache = {}
+        self._query_source = None
+        # 按群体数量缓存的客户细分结果：n_clusters -> (计算所用的数据, 结果)
+        self._segments_cache = {}
+        # 生成决策建议时多个线程同时读写上述缓存，读写缓存时需持有此锁
+        self._cache_lock = threading.RLock()
         if data_path:
             self.load_data(data_path)
             
-    def load_data(self, data_path):
+    def load_data(self, data_path, progress_callback=None):
         """
         加载销售数据
         
         Args:
             data_path: 数据文件路径，支持CSV或Excel格式
+            progress_callback: 可选，读取进度回调，参数为0~1之间的已读比例；
+                               指定时CSV文件按块读取并逐块报告进度
         """
         file_path = Path(data_path)
         if not file_path.exists():
             raise FileNotFoundError(f"文件不存在: {data_path}")
         
+        # 重新加载数据后原有的汇总结果失效
+        self.sales_cube = None
+        
         # 根据文件扩展名选择加载方法
         if file_path.suffix.lower() == '.csv':
-            self.df = pd.read_csv(file_path)
+            if progress_callback is not None:
+                self.df = self._read_csv_chunked(file_path, progress_callback)
+            elif PYARROW_AVAILABLE:
+                try:
+                    self.df = pa_csv.read_csv(file_path, convert_options=_arrow_convert_options()).to_pandas()
+                except pa.ArrowInvalid:
+                    # 列类型与提示不一致（例如日期不是ISO格式）时改用pandas读取
+                    self.df = pd.read_csv(file_path, dtype=_pandas_dtypes())
+            else:
+                self.df = pd.read_csv(file_path, dtype=_pandas_dtypes())
         elif file_path.suffix.lower() in ['.xlsx', '.xls']:
             self.df = pd.read_excel(file_path)
         else:
             raise ValueError(f"不支持的文件格式: {file_path.suffix}")
             
-        # 将日期列转换为日期类型
+        # 将日期列转换为日期类型，并补充缺少的年、月、日、季度列，筛选时不必再从日期计算；
+        # 年、月、季度转换为有序分类类型
         if '日期' in self.df.columns:
-            self.df['日期'] = pd.to_datetime(self.df['日期'])
+            self.df['日期'] = parse_date_column(self.df['日期'])
+        self.df = add_time_columns(self.df)
+            
+        # 购物节和折扣标记只取决于数据本身，加载时计算一次
+        self.df = add_promotion_columns(self.df)
+        
+        # 折扣率使用单精度，数量使用int32，减少汇总时的内存带宽；金额保持双精度
+        self.df = downcast_numeric_columns(self.df)
+            
+        # 商品类别、地区等列取值很少，转换为分类类型，类别本身已排序去重；
+        # Arrow字典编码得到的类别按出现顺序排列，需要重新排序
+        for col in CATEGORY_COLUMNS:
+            if col not in self.df.columns:
+                continue
+            if self.df[col].dtype == object:
+                self.df[col] = self.df[col].astype('category')
+            elif (isinstance(self.df[col].dtype, pd.CategoricalDtype)
+                  and not self.df[col].cat.categories.is_monotonic_increasing):
+                self.df[col] = self.df[col].cat.reorder_categories(self.df[col].cat.categories.sort_values())
+                
+        # 上面原地转换了列类型，之前基于同一对象缓存的结果不再有效
+        self.clear_caches()
+    
+    @staticmethod
+    def get_cache_path(data_path):
+        """
+        返回数据文件对应的Parquet缓存文件路径
+        """
+        return Path(str(data_path) + '.parquet')
+    
+    def load_cached_data(self, data_path, source_mtime=None):
+        """
+        如果存在比数据文件更新的Parquet缓存，则直接从缓存加载数据
+        
+        缓存中保存的是处理后的数据，日期列和各列的数据类型都已转换完成。
+        
+        Args:
+            data_path: 原始数据文件路径
+            source_mtime: 可选，原始数据文件的修改时间，调用方已取得时传入以免重复stat
+        
+        Returns:
+            是否成功从缓存加载
+        """
+        if not PYARROW_AVAILABLE:
+            return False
+        
+        if source_mtime is None:
+            source_mtime = Path(data_path).stat().st_mtime
+        
+        try:
+            cache_mtime = self.get_cache_path(data_path).stat().st_mtime
+        except OSError:
+            return False
+        if cache_mtime <= source_mtime:
+            return False
+        
+        try:
+            df = pd.read_parquet(self.get_cache_path(data_path), engine='pyarrow', memory_map=True)
+        except Exception as e:
+            print(f"读取缓存文件失败，将重新加载数据: {str(e)}")
+            return False
+        
+        # 缓存中的年、月、季度不一定保留分类类型，与load_data的结果保持一致
+        self.df = add_time_columns(df)
+        self.sales_cube = None
+        return True
+    
+    def save_data_cache(self, data_path):
+        """
+        将当前数据保存为Parquet缓存，下次打开同一文件时直接读取
+        
+        Returns:
+            是否保存成功
+        """
+        if not PYARROW_AVAILABLE or self.df is None:
+            return False
+        
+        try:
+            self.df.to_parquet(self.get_cache_path(data_path), engine='pyarrow', compression='zstd', index=False)
+        except Exception as e:
+            print(f"保存缓存文件失败: {str(e)}")
+            return False
+        return True
+    
+    def build_sales_cube(self):
+        """
+        按年、季度、月、商品类别预先汇总销售额
+
+        趋势图和热图直接在汇总结果上切片，筛选条件变化时不必再扫描整个数据集；
+        PyArrow可用时使用Arrow的分组聚合计算，缺少必要的列时不生成汇总结果。
+        """
+        keys = ['年', '季度', '月', '商品类别']
+        if self.df is None or not set(keys + ['总价']).issubset(self.df.columns):
+            self.sales_cube = None
+            return None
+        
+        if PYARROW_AVAILABLE:
+            table = pa.Table.from_pandas(self.df[keys + ['总价']], preserve_index=False)
+            grouped = table.group_by(keys).aggregate([('总价', 'sum')]).to_pandas()
+            # Arrow会把空值作为单独的分组，这里与pandas的分组结果保持一致，去掉空值分组
+            cube = grouped.dropna(subset=keys).set_index(keys)['总价_sum'].rename('总价')
+        else:
+            cube = self.df.groupby(keys, observed=True, sort=False)['总价'].sum()
+        
+        self.sales_cube = cube.sort_index()
+        return self.sales_cube
+    
+    def _read_csv_chunked(self, file_path, progress_callback):
+        """按块读取CSV文件，每读完一块通过回调报告进度"""
+        total_bytes = max(file_path.stat().st_size, 1)
+        
+        with open(file_path, 'rb') as f:
+            if PYARROW_AVAILABLE:
+                try:
+                    reader = pa_csv.open_csv(f, read_options=pa_csv.ReadOptions(block_size=CSV_CHUNK_BYTES),
+                                             convert_options=_arrow_convert_options())
+                    batches = []
+                    for batch in reader:
+                        batches.append(batch)
+                        # 每个批次大约对应block_size字节的原始数据（读取器会预读，不能用f.tell()）
+                        progress_callback(min(len(batches) * CSV_CHUNK_BYTES / total_bytes, 1.0))
+                    return pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+                except pa.ArrowInvalid:
+                    # 列类型只根据第一块推断，后续块类型不一致时改用pandas重新读取
+                    f.seek(0)
+            
+            # 各块的分类类别不同，合并后会变回object，文本列仍在加载后统一转换
+            chunks = []
+            for chunk in pd.read_csv(f, chunksize=100000, dtype=_pandas_dtypes(categories=False)):
+                chunks.append(chunk)
+                progress_callback(min(f.tell() / total_bytes, 1.0))
+            return pd.concat(chunks, ignore_index=True)
+    
+    def get_category_list(self):
+        """
+        获取排序后的商品类别列表，分类列直接返回其类别，不必扫描整列
+        """
+        if self.df is None or '商品类别' not in self.df.columns:
+            return []
+        
+        column = self.df['商品类别']
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return column.cat.categories.tolist()
+        return sorted(column.dropna().unique().tolist())
     
     def get_data_summary(self):
         """
@@ -60,12 +733,14 @@ class SalesAnalyzer:
         if self.df is None:
             return None
         
+        # 商品类别列表直接取自分类类型的类别，不再扫描整列
+        categories = self.get_category_list()
         summary = {
             '总记录数': len(self.df),
             '时间范围': [self.df['日期'].min().strftime('%Y-%m-%d'), 
                        self.df['日期'].max().strftime('%Y-%m-%d')],
-            '商品类别数量': self.df['商品类别'].nunique(),
-            '商品类别列表': self.df['商品类别'].unique().tolist(),
+            '商品类别数量': len(categories),
+            '商品类别列表': categories,
             '平均订单金额': round(self.df['总价'].mean(), 2),
             '最高订单金额': round(self.df['总价'].max(), 2),
             '顾客数量': self.df['顾客ID'].nunique(),
@@ -94,21 +769,24 @@ class SalesAnalyzer:
         if missing_columns:
             raise ValueError(f"数据中缺少必要的列: {missing_columns}")
             
-        data = self.df.copy()
-        
-        # 确保日期列为datetime类型
-        try:
-            data['日期'] = pd.to_datetime(data['日期'])
-        except Exception as e:
-            raise ValueError(f"日期列转换失败: {str(e)}")
+        # 月、季度、年的统计直接使用预先汇总的结果
+        if time_unit in ('月', '季度', '年') and self.sales_cube is not None:
+            return self._get_sales_by_time_from_cube(time_unit, category)
+            
+        data = self.df
+        
+        # 确保日期列为datetime类型（load_data中已转换，通常无需再次解析）
+        if not pd.api.types.is_datetime64_any_dtype(data['日期']):
+            try:
+                data = data.assign(日期=pd.to_datetime(data['日期']))
+            except Exception as e:
+                raise ValueError(f"日期列转换失败: {str(e)}")
             
-        # 添加年、月、季度列
-        data['年'] = data['日期'].dt.year
-        data['月'] = data['日期'].dt.month
-        data['季度'] = (data['月'] - 1) // 3 + 1
+        # 年、月、日、季度列在加载数据时已生成，这里只补充缺少的列
+        data = add_time_columns(data)
         
         if category:
-            if category not in data['商品类别'].unique():
+            if category not in self.get_category_list():
                 raise ValueError(f"指定的商品类别 '{category}' 不存在")
             data = data[data['商品类别'] == category]
             
@@ -120,14 +798,14 @@ class SalesAnalyzer:
                 grouped = data.groupby('日期')['总价'].sum().reset_index()
                 grouped['时间'] = grouped['日期'].dt.strftime('%Y-%m-%d')
             elif time_unit == '月':
-                grouped = data.groupby([data['年'], data['月']])['总价'].sum().reset_index()
-                grouped['时间'] = grouped.apply(lambda x: f"{int(x['年'])}-{int(x['月']):02d}", axis=1)
+                grouped = data.groupby(['年', '月'], observed=True)['总价'].sum().reset_index()
+                grouped['时间'] = period_labels(grouped, time_unit)
             elif time_unit == '季度':
-                grouped = data.groupby([data['年'], data['季度']])['总价'].sum().reset_index()
-                grouped['时间'] = grouped.apply(lambda x: f"{int(x['年'])}-Q{int(x['季度'])}", axis=1)
+                grouped = data.groupby(['年', '季度'], observed=True)['总价'].sum().reset_index()
+                grouped['时间'] = period_labels(grouped, time_unit)
             elif time_unit == '年':
-                grouped = data.groupby('年')['总价'].sum().reset_index()
-                grouped['时间'] = grouped['年'].astype(int).astype(str)
+                grouped = data.groupby('年', observed=True)['总价'].sum().reset_index()
+                grouped['时间'] = period_labels(grouped, time_unit)
             else:
                 raise ValueError(f"不支持的时间单位: {time_unit}")
                 
@@ -139,22 +817,47 @@ class SalesAnalyzer:
         except Exception as e:
             raise ValueError(f"数据处理过程中出错: {str(e)}")
     
+    def _get_sales_by_time_from_cube(self, time_unit, category=None):
+        """
+        在预先汇总的销售额上按时间维度统计，返回结果与get_sales_by_time一致
+        """
+        cube = self.sales_cube
+        if category:
+            categories = cube.index.get_level_values('商品类别')
+            if category not in categories:
+                raise ValueError(f"指定的商品类别 '{category}' 不存在")
+            cube = cube[categories == category]
+            
+        if len(cube) == 0:
+            raise ValueError("筛选后的数据集为空")
+        
+        levels = {'月': ['年', '月'], '季度': ['年', '季度'], '年': ['年']}[time_unit]
+        grouped = cube.groupby(level=levels, observed=True).sum().reset_index()
+        grouped[levels] = grouped[levels].astype('int32')
+        
+        grouped['时间'] = period_labels(grouped, time_unit)
+            
+        return grouped
+    
     def get_sales_by_category(self, subcategory=False):
         """
         按商品类别统计销售额
         
         Args:
             subcategory: 是否包含子类别
+        
+        结果会被缓存，返回的DataFrame由缓存共享，调用方不应修改。
         """
         if self.df is None:
             return None
         
-        if subcategory:
-            grouped = self.df.groupby(['商品类别', '子类别'])['总价'].sum().reset_index()
-        else:
-            grouped = self.df.groupby('商品类别')['总价'].sum().reset_index()
+        def compute(df):
+            if subcategory:
+                return df.groupby(['商品类别', '子类别'], observed=True)['总价'].sum().reset_index()
+            # 复用按类别缓存的汇总结果，恢复为按类别排列的顺序
+            return self.get_sales_totals('商品类别', df=df).sort_index()
         
-        return grouped
+        return self._cached_query(('by_category', subcategory), compute)
     
     def get_sales_by_region(self, region_level='省份'):
         """
@@ -169,8 +872,129 @@ class SalesAnalyzer:
         if region_level not in ['省份', '城市']:
             raise ValueError(f"不支持的地区级别: {region_level}")
             
-        grouped = self.df.groupby(region_level)['总价'].sum().reset_index()
-        return grouped
+        # 复用按地区缓存的汇总结果，恢复为按地区排列的顺序
+        return self.get_sales_totals(region_level).sort_index()
+    
+    def _cached_query(self, key, compute, df=None):
+        """
+        返回按key缓存的查询结果，没有缓存时调用compute(df)计算并缓存
+
+        数据只在开始时取一次并传给compute，计算过程中数据被替换也不会混用新旧数据；
+        数据更换后缓存自动失效，原地修改数据后需调用clear_caches。
+        返回的结果由缓存共享，调用方不应修改。
+        可在多个线程中同时调用：只在读写缓存时加锁，计算本身不持有锁。
+        """
+        if df is None:
+            df = self.df
+        with self._cache_lock:
+            if self._query_source is not df:
+                self._query_source = df
+                self._query_cache.clear()
+            result = self._query_cache.get(key)
+            
+        if result is None:
+            result = compute(df)
+            with self._cache_lock:
+                # 计算期间数据已被替换时不写入缓存
+                if self._query_source is df:
+                    self._query_cache.setdefault(key, result)
+        return result
+    
+    def clear_caches(self):
+        """
+        清空查询结果和客户细分的缓存
+
+        缓存按数据对象判断是否失效，原地修改self.df（例如转换列类型）后需调用此方法。
+        """
+        with self._cache_lock:
+            self._query_cache.clear()
+            self._query_source = None
+            self._segments_cache.clear()
+    
+    
+    def get_sales_totals(self, by, category=None, df=None):
+        """
+        按指定列汇总销售额并按销售额降序排列
+        
+        结果按(分组列, 商品类别)缓存，切换选项卡或重复刷新时不再扫描整个数据集；
+        数据更换后缓存自动失效。返回的DataFrame由缓存共享，调用方不应修改。
+        
+        Args:
+            by: 分组列，例如 '商品类别'、'省份'、'城市'
+            category: 可选，只汇总指定商品类别的数据
+            df: 可选，要汇总的数据，默认使用当前数据
+        """
+        if df is None:
+            df = self.df
+        if df is None:
+            return None
+            
+        def compute(data):
+            if category:
+                data = data[data['商品类别'] == category]
+            column = data[by]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # 分类列直接按编码累加，只保留有数据的分组（与observed=True一致）
+                sums, counts = group_sums(column.cat.codes.to_numpy(), data['总价'].to_numpy(),
+                                          len(column.cat.categories))
+                present = np.flatnonzero(counts)
+                grouped = pd.DataFrame({
+                    by: pd.Categorical.from_codes(present, dtype=column.dtype),
+                    '总价': sums[present],
+                })
+            else:
+                grouped = data.groupby(by, observed=True, sort=False)['总价'].sum().reset_index()
+            return grouped.sort_values('总价', ascending=False)
+            
+        return self._cached_query(('totals', by, category), compute, df)
+    
+    def get_category_month_sales(self, category=None):
+        """
+        计算商品类别×月份的销售额交叉表，只保留有数据的类别和月份
+        
+        商品类别为分类类型时按类别编码和月份直接用np.bincount累加到二维矩阵，
+        不经过pandas的分组和unstack；否则使用groupby计算。
+        
+        Args:
+            category: 可选，只统计指定商品类别
+        """
+        if self.df is None:
+            return None
+            
+        data = self.df
+        if category:
+            data = data[data['商品类别'] == category]
+            
+        # 缺少月份列时由日期计算
+        if '月' in data.columns:
+            months = data['月']
+        else:
+            months = data['日期'].dt.month.rename('月')
+            
+        if not isinstance(data['商品类别'].dtype, pd.CategoricalDtype):
+            return data.groupby(['商品类别', months], observed=True)['总价'].sum().unstack('月').fillna(0)
+            
+        categories = data['商品类别'].cat.categories
+        codes = data['商品类别'].cat.codes.to_numpy()
+        month_values = np.asarray(months, dtype=float)
+        valid = (codes >= 0) & ~np.isnan(month_values)
+        
+        # 每个(类别, 月份)对应矩阵中的一个位置，一次bincount完成累加
+        cells = codes[valid].astype(np.int64) * 12 + (month_values[valid].astype(np.int64) - 1)
+        size = len(categories) * 12
+        totals = np.bincount(cells, weights=data['总价'].to_numpy(dtype=float)[valid], minlength=size)
+        counts = np.bincount(cells, minlength=size)
+        totals = totals.reshape(len(categories), 12)
+        counts = counts.reshape(len(categories), 12)
+        
+        # 与groupby(observed=True)一致，去掉没有数据的类别和月份
+        rows = counts.any(axis=1)
+        columns = counts.any(axis=0)
+        return pd.DataFrame(
+            totals[np.ix_(rows, columns)],
+            index=pd.Index(categories[rows], name='商品类别'),
+            columns=pd.Index(np.arange(1, 13)[columns], name='月'),
+        )
     
     def get_top_products(self, n=10, measure='销售额', category=None):
         """
@@ -180,50 +1004,57 @@ class SalesAnalyzer:
             n: 返回前N个产品
             measure: 衡量标准，可选 '销售额' 或 '销售量'
             category: 可选，指定类别
+        
+        结果按(n, 衡量标准, 类别)缓存，返回的DataFrame由缓存共享，调用方不应修改。
         """
         if self.df is None:
             return None
             
-        data = self.df.copy()
-        if category:
-            data = data[data['商品类别'] == category]
-            
-        if measure == '销售额':
-            grouped = data.groupby('商品名称')['总价'].sum().reset_index()
-            grouped = grouped.sort_values('总价', ascending=False).head(n)
-            grouped = grouped.rename(columns={'总价': '销售额'})
-        elif measure == '销售量':
-            grouped = data.groupby('商品名称')['数量'].sum().reset_index()
-            grouped = grouped.sort_values('数量', ascending=False).head(n)
-            grouped = grouped.rename(columns={'数量': '销售量'})
-        else:
+        columns = {'销售额': '总价', '销售量': '数量'}
+        if measure not in columns:
             raise ValueError(f"不支持的衡量标准: {measure}")
             
-        return grouped
+        def compute(data):
+            if category:
+                data = data[data['商品类别'] == category]
+                
+            # 只选出前N个商品再排序，不对全部商品排序
+            totals = data.groupby('商品名称', observed=True, sort=False)[columns[measure]].sum()
+            idx = top_n_indices(totals.to_numpy(), n)
+            return pd.DataFrame({
+                '商品名称': totals.index[idx],
+                measure: totals.to_numpy()[idx],
+            })
+            
+        return self._cached_query(('top_products', n, measure, category), compute)
     
-    def get_customer_segments(self, n_clusters=4):
+    def get_customer_segments(self, n_clusters=4, df=None):
         """
         进行客户细分分析
         
         Args:
             n_clusters: 客户群体数量
+            df: 可选，要分析的数据，默认使用当前数据；在后台线程中计算时传入提交任务时的数据，
+                避免计算过程中数据被替换
+        
+        同一份数据和群体数量的结果会被缓存，聚类不必重复计算；返回的DataFrame由缓存共享，
+        调用方不应修改。
         """
-        if self.df is None:
+        if df is None:
+            df = self.df
+        if df is None:
             return None
             
-        # 按客户ID聚合
-        customer_data = self.df.groupby('顾客ID').agg({
-            '订单ID': 'count',  # 订单数量
-            '总价': 'sum',      # 总消费额
-            '商品名称': 'nunique',  # 购买的不同商品数
-            '日期': ['min', 'max']  # 首次和最近购买日期
-        }).reset_index()
-        
-        # 重命名列
-        customer_data.columns = ['顾客ID', '订单数量', '总消费额', '不同商品数', '首次购买日期', '最近购买日期']
+        with self._cache_lock:
+            cached = self._segments_cache.get(n_clusters)
+        if cached is not None and cached[0] is df:
+            return cached[1]
+            
+        # 按客户ID聚合：订单数量、总消费额、购买的不同商品数、首次和最近购买日期
+        customer_data = customer_aggregates(df)
         
         # 计算用户消费频率和最近一次购买距今天数
-        last_date = self.df['日期'].max()
+        last_date = df['日期'].max()
         customer_data['消费间隔天数'] = (last_date - customer_data['最近购买日期']).dt.days
         customer_data['活跃天数'] = (customer_data['最近购买日期'] - customer_data['首次购买日期']).dt.days
         customer_data['活跃天数'] = customer_data['活跃天数'].clip(lower=1)  # 避免除以零
@@ -231,14 +1062,23 @@ class SalesAnalyzer:
         
         # 选择聚类特征并进行标准化
         features = ['订单数量', '总消费额', '不同商品数', '消费间隔天数', '平均每月消费次数']
-        X = customer_data[features]
-        
-        # 标准化数据
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
+        # 客户很多时使用小批量K-means和单精度数据，每次迭代只使用一批样本，内存带宽减半
+        minibatch = len(customer_data) >= KMEANS_MINIBATCH_MIN_CUSTOMERS
+        dtype = np.float32 if minibatch else np.float64
+        X_scaled = customer_data[features].to_numpy(dtype=dtype)
+        
+        # 标准化数据：与StandardScaler相同（方差为0的特征不缩放），直接在数组上原地计算
+        mean = X_scaled.mean(axis=0, dtype=np.float64)
+        std = X_scaled.std(axis=0, dtype=np.float64)
+        std[std == 0] = 1.0
+        np.subtract(X_scaled, mean.astype(dtype), out=X_scaled)
+        np.divide(X_scaled, std.astype(dtype), out=X_scaled)
         
         # K-means聚类
-        kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+        if minibatch:
+            kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=KMEANS_BATCH_SIZE, n_init=3, random_state=42)
+        else:
+            kmeans = KMeans(n_clusters=n_clusters, random_state=42)
         clusters = kmeans.fit_predict(X_scaled)
         
         # 添加聚类结果
@@ -248,32 +1088,27 @@ class SalesAnalyzer:
         cluster_features = customer_data.groupby('客户群体')[features].mean().reset_index()
         
         # 对客户群体进行标记
-        # 基于总消费额和订单数量特征，为每个群体添加标签
-        segment_labels = {}
-        for cluster in range(n_clusters):
-            row = cluster_features[cluster_features['客户群体'] == cluster].iloc[0]
-            
-            # 根据消费金额和频率判断客户类型
-            if row['总消费额'] > cluster_features['总消费额'].median() and row['订单数量'] > cluster_features['订单数量'].median():
-                label = "高价值忠诚客户"
-            elif row['总消费额'] > cluster_features['总消费额'].median() and row['订单数量'] <= cluster_features['订单数量'].median():
-                label = "高价值低频客户"
-            elif row['总消费额'] <= cluster_features['总消费额'].median() and row['订单数量'] > cluster_features['订单数量'].median():
-                label = "低价值高频客户"
-            else:
-                label = "低价值低频客户"
-                
-            # 考虑最近消费时间
-            if row['消费间隔天数'] < cluster_features['消费间隔天数'].median():
-                label = f"活跃{label}"
-            else:
-                label = f"流失风险{label}"
-                
-            segment_labels[cluster] = label
+        # 基于总消费额和订单数量特征，与各群体的中位数比较，一次性为所有群体生成标签
+        medians = cluster_features[['总消费额', '订单数量', '消费间隔天数']].median()
+        high_value = (cluster_features['总消费额'] > medians['总消费额']).to_numpy()
+        high_frequency = (cluster_features['订单数量'] > medians['订单数量']).to_numpy()
+        active = (cluster_features['消费间隔天数'] < medians['消费间隔天数']).to_numpy()
+        
+        # 根据消费金额和频率判断客户类型
+        base_labels = np.select(
+            [high_value & high_frequency, high_value, high_frequency],
+            ["高价值忠诚客户", "高价值低频客户", "低价值高频客户"],
+            default="低价值低频客户"
+        )
+        # 考虑最近消费时间
+        labels = np.char.add(np.where(active, "活跃", "流失风险"), base_labels)
+        segment_labels = dict(zip(cluster_features['客户群体'], labels.tolist()))
             
         # 添加客户群体标签
         customer_data['客户群体标签'] = customer_data['客户群体'].map(segment_labels)
         
+        with self._cache_lock:
+            self._segments_cache[n_clusters] = (df, (customer_data, cluster_features))
         return customer_data, cluster_features
         
     def get_promotion_effect(self):
@@ -283,18 +1118,18 @@ class SalesAnalyzer:
         if self.df is None:
             return None
             
-        # 添加是否有折扣标记
-        self.df['有折扣'] = self.df['折扣率'] < 1.0
+        # 是否有折扣的标记在加载数据时已生成
+        data = add_promotion_columns(self.df)
         
         # 计算有折扣和无折扣的销售情况
-        discount_effect = self.df.groupby(['有折扣']).agg({
+        discount_effect = data.groupby(['有折扣']).agg({
             '订单ID': 'count',  # 订单数量
             '总价': 'sum',      # 总销售额
             '数量': 'sum'       # 总销售量
         }).reset_index()
         
         # 按商品类别计算折扣效果
-        category_discount = self.df.groupby(['商品类别', '有折扣']).agg({
+        category_discount = data.groupby(['商品类别', '有折扣'], observed=True).agg({
             '订单ID': 'count',  # 订单数量
             '总价': 'sum',      # 总销售额
         }).reset_index()
@@ -309,33 +1144,18 @@ class SalesAnalyzer:
             return None
             
         # 按月份统计销售额
-        monthly_sales = self.df.groupby(['年', '月'])['总价'].sum().reset_index()
+        monthly_sales = self.df.groupby(['年', '月'], observed=True)['总价'].sum().reset_index()
         monthly_sales['月份'] = monthly_sales['月'].astype(int)
         
         # 按季度统计销售额
-        quarterly_sales = self.df.groupby(['年', '季度'])['总价'].sum().reset_index()
+        quarterly_sales = self.df.groupby(['年', '季度'], observed=True)['总价'].sum().reset_index()
         quarterly_sales['季度'] = quarterly_sales['季度'].astype(int)
         
-        # 计算特殊购物节的销售情况
-        
-        # 春节 (假设2022年春节在2月1日，2023年春节在1月22日)
-        spring_festival_2022 = (self.df['年'] == 2022) & (self.df['月'] == 2) & (self.df['日'] <= 7)
-        spring_festival_2023 = (self.df['年'] == 2023) & (self.df['月'] == 1) & (self.df['日'] >= 20) & (self.df['日'] <= 27)
-        
-        # 618购物节
-        festival_618 = (self.df['月'] == 6) & (self.df['日'] >= 10) & (self.df['日'] <= 20)
-        
-        # 双11购物节
-        festival_1111 = (self.df['月'] == 11) & (self.df['日'] >= 9) & (self.df['日'] <= 12)
-        
-        # 创建标记特殊日期的列
-        self.df['购物节'] = '普通日期'
-        self.df.loc[spring_festival_2022 | spring_festival_2023, '购物节'] = '春节'
-        self.df.loc[festival_618, '购物节'] = '618购物节'
-        self.df.loc[festival_1111, '购物节'] = '双11购物节'
+        # 购物节标记在加载数据时已生成
+        data = add_promotion_columns(self.df)
         
         # 特殊购物节的销售统计
-        festival_sales = self.df.groupby(['购物节']).agg({
+        festival_sales = data.groupby(['购物节'], observed=True).agg({
             '订单ID': 'count',
             '总价': 'sum',
             '折扣率': 'mean'
@@ -444,18 +1264,8 @@ class SalesAnalyzer:
         if self.df is None:
             return None
             
-        data = self.df.copy()
-        if category:
-            data = data[data['商品类别'] == category]
-            
         # 创建月份-类别交叉表
-        pivot = pd.pivot_table(
-            data, 
-            values='总价', 
-            index='商品类别', 
-            columns='月',
-            aggfunc='sum'
-        ).fillna(0)
+        pivot = self.get_category_month_sales(category)
         
         plt.figure(figsize=(14, 8))
         sns.heatmap(pivot, annot=True, fmt='.0f', cmap='YlGnBu', linewidths=.5)
@@ -520,22 +1330,26 @@ class SalesAnalyzer:
         if freq == 'M':
             df_prophet['ds'] = pd.to_datetime(df_prophet['ds'] + '-01')
         elif freq == 'Q':
-            # 将 "YYYY-QN" 转换为季度末日期
-            def convert_quarter(q_str):
-                year, quarter = q_str.split('-Q')
-                month = int(quarter) * 3
-                return f"{year}-{month:02d}-01"
-            
-            df_prophet['ds'] = pd.to_datetime(df_prophet['ds'].apply(convert_quarter))
+            # 将 "YYYY-QN" 转换为季度末月份的第一天，整列拆分后向量化拼接
+            parts = df_prophet['ds'].str.split('-Q', expand=True)
+            months = (parts[1].astype(int) * 3).astype(str).str.zfill(2)
+            df_prophet['ds'] = pd.to_datetime(parts[0] + '-' + months + '-01', format='%Y-%m-%d')
         else:
             df_prophet['ds'] = pd.to_datetime(df_prophet['ds'])
         
         # 训练Prophet模型
-        model = Prophet(yearly_seasonality=True, weekly_seasonality=False, daily_seasonality=False)
+        model = Prophet(
+            yearly_seasonality=True,
+            weekly_seasonality=False,
+            daily_seasonality=False,
+            changepoint_prior_scale=PROPHET_CHANGEPOINT_PRIOR_SCALE,
+            uncertainty_samples=PROPHET_UNCERTAINTY_SAMPLES,
+        )
         if freq == 'D':
             model.add_seasonality(name='weekly', period=7, fourier_order=3)
         
-        model.fit(df_prophet)
+        # 序列很短，用牛顿法求解比默认的L-BFGS更快
+        model.fit(df_prophet, algorithm='Newton')
         
         # 创建未来日期的数据框
         future = model.make_future_dataframe(periods=periods, freq=freq)
@@ -565,20 +1379,26 @@ class SalesAnalyzer:
     def _predict_with_exp_smoothing(self, sales_data, periods):
         """使用指数平滑法进行预测"""
         # 创建时间序列
-        y = sales_data['总价'].values
-        
-        # 训练模型（三次指数平滑，也称为Holt-Winters方法）
-        model = ExponentialSmoothing(
-            y,
-            seasonal_periods=12,  # 假设数据有年度季节性
-            trend='add',
-            seasonal='add',
-        )
-        
-        fit = model.fit(optimized=True)
-        
-        # 预测
-        forecast = fit.forecast(periods)
+        y = sales_data['总价'].to_numpy(dtype=np.float64)
+        
+        # 训练模型（三次指数平滑，也称为Holt-Winters方法，加法趋势和加法季节性）并预测；
+        # statsforecast可用时使用其编译后的递推计算，否则使用statsmodels
+        if STATSFORECAST_AVAILABLE:
+            model = AutoETS(season_length=12, model='AAA')  # 假设数据有年度季节性
+            model.fit(y)
+            fitted_values = model.predict_in_sample()['fitted']
+            forecast = model.predict(h=periods)['mean']
+        else:
+            model = ExponentialSmoothing(
+                y,
+                seasonal_periods=12,  # 假设数据有年度季节性
+                trend='add',
+                seasonal='add',
+            )
+            
+            fit = model.fit(optimized=True)
+            fitted_values = fit.fittedvalues
+            forecast = fit.forecast(periods)
         
         # 创建结果数据框
         last_date = pd.to_datetime(sales_data['时间'].iloc[-1])
@@ -587,7 +1407,7 @@ class SalesAnalyzer:
         # 创建包含历史和预测的结果
         result = pd.DataFrame({
             '日期': pd.concat([pd.Series(sales_data['时间']), pd.Series(date_range.strftime('%Y-%m'))]),
-            '预测销售额': np.concatenate([fit.fittedvalues, forecast]),
+            '预测销售额': np.concatenate([fitted_values, forecast]),
             '数据类型': ['历史'] * len(y) + ['预测'] * periods
         })
         
@@ -599,16 +1419,16 @@ class SalesAnalyzer:
     def _predict_with_linear_regression(self, sales_data, periods):
         """使用线性回归进行预测"""
         # 创建特征
-        X = np.array(range(len(sales_data))).reshape(-1, 1)
+        X = np.arange(len(sales_data), dtype=np.float64).reshape(-1, 1)
         y = sales_data['总价'].values
         
         # 训练模型
         model = LinearRegression()
         model.fit(X, y)
         
-        # 预测
-        X_future = np.array(range(len(sales_data), len(sales_data) + periods)).reshape(-1, 1)
-        forecast = model.predict(X_future)
+        # 一元线性模型直接按 斜率*t+截距 计算历史拟合值和预测值，不再两次调用predict
+        t_all = np.arange(len(sales_data) + periods, dtype=np.float64)
+        yhat_all = model.coef_[0] * t_all + model.intercept_
         
         # 创建结果数据框
         last_date = pd.to_datetime(sales_data['时间'].iloc[-1])
@@ -617,7 +1437,7 @@ class SalesAnalyzer:
         # 创建包含历史和预测的结果
         result = pd.DataFrame({
             '日期': pd.concat([pd.Series(sales_data['时间']), pd.Series(date_range.strftime('%Y-%m'))]),
-            '预测销售额': np.concatenate([model.predict(X), forecast]),
+            '预测销售额': yhat_all,
             '数据类型': ['历史'] * len(y) + ['预测'] * periods
         })
         
@@ -641,47 +1461,30 @@ class SalesAnalyzer:
         
         suggestions = []
         
-        try:
-            # 1. 销售趋势建议
-            recent_trend = self._analyze_recent_trend(category)
-            suggestions.append({
-                "类型": "销售趋势建议",
-                "建议": recent_trend
-            })
-            
-            # 2. 库存管理建议
-            inventory_suggestion = self._generate_inventory_suggestions(category)
-            suggestions.append({
-                "类型": "库存管理建议",
-                "建议": inventory_suggestion
-            })
-            
-            # 3. 促销策略建议
-            promotion_suggestion = self._generate_promotion_suggestions(category)
-            suggestions.append({
-                "类型": "促销策略建议",
-                "建议": promotion_suggestion
-            })
-            
-            # 4. 客户营销建议
-            customer_suggestion = self._generate_customer_suggestions()
-            suggestions.append({
-                "类型": "客户营销建议",
-                "建议": customer_suggestion
-            })
-            
-            # 5. 产品组合建议
-            product_suggestion = self._generate_product_suggestions(category)
-            suggestions.append({
-                "类型": "产品组合建议",
-                "建议": product_suggestion
-            })
+        # 各类建议互不依赖，耗时的分组和聚类在pandas、NumPy中执行时会释放GIL，
+        # 同时提交到线程池计算，总耗时约为其中最慢的一项
+        tasks = [
+            ("销售趋势建议", self._analyze_recent_trend, (category,)),
+            ("库存管理建议", self._generate_inventory_suggestions, (category,)),
+            ("促销策略建议", self._generate_promotion_suggestions, (category,)),
+            ("客户营销建议", self._generate_customer_suggestions, ()),
+            ("产品组合建议", lambda c: format_suggestions(self._generate_product_suggestions(c)), (category,)),
+        ]
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = [(title, executor.submit(func, *args)) for title, func, args in tasks]
             
-        except Exception as e:
-            suggestions.append({
-                "类型": "错误",
-                "建议": f"生成建议时发生错误: {str(e)}"
-            })
+            # 按原有顺序收集结果，某一项出错时记录错误并继续收集其余各项
+            for title, future in futures:
+                try:
+                    suggestions.append({
+                        "类型": title,
+                        "建议": future.result()
+                    })
+                except Exception as e:
+                    suggestions.append({
+                        "类型": "错误",
+                        "建议": f"生成{title}时发生错误: {str(e)}"
+                    })
             
         return suggestions
     
@@ -717,12 +1520,6 @@ class SalesAnalyzer:
     def _generate_inventory_suggestions(self, category=None):
         """生成库存管理建议"""
         try:
-            # 获取类别数据
-            if category:
-                category_data = self.df[self.df['商品类别'] == category]
-            else:
-                category_data = self.df
-                
             # 获取热销商品
             top_products = self.get_top_products(n=5, measure='销售量', category=category)
             
@@ -730,9 +1527,6 @@ class SalesAnalyzer:
             has_discount = '折扣率' in self.df.columns
             
             if has_discount:
-                # 分析折扣对销量的影响
-                discount_effect = category_data.groupby(['商品名称', '折扣率']).agg({'数量': 'sum'}).reset_index()
-                
                 # 根据分析结果生成建议
                 if not top_products.empty:
                     suggestions = [
@@ -767,15 +1561,11 @@ class SalesAnalyzer:
             
             # 分析不同折扣力度的效果
             if '折扣率' in self.df.columns:
-                # 创建折扣区间
-                self.df['折扣区间'] = pd.cut(
-                    self.df['折扣率'], 
-                    bins=[0, 0.7, 0.8, 0.9, 1.0],
-                    labels=['大幅折扣(>30%)', '中度折扣(20-30%)', '小幅折扣(10-20%)', '无折扣/微折扣(<10%)']
-                )
+                # 折扣区间在加载数据时已生成
+                data = add_promotion_columns(self.df)
                 
-                # 分析各折扣区间的销售情况
-                discount_analysis = self.df.groupby('折扣区间').agg({
+                # 分析各折扣区间的销售情况（折扣区间是分类类型，显式保留没有数据的区间）
+                discount_analysis = data.groupby('折扣区间', observed=False).agg({
                     '数量': 'sum',
                     '总价': 'sum',
                     '订单ID': 'count'
@@ -854,47 +1644,78 @@ class SalesAnalyzer:
             return "无法生成客户营销建议"
     
     def _generate_product_suggestions(self, category=None):
-        """生成产品组合建议"""
-        try:
-            # 获取类别销售数据
-            category_sales = self.get_sales_by_category()
-            
-            if category_sales is None or category_sales.empty:
-                return "数据不足，无法提供产品组合建议"
-                
-            # 排序类别销售数据
-            category_sales = category_sales.sort_values('总价', ascending=False)
-            
-            # 计算类别贡献占比
-            total_sales = category_sales['总价'].sum()
-            category_sales['占比'] = category_sales['总价'] / total_sales
-            
-            # 找出销售占比最高和最低的类别
-            top_category = category_sales.iloc[0]
-            bottom_categories = category_sales.iloc[-3:] if len(category_sales) >= 3 else category_sales.iloc[-1:]
-            
-            suggestions = []
-            
-            # 针对热销类别的建议
-            suggestions.append(f"重点发展'{top_category['商品类别']}'类别，其销售占比达{top_category['占比']:.1%}，可考虑扩充产品线或提高利润率")
-            
-            # 针对滞销类别的建议
-            bottom_names = "、".join(bottom_categories['商品类别'].tolist())
-            suggestions.append(f"评估'{bottom_names}'等类别的产品策略，考虑产品创新、调整定价或淘汰部分产品")
-            
-            # 产品组合多样化建议
-            if top_category['占比'] > 0.4:
-                suggestions.append(f"当前产品结构过于依赖'{top_category['商品类别']}'类别，建议适当多元化产品组合，分散风险")
-            else:
-                suggestions.append("当前产品结构相对均衡，建议保持多元化策略，并根据市场反馈适时调整")
+        """
+        生成产品组合建议
+        
+        Returns:
+            建议列表，每项为字典：'type' 为建议类型，'message' 为显示文本，其余键为相关的类别、
+            占比或商品等数据；需要文本时用format_suggestions拼接
+        """
+        # 获取类别销售数据
+        category_sales = self.get_sales_by_category()
+        
+        if category_sales is None or category_sales.empty:
+            return [{"type": "insufficient_data", "message": "数据不足，无法提供产品组合建议"}]
             
-            # 获取热销产品
-            top_products = self.get_top_products(n=3, measure='销售额', category=category)
-            if top_products is not None and not top_products.empty:
-                top_names = "、".join(top_products['商品名称'].iloc[:3].tolist())
-                suggestions.append(f"热销产品'{top_names}'表现突出，建议加强供应链管理，确保库存充足")
+        # 总额、最高和最低的类别都直接在销售额数组上计算，不对类别表排序
+        sales = category_sales['总价'].to_numpy()
+        total_sales = sales.sum()
+        # 销售额为零或无效时占比没有意义，直接返回，避免除以零产生NaN
+        if not np.isfinite(total_sales) or total_sales <= 0:
+            return [{"type": "no_sales", "message": "当前周期销售数据为空，无法生成产品组合建议"}]
             
-            return "；".join(suggestions)
-                
-        except Exception:
-            return "无法生成产品组合建议" 
\ No newline at end of file
+        # 找出销售占比最高和最低的类别，最低的类别用部分选择得到，
+        # 按销售额从高到低排列，与原来的顺序一致
+        top_idx = sales.argmax()
+        top_name = category_sales['商品类别'].iloc[top_idx]
+        bottom_count = 3 if sales.size >= 3 else 1
+        bottom_categories = category_sales.iloc[top_n_indices(-sales, bottom_count)[::-1]]
+        
+        # 只有最高类别的贡献占比会被用到，直接计算这一个值，不为整个类别表增加一列
+        top_share = float(sales[top_idx] / total_sales)
+        
+        templates = PRODUCT_SUGGESTION_TEMPLATES
+        bottom_names = bottom_categories['商品类别'].str.cat(sep='、')
+        
+        # 产品组合多样化建议
+        if top_share > 0.4:
+            structure_suggestion = {
+                "type": "concentration",
+                "category": top_name,
+                "share": top_share,
+                "message": templates['concentration'].format_map({"category": top_name})
+            }
+        else:
+            structure_suggestion = {
+                "type": "diversified",
+                "share": top_share,
+                "message": templates['diversified']
+            }
+        
+        # 热销类别、滞销类别和产品结构的建议总会生成，直接构造列表
+        suggestions = [
+            {
+                "type": "top_category",
+                "category": top_name,
+                "share": top_share,
+                "message": templates['top_category'].format_map({"category": top_name, "share": top_share})
+            },
+            {
+                "type": "bottom_categories",
+                "categories": bottom_categories['商品类别'].tolist(),
+                "message": templates['bottom_categories'].format_map({"names": bottom_names})
+            },
+            structure_suggestion,
+        ]
+        
+        # 获取热销产品
+        top_products = self.get_top_products(n=3, measure='销售额', category=category)
+        if top_products is not None and not top_products.empty:
+            top_names = top_products['商品名称'].head(3)
+            suggestions.append({
+                "type": "top_products",
+                "products": top_names.tolist(),
+                "message": templates['top_products'].format_map({"names": top_names.str.cat(sep='、')})
+            })
+        
+        return suggestions
\ No newline at end of file